@@ -1,8 +1,97 @@
 import hashlib
+import math
+import time
+from dataclasses import dataclass
+
+
+def chat_fingerprint(author: str, content: str) -> str:
+    """Отпечаток сообщения (автор + текст); общий для ChatGuard и дедупа в Redis."""
+    normalized = f"{author.strip().lower()}:{content.strip()}"
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
 
 
 def chat_dedupe_key(author: str, content: str, message_id: str = "") -> str:
     if message_id:
         return message_id
-    normalized = f"{author.strip().lower()}:{content.strip()}"
-    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    return chat_fingerprint(author, content)
+
+
+@dataclass(frozen=True)
+class BloomLayout:
+    """Размер фильтра Блума под capacity элементов с долей ложных срабатываний error_rate."""
+
+    bits: int
+    hashes: int
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float) -> "BloomLayout":
+        capacity = max(1, int(capacity))
+        error_rate = min(max(float(error_rate), 1e-9), 0.5)
+        bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        hashes = max(1, round(bits / capacity * math.log(2)))
+        return cls(bits=bits, hashes=hashes)
+
+    def positions(self, key: str) -> list[int]:
+        """Номера битов по двойному хешированию (Kirsch–Mitzenmacher)."""
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+
+def sliced_layout(capacity: int, error_rate: float, slices: int) -> BloomLayout:
+    """error_rate — на всё окно: проверка идёт по slices фильтрам, каждому достаётся доля."""
+    return BloomLayout.for_capacity(capacity, error_rate / max(1, slices))
+
+
+class LocalTimeSlicedBloom:
+    """
+    Фильтр Блума в памяти процесса, нарезанный по времени.
+
+    Окно — slices срезов по slice_seconds; новый срез вытесняет самый старый,
+    поэтому память постоянна и не зависит от числа сообщений.
+    """
+
+    def __init__(
+        self,
+        *,
+        slice_seconds: float,
+        slices: int,
+        capacity: int,
+        error_rate: float,
+    ) -> None:
+        self._slice_seconds = slice_seconds
+        self._slices = max(1, slices)
+        self._layout = sliced_layout(capacity, error_rate, self._slices)
+        self._filters: dict[int, bytearray] = {}
+
+    def _current_slice(self) -> int:
+        return int(time.time() // self._slice_seconds)
+
+    def _filter(self, slice_id: int) -> bytearray:
+        bitmap = self._filters.get(slice_id)
+        if bitmap is None:
+            oldest = slice_id - self._slices + 1
+            for stale in [s for s in self._filters if s < oldest]:
+                del self._filters[stale]
+            bitmap = bytearray((self._layout.bits + 7) // 8)
+            self._filters[slice_id] = bitmap
+        return bitmap
+
+    @staticmethod
+    def _contains(bitmap: bytearray, positions: list[int]) -> bool:
+        return all(bitmap[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def __contains__(self, key: str) -> bool:
+        positions = self._layout.positions(key)
+        oldest = self._current_slice() - self._slices + 1
+        return any(
+            self._contains(bitmap, positions)
+            for slice_id, bitmap in self._filters.items()
+            if slice_id >= oldest
+        )
+
+    def add(self, key: str) -> None:
+        bitmap = self._filter(self._current_slice())
+        for p in self._layout.positions(key):
+            bitmap[p >> 3] |= 1 << (p & 7)
@@ -1,7 +1,7 @@
-import hashlib
 import time
 from collections import deque
 
+from core.chat_dedupe import LocalTimeSlicedBloom, chat_fingerprint
 from core.config import Config
 from core.logger import logger
 from core.metrics import metrics
@@ -14,8 +14,13 @@ class ChatGuard:
         self._user_last_reply: dict[str, float] = {}
         self._global_last_reply = 0.0
         self._event_times: deque[float] = deque()
-        self._recent_hashes: deque[str] = deque(maxlen=200)
-        self._recent_hash_set: set[str] = set()
+        # Повторы автора за CHAT_GUARD_DEDUPE_MINUTES: память не растёт с потоком чата.
+        self._recent = LocalTimeSlicedBloom(
+            slice_seconds=60.0,
+            slices=Config.CHAT_GUARD_DEDUPE_MINUTES,
+            capacity=Config.CHAT_MAX_EVENTS_PER_MINUTE,
+            error_rate=Config.CHAT_DEDUPE_ERROR_RATE,
+        )
 
     def _trim_events(self, now: float) -> None:
         cutoff = now - 60.0
@@ -23,13 +28,7 @@ class ChatGuard:
             self._event_times.popleft()
 
     def _remember_hash(self, digest: str) -> None:
-        if digest in self._recent_hash_set:
-            return
-        if len(self._recent_hashes) == self._recent_hashes.maxlen:
-            old = self._recent_hashes.popleft()
-            self._recent_hash_set.discard(old)
-        self._recent_hashes.append(digest)
-        self._recent_hash_set.add(digest)
+        self._recent.add(digest)
 
     def should_accept(self, author: str, content: str) -> bool:
         now = time.time()
@@ -40,14 +39,16 @@ class ChatGuard:
         if len(content) > Config.CHAT_MAX_MESSAGE_LENGTH:
             content = content[: Config.CHAT_MAX_MESSAGE_LENGTH]
 
-        digest = hashlib.sha256(f"{author}:{content}".encode()).hexdigest()
-        if digest in self._recent_hash_set:
+        digest = chat_fingerprint(author, content)
+        if digest in self._recent:
             metrics.chat_dropped_total += 1
+            metrics.chat_dropped_by_reason.inc("duplicate")
             return False
 
         self._trim_events(now)
         if len(self._event_times) >= Config.CHAT_MAX_EVENTS_PER_MINUTE:
             metrics.chat_dropped_total += 1
+            metrics.chat_dropped_by_reason.inc("rate_limit")
             logger.warning("Превышен лимит событий чата в минуту")
             return False
 
@@ -56,6 +57,10 @@ class ChatGuard:
         metrics.chat_events_total += 1
         return True
 
+    def can_respond_now(self) -> bool:
+        """Общий cooldown между ответами (без учёта автора)."""
+        return time.time() - self._global_last_reply >= Config.CHAT_RESPONSE_COOLDOWN_SECONDS
+
     def can_respond_to_user(self, author: str) -> bool:
         now = time.time()
         if now - self._global_last_reply < Config.CHAT_RESPONSE_COOLDOWN_SECONDS:
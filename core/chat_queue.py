@@ -22,12 +22,14 @@ async def has_actionable_chat_messages(
     """True — в очереди есть сообщение, на которое можно ответить прямо сейчас."""
     if await redis_manager.is_chat_processing():
         return True
+    if not guard.can_respond_now():
+        return False
+    _total, ready = await redis_manager.get_chat_queue_lengths()
+    return ready > 0
 
-    for raw in await redis_manager.list_chat_messages(limit=20):
-        message = parse_chat_payload(raw)
-        if message is None:
-            return True
-        author = message.get("author", "Аноним")
-        if guard.can_respond_to_user(author):
-            return True
-    return False
+
+def snapshot_has_actionable_chat(snapshot, *, guard: ChatGuard = chat_guard) -> bool:
+    """То же по ControlSnapshot — без обращений к Redis."""
+    if snapshot.chat_processing:
+        return True
+    return guard.can_respond_now() and snapshot.chat_ready_authors > 0
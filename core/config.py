@@ -1,4 +1,5 @@
 import os
+import socket
 
 from dotenv import load_dotenv
 
@@ -50,6 +51,12 @@ class Config:
     CHAT_RESPONSE_COOLDOWN_SECONDS = int(os.getenv("CHAT_RESPONSE_COOLDOWN_SECONDS", 15))
     CHAT_USER_COOLDOWN_SECONDS = int(os.getenv("CHAT_USER_COOLDOWN_SECONDS", 60))
     CHAT_MAX_EVENTS_PER_MINUTE = int(os.getenv("CHAT_MAX_EVENTS_PER_MINUTE", 100))
+    # bloom — фильтр Блума по часовым срезам; keys — ключ chat:dedupe:<id> на сообщение
+    CHAT_DEDUPE_BACKEND = os.getenv("CHAT_DEDUPE_BACKEND", "bloom").lower()
+    CHAT_DEDUPE_WINDOW_HOURS = int(os.getenv("CHAT_DEDUPE_WINDOW_HOURS", 24))
+    CHAT_DEDUPE_HOURLY_CAPACITY = int(os.getenv("CHAT_DEDUPE_HOURLY_CAPACITY", 6000))
+    CHAT_DEDUPE_ERROR_RATE = float(os.getenv("CHAT_DEDUPE_ERROR_RATE", "0.001"))
+    CHAT_GUARD_DEDUPE_MINUTES = int(os.getenv("CHAT_GUARD_DEDUPE_MINUTES", 10))
     CHAT_TTS_PRE_PAUSE_SECONDS = float(os.getenv("CHAT_TTS_PRE_PAUSE_SECONDS", "2"))
     CHAT_TTS_POST_PAUSE_SECONDS = float(os.getenv("CHAT_TTS_POST_PAUSE_SECONDS", "2"))
     CHAT_RETURN_TRANSITION = os.getenv(
@@ -69,6 +76,13 @@ class Config:
     WIKIQUOTE_REQUEST_TIMEOUT_SECONDS = int(
         os.getenv("WIKIQUOTE_REQUEST_TIMEOUT_SECONDS", 20)
     )
+    WIKIQUOTE_HTTP_CACHE_PATH = os.getenv(
+        "WIKIQUOTE_HTTP_CACHE_PATH", "output/wiki_http_cache.sqlite3"
+    )
+    WIKIQUOTE_HTTP_CACHE_MAX_MB = int(os.getenv("WIKIQUOTE_HTTP_CACHE_MAX_MB", 256))
+    WIKIQUOTE_QUOTE_CACHE_TTL_HOURS = float(
+        os.getenv("WIKIQUOTE_QUOTE_CACHE_TTL_HOURS", 24)
+    )
     WIKIQUOTE_MAX_QUOTES = int(os.getenv("WIKIQUOTE_MAX_QUOTES", 8))
     WIKIQUOTE_MAX_QUOTE_CHARS = int(os.getenv("WIKIQUOTE_MAX_QUOTE_CHARS", 400))
     WIKIQUOTE_RANDOM_RETRIES = int(os.getenv("WIKIQUOTE_RANDOM_RETRIES", 6))
@@ -77,6 +91,15 @@ class Config:
         "WIKIQUOTE_PERSON_CATEGORY", "Категория:Персоналии по алфавиту"
     )
     WIKIQUOTE_PERSON_BATCH_SIZE = int(os.getenv("WIKIQUOTE_PERSON_BATCH_SIZE", 100))
+    WIKIQUOTE_AUTHOR_INDEX_PATH = os.getenv(
+        "WIKIQUOTE_AUTHOR_INDEX_PATH", "output/wikiquote_authors.sqlite3"
+    )
+    WIKIQUOTE_AUTHOR_INDEX_REFRESH_HOURS = float(
+        os.getenv("WIKIQUOTE_AUTHOR_INDEX_REFRESH_HOURS", 6)
+    )
+    WIKIQUOTE_AUTHOR_INDEX_REBUILD_DAYS = float(
+        os.getenv("WIKIQUOTE_AUTHOR_INDEX_REBUILD_DAYS", 14)
+    )
     WIKIPEDIA_API_BASE = os.getenv(
         "WIKIPEDIA_API_BASE", "https://ru.wikipedia.org/w/api.php"
     )
@@ -109,6 +132,10 @@ class Config:
     # TTS
     TTS_OUTPUT_MODE = os.getenv("TTS_OUTPUT_MODE", "speaker")
     TTS_OUTPUT_DIR = os.getenv("TTS_OUTPUT_DIR", "output/tts")
+    # Формат файлов режима file: wav | opus (OGG, ~10× меньше) | flac (без потерь, ~2×)
+    TTS_OUTPUT_FORMAT = os.getenv("TTS_OUTPUT_FORMAT", "wav").lower()
+    TTS_OUTPUT_COMPRESSION = float(os.getenv("TTS_OUTPUT_COMPRESSION", 0.5))
+    TTS_OUTPUT_SUFFIXES = (".wav", ".ogg", ".flac")
     TTS_SPEAKER = os.getenv("TTS_SPEAKER", "baya")
     TTS_SAMPLE_RATE = int(os.getenv("TTS_SAMPLE_RATE", "48000"))
     TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", 1))
@@ -118,11 +145,51 @@ class Config:
     TTS_CHUNK_MAX_LENGTH = int(os.getenv("TTS_CHUNK_MAX_LENGTH", 990))
     TTS_MAX_CHUNKS = int(os.getenv("TTS_MAX_CHUNKS", 3))
     TTS_CHUNK_PAUSE_SECONDS = float(os.getenv("TTS_CHUNK_PAUSE_SECONDS", 0.25))
+    TTS_TRIM_SILENCE = os.getenv("TTS_TRIM_SILENCE", "1") == "1"
+    TTS_TRIM_THRESHOLD_DB = float(os.getenv("TTS_TRIM_THRESHOLD_DB", -40))
+    TTS_TRIM_KEEP_MS = float(os.getenv("TTS_TRIM_KEEP_MS", 40))
+    TTS_NORMALIZE = os.getenv("TTS_NORMALIZE", "rms").lower()
+    TTS_LOUDNESS_TARGET_DB = float(os.getenv("TTS_LOUDNESS_TARGET_DB", -20))
+    TTS_MAX_GAIN_DB = float(os.getenv("TTS_MAX_GAIN_DB", 12))
+    # Сколько синтезированных частей держать впереди воспроизведения; 0 — склейка целиком
+    TTS_PIPELINE_BUFFER_CHUNKS = int(os.getenv("TTS_PIPELINE_BUFFER_CHUNKS", 2))
+    # Сколько следующих реплик монолога синтезировать заранее, пока звучит текущая
+    TTS_LOOKAHEAD_SENTENCES = int(os.getenv("TTS_LOOKAHEAD_SENTENCES", 2))
     TTS_TIMEOUT_SECONDS = int(os.getenv("TTS_TIMEOUT_SECONDS", 45))
+    # Закреплённый снимок модели (torch.package .pt) — грузится первым, без сети
+    TTS_MODEL_PATH = os.getenv("TTS_MODEL_PATH", "models/v3_1_ru.pt")
+    TTS_MODEL_SHA256 = os.getenv("TTS_MODEL_SHA256", "")
+    TTS_MODEL_URL = os.getenv(
+        "TTS_MODEL_URL", "https://models.silero.ai/models/tts/ru/v3_1_ru.pt"
+    )
+    # float | int8 (динамическое квантование) | frozen (TorchScript freeze) | int8_frozen
+    TTS_ENGINE_MODE = os.getenv("TTS_ENGINE_MODE", "float").lower()
+    TTS_ENGINE_CACHE_DIR = os.getenv("TTS_ENGINE_CACHE_DIR", "models/optimized")
+    # 0 — по квоте CPU контейнера (cgroup), иначе явное число потоков torch
+    TTS_TORCH_THREADS = int(os.getenv("TTS_TORCH_THREADS", 0))
+    TTS_TORCH_INTEROP_THREADS = int(os.getenv("TTS_TORCH_INTEROP_THREADS", 1))
+    # thread — модель в процессе streamer; process — пул процессов со своими моделями
+    TTS_WORKER_BACKEND = os.getenv("TTS_WORKER_BACKEND", "thread").lower()
+    TTS_PROCESS_WORKERS = int(os.getenv("TTS_PROCESS_WORKERS", 2))
+    # Кэш синтезированных фраз (int16): LRU в памяти и на диске; 0 — уровень выключен
+    TTS_AUDIO_CACHE_DIR = os.getenv("TTS_AUDIO_CACHE_DIR", "output/tts_cache")
+    TTS_AUDIO_CACHE_MEMORY_MB = int(os.getenv("TTS_AUDIO_CACHE_MEMORY_MB", 64))
+    TTS_AUDIO_CACHE_DISK_MB = int(os.getenv("TTS_AUDIO_CACHE_DISK_MB", 512))
     TTS_TEMP_MAX_AGE_MINUTES = int(os.getenv("TTS_TEMP_MAX_AGE_MINUTES", 30))
     TTS_TEMP_MAX_SIZE_MB = int(os.getenv("TTS_TEMP_MAX_SIZE_MB", 300))
+    # list — списки Redis (LPOP); stream — Redis Streams с ack и XAUTOCLAIM
+    TTS_QUEUE_BACKEND = os.getenv("TTS_QUEUE_BACKEND", "list").lower()
+    TTS_STREAM_CONSUMER = os.getenv("TTS_STREAM_CONSUMER", "") or socket.gethostname()
+    TTS_STREAM_CLAIM_IDLE_SECONDS = float(
+        os.getenv("TTS_STREAM_CLAIM_IDLE_SECONDS", "60")
+    )
 
     STREAMER_POLL_INTERVAL = float(os.getenv("STREAMER_POLL_INTERVAL", "1.0"))
+    # blocking — BLPOP по очередям озвучки; poll — прежний опрос LLEN
+    STREAMER_CONSUME_MODE = os.getenv("STREAMER_CONSUME_MODE", "blocking").lower()
+    STREAMER_BLOCK_TIMEOUT_SECONDS = float(
+        os.getenv("STREAMER_BLOCK_TIMEOUT_SECONDS", "5")
+    )
 
     # FFmpeg / stream (зарезервировано; RTMP пока не используется)
     STREAM_WIDTH = int(os.getenv("STREAM_WIDTH", 1280))
@@ -143,6 +210,10 @@ class Config:
     VISUAL_COMPLEXITY = os.getenv("VISUAL_COMPLEXITY", "low")
     VISUAL_MODE = os.getenv("VISUAL_MODE", "demo").lower()
     VISUAL_PLAY_AUDIO = os.getenv("VISUAL_PLAY_AUDIO", "1") == "1"
+    # Страховочное перечитывание оверлея; изменения приходят через pub/sub сразу.
+    VISUAL_OVERLAY_REFRESH_SECONDS = float(
+        os.getenv("VISUAL_OVERLAY_REFRESH_SECONDS", 2.0)
+    )
     VISUAL_VOLUME_SMOOTHING = float(os.getenv("VISUAL_VOLUME_SMOOTHING", "0.18"))
     # Legacy (pygame; не используется React-визуалом)
     VISUAL_MAX_PARTICLES = int(os.getenv("VISUAL_MAX_PARTICLES", 500))
@@ -212,6 +283,10 @@ class Config:
             headers["X-Auth-Token"] = cls.F5AI_API_TOKEN or ""
         return headers
 
+    @classmethod
+    def tts_output_suffix(cls) -> str:
+        return {"opus": ".ogg", "flac": ".flac"}.get(cls.TTS_OUTPUT_FORMAT, ".wav")
+
     @classmethod
     def obs_signal_commands(cls) -> frozenset[str]:
         raw = cls.OBS_SIGNAL_COMMANDS.strip()
@@ -233,6 +308,8 @@ class Config:
         cls.STREAM_X264_PRESET = os.getenv("STREAM_X264_PRESET", "ultrafast")
         cls.TTS_MAX_CONCURRENCY = int(os.getenv("TTS_MAX_CONCURRENCY", 1))
         cls.TTS_QUEUE_MAX_SIZE = min(cls.TTS_QUEUE_MAX_SIZE, int(os.getenv("TTS_QUEUE_MAX_SIZE", 6)))
+        cls.TTS_AUDIO_CACHE_MEMORY_MB = min(cls.TTS_AUDIO_CACHE_MEMORY_MB, int(os.getenv("TTS_AUDIO_CACHE_MEMORY_MB", 16)))
+        cls.TTS_LOOKAHEAD_SENTENCES = min(cls.TTS_LOOKAHEAD_SENTENCES, int(os.getenv("TTS_LOOKAHEAD_SENTENCES", 1)))
         cls.AI_QUEUE_MAX_SIZE = min(cls.AI_QUEUE_MAX_SIZE, int(os.getenv("AI_QUEUE_MAX_SIZE", 10)))
         cls.VISUAL_MAX_PARTICLES = min(cls.VISUAL_MAX_PARTICLES, int(os.getenv("VISUAL_MAX_PARTICLES", 150)))
         cls.VISUAL_COMPLEXITY = os.getenv("VISUAL_COMPLEXITY", "low")
@@ -0,0 +1,300 @@
+import bisect
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from pathlib import Path
+
+from core.logger import logger
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (
+    _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+    | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct("iIII")
+_PART_SUFFIX = ".part"
+
+
+class _Inotify:
+    """Минимальная обёртка inotify через libc: один каталог, неблокирующий fd."""
+
+    def __init__(self) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self.fd = fd
+
+    def watch(self, path: str) -> None:
+        if self._add_watch(self.fd, os.fsencode(path), _WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), path)
+
+    def read(self) -> list[tuple[int, str]]:
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        events = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            _wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            events.append((mask, os.fsdecode(name)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class DirectoryWatcher:
+    """
+    Упорядоченный индекс готовых аудиофайлов каталога TTS.
+
+    На Linux изменения приходят через inotify: файл попадает в индекс, когда
+    его переименовали из .part (IN_MOVED_TO) или закрыли после записи, и
+    уходит по удалению — системные вызовы только на новые файлы, а не на
+    каждый опрос. На других ОС — опрос каталога раз в poll_interval.
+    Плеер, визуал и DiskGuard одного процесса делят один экземпляр (shared).
+    """
+
+    _shared: dict[tuple[str, tuple[str, ...]], "DirectoryWatcher"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        directory: str | Path,
+        suffixes: tuple[str, ...],
+        poll_interval: float = 0.5,
+    ) -> None:
+        self.directory = os.path.abspath(directory)
+        self._suffixes = tuple(s.lower() for s in suffixes)
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._names: list[str] = []
+        self._stats: dict[str, tuple[int, float]] = {}
+        self._partial: set[str] = set()
+        self._stopped = threading.Event()
+        self._inotify: _Inotify | None = None
+        if sys.platform.startswith("linux"):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                logger.warning(f"inotify недоступен ({e}) — опрос каталога")
+        # Первый снимок — синхронно: индекс сразу полон для вызывающего.
+        if self._inotify is not None:
+            self._watching = self._watch_directory()
+        else:
+            self._rescan()
+        self._thread = threading.Thread(
+            target=self._run, name="dir-watcher", daemon=True
+        )
+        self._thread.start()
+
+    @classmethod
+    def shared(
+        cls,
+        directory: str | Path,
+        suffixes: tuple[str, ...],
+        poll_interval: float | None = None,
+    ) -> "DirectoryWatcher":
+        """
+        Общий экземпляр на каталог. poll_interval — для опроса без inotify:
+        берётся самый частый из запрошенных (плеер ждёт следующий клип).
+        """
+        key = (os.path.abspath(directory), tuple(suffixes))
+        with cls._shared_lock:
+            watcher = cls._shared.get(key)
+            if watcher is None:
+                if poll_interval is None:
+                    watcher = cls(directory, suffixes)
+                else:
+                    watcher = cls(directory, suffixes, poll_interval)
+                cls._shared[key] = watcher
+            elif poll_interval is not None:
+                watcher._poll_interval = min(watcher._poll_interval, poll_interval)
+            return watcher
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    # --- индекс ---
+
+    def _matches(self, name: str) -> bool:
+        return name.lower().endswith(self._suffixes)
+
+    def _add(self, name: str) -> None:
+        """Один stat на новый файл: размер и mtime для DiskGuard."""
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            self._remove(name)
+            return
+        with self._lock:
+            if name not in self._stats:
+                bisect.insort(self._names, name)
+            self._stats[name] = (stat.st_size, stat.st_mtime)
+            self._changed.notify_all()
+
+    def _remove(self, name: str) -> None:
+        with self._lock:
+            if self._stats.pop(name, None) is not None:
+                self._names.remove(name)
+
+    def _set_partial(self, name: str, present: bool) -> None:
+        with self._lock:
+            if present:
+                self._partial.add(name)
+            else:
+                self._partial.discard(name)
+                self._changed.notify_all()
+
+    def _rescan(self) -> None:
+        try:
+            with os.scandir(self.directory) as entries:
+                names = [entry.name for entry in entries]
+        except OSError:
+            names = []
+        partial = {
+            n[: -len(_PART_SUFFIX)] for n in names if n.endswith(_PART_SUFFIX)
+        }
+        present = {n for n in names if self._matches(n)}
+        with self._lock:
+            known = set(self._stats)
+            self._partial = partial
+        for name in known - present:
+            self._remove(name)
+        for name in sorted(present - known):
+            self._add(name)
+
+    def _ready(self, name: str) -> bool:
+        return name not in self._partial
+
+    def files(self) -> list[str]:
+        """Готовые файлы по имени: имена — номера _file_sequence, по порядку записи."""
+        with self._lock:
+            return [n for n in self._names if self._ready(n)]
+
+    def entries(self) -> list[tuple[str, int, float]]:
+        """(имя, размер, mtime) готовых файлов, от старых к новым по mtime."""
+        with self._lock:
+            items = [
+                (n, *self._stats[n]) for n in self._names if self._ready(n)
+            ]
+        return sorted(items, key=lambda item: item[2])
+
+    def oldest(self) -> str | None:
+        with self._lock:
+            for name in self._names:
+                if self._ready(name):
+                    return name
+        return None
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            return name in self._stats and self._ready(name)
+
+    def discard(self, name: str) -> None:
+        """Файл удалён самим процессом — не ждать события, чтобы не взять его снова."""
+        self._remove(name)
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Ждёт появления готового файла; True — индекс не пуст."""
+        with self._changed:
+            if not any(self._ready(n) for n in self._names):
+                self._changed.wait(timeout)
+            return any(self._ready(n) for n in self._names)
+
+    # --- фоновый поток ---
+
+    def _handle(self, mask: int, name: str) -> bool:
+        """Применяет событие inotify; False — наблюдение за каталогом потеряно."""
+        if mask & _IN_Q_OVERFLOW:
+            self._rescan()
+            return True
+        if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF | _IN_IGNORED):
+            return False
+        if not name:
+            return True
+        if name.endswith(_PART_SUFFIX):
+            target = name[: -len(_PART_SUFFIX)]
+            if self._matches(target):
+                self._set_partial(target, bool(mask & (_IN_CREATE | _IN_CLOSE_WRITE)))
+            return True
+        if not self._matches(name):
+            return True
+        if mask & (_IN_MOVED_TO | _IN_CLOSE_WRITE):
+            self._add(name)
+        elif mask & (_IN_DELETE | _IN_MOVED_FROM):
+            self._remove(name)
+        return True
+
+    def _watch_directory(self) -> bool:
+        try:
+            self._inotify.watch(self.directory)
+        except OSError:
+            return False
+        self._rescan()
+        return True
+
+    def _run_inotify(self) -> None:
+        watching = self._watching
+        while not self._stopped.is_set():
+            if not watching:
+                watching = self._watch_directory()
+                if not watching:
+                    # Каталога ещё нет: ждём его появления редким опросом.
+                    self._stopped.wait(self._poll_interval)
+                    continue
+            readable, _, _ = select.select([self._inotify.fd], [], [], 1.0)
+            if not readable:
+                continue
+            for mask, name in self._inotify.read():
+                if not self._handle(mask, name):
+                    watching = False
+            if not watching:
+                with self._lock:
+                    self._names.clear()
+                    self._stats.clear()
+                    self._partial.clear()
+
+    def _run(self) -> None:
+        if self._inotify is None:
+            while not self._stopped.wait(self._poll_interval):
+                self._rescan()
+            return
+        try:
+            self._run_inotify()
+        finally:
+            self._inotify.close()
+
+    def stop(self) -> None:
+        self._stopped.set()
@@ -3,6 +3,7 @@ import time
 from pathlib import Path
 
 from core.config import Config
+from core.dir_watcher import DirectoryWatcher
 from core.logger import logger
 
 
@@ -63,31 +64,27 @@ class DiskGuard:
 
     @classmethod
     def cleanup_tts_directory(cls, directory: str | None = None) -> int:
-        """Удаляет старые WAV и ограничивает размер каталога."""
+        """Удаляет старые аудиофайлы TTS и ограничивает размер каталога."""
         target_dir = Path(directory or Config.TTS_OUTPUT_DIR)
-        if not target_dir.is_dir():
-            return 0
+        index = DirectoryWatcher.shared(target_dir, Config.TTS_OUTPUT_SUFFIXES)
 
         now = time.time()
         max_age = Config.TTS_TEMP_MAX_AGE_MINUTES * 60
         max_bytes = Config.TTS_TEMP_MAX_SIZE_MB * 1024 * 1024
         removed = 0
 
-        files = sorted(
-            (p for p in target_dir.iterdir() if p.suffix == ".wav"),
-            key=lambda p: p.stat().st_mtime,
-        )
-
-        total_size = sum(p.stat().st_size for p in files)
+        # Размеры и mtime — из индекса: stat только при появлении файла.
+        files = index.entries()
+        total_size = sum(size for _name, size, _mtime in files)
 
-        for file_path in files:
-            stat = file_path.stat()
-            too_old = now - stat.st_mtime > max_age
+        for name, size, mtime in files:
+            too_old = now - mtime > max_age
             over_quota = total_size > max_bytes
             if too_old or over_quota or cls.low_disk_mode():
+                file_path = target_dir / name
                 try:
-                    size = stat.st_size
                     file_path.unlink(missing_ok=True)
+                    index.discard(name)
                     total_size -= size
                     removed += 1
                 except OSError as exc:
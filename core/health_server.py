@@ -66,7 +66,7 @@ class HealthServer:
         code = 200 if status == "ok" else 503
         return web.json_response(payload, status=code)
 
-    async def metrics_handler(self, _request: web.Request) -> web.Response:
+    async def metrics_handler(self, request: web.Request) -> web.Response:
         ai_size, tts_size = await self._collect_queue_sizes()
         extra = {
             "ai_queue_size": ai_size,
@@ -77,6 +77,11 @@ class HealthServer:
             "stream_uptime_seconds": app_state.uptime_seconds(),
         }
         extra.update(ffmpeg_manager.status_dict())
+        if request.query.get("format") == "prometheus":
+            return web.Response(
+                body=metrics.render_prometheus(extra).encode("utf-8"),
+                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+            )
         return web.json_response(metrics.as_dict(extra))
 
     async def start(self) -> None:
@@ -1,5 +1,8 @@
+import threading
 import time
-from dataclasses import dataclass, field
+from bisect import bisect_left
+from collections.abc import Callable
+from dataclasses import dataclass, field, fields
 
 try:
     import psutil
@@ -7,6 +10,118 @@ except ImportError:  # pragma: no cover
     psutil = None
 
 
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DWELL_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+RATIO_BUCKETS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 4.0)
+
+_PREFIX = "infinity_"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape_label(str(v))}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Метрика с метками; значения по кортежу меток, создаются при первой записи."""
+
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = _PREFIX + name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+
+    def _render_header(self, name: str | None = None) -> list[str]:
+        name = name or self.name
+        return [f"# HELP {name} {self.help_text}", f"# TYPE {name} {self.kind}"]
+
+    def _snapshot(self) -> list[tuple[tuple, list]]:
+        """Копия значений под замком: запись идёт и из потоков executor."""
+        with self._lock:
+            return [(labels, list(cell)) for labels, cell in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0) -> None:
+        with self._lock:
+            cell = self._values.get(labels)
+            if cell is None:
+                cell = self._values[labels] = [0.0]
+            cell[0] += amount
+
+    def render(self) -> list[str]:
+        # Формат 0.0.4: HELP/TYPE — по имени сэмпла (с _total).
+        lines = self._render_header(f"{self.name}_total")
+        for labels, cell in self._snapshot():
+            lines.append(
+                f"{self.name}_total{_format_labels(self.labelnames, labels)} {_format_value(cell[0])}"
+            )
+        return lines
+
+
+class Histogram(_Metric):
+    """
+    Гистограмма с фиксированными границами. observe() — bisect + инкремент
+    в заранее выделенном списке: без аллокаций после первой записи меток.
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            cell = self._values.get(labels)
+            if cell is None:
+                # Счётчики корзин (+Inf последней), затем сумма и количество.
+                cell = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            cell[index] += 1
+            cell[-2] += value
+            cell[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = self._render_header()
+        bounds = self.buckets + (float("inf"),)
+        for labels, cell in self._snapshot():
+            cumulative = 0
+            for bound, count in zip(bounds, cell):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(cell[-2])}")
+            lines.append(f"{self.name}_count{label_text} {cell[-1]}")
+        return lines
+
+
 @dataclass
 class AppMetrics:
     """In-process счётчики для /metrics."""
@@ -19,6 +134,119 @@ class AppMetrics:
     ffmpeg_restarts_total: int = 0
     chat_events_total: int = 0
     chat_dropped_total: int = 0
+    control_loop_total: int = 0
+    control_loop_seconds_total: float = 0.0
+    tts_speech_seconds_total: float = 0.0
+    tts_trimmed_seconds_total: float = 0.0
+
+    llm_request_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "llm_request_seconds",
+            "Длительность одной попытки запроса к LLM API.",
+            ("provider", "status"),
+        )
+    )
+    tts_chunk_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "tts_chunk_synthesis_seconds",
+            "Синтез одного фрагмента текста Silero.",
+        )
+    )
+    tts_real_time_factor: Histogram = field(
+        default_factory=lambda: Histogram(
+            "tts_real_time_factor",
+            "Время синтеза / длительность полученного аудио.",
+            buckets=RATIO_BUCKETS,
+        )
+    )
+    tts_first_sound_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "tts_first_sound_seconds",
+            "От начала синтеза реплики до первого звука.",
+        )
+    )
+    tts_sentence_gap_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "tts_sentence_gap_seconds",
+            "Тишина между соседними репликами монолога (следующая уже ждала в очереди).",
+        )
+    )
+    tts_lookahead_total: Counter = field(
+        default_factory=lambda: Counter(
+            "tts_lookahead",
+            "Реплики монолога по упреждающему синтезу: hit — звук был готов.",
+            ("result",),
+        )
+    )
+    tts_audio_cache_total: Counter = field(
+        default_factory=lambda: Counter(
+            "tts_audio_cache",
+            "Обращения к кэшу синтезированного звука: memory, disk или miss.",
+            ("result",),
+        )
+    )
+    wikiquote_request_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "wikiquote_request_seconds",
+            "Запрос к Wiki API по action.",
+            ("action", "status"),
+        )
+    )
+    wikiquote_cache_total: Counter = field(
+        default_factory=lambda: Counter(
+            "wikiquote_cache",
+            "Кэш Wiki API по политике и кэш цитат (policy=quotes): hit, stale, miss, "
+            "stale_error, revalidated, changed.",
+            ("policy", "result"),
+        )
+    )
+    wikiquote_author_pick_total: Counter = field(
+        default_factory=lambda: Counter(
+            "wikiquote_author_pick",
+            "Откуда взят случайный автор: index (локальный индекс), category "
+            "(страница категории онлайн), fallback (резервный список).",
+            ("source",),
+        )
+    )
+    tts_queue_dwell_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "tts_queue_dwell_seconds",
+            "Время от постановки реплики в очередь до начала озвучки.",
+            ("kind",),
+            buckets=DWELL_BUCKETS,
+        )
+    )
+    chat_dropped_by_reason: Counter = field(
+        default_factory=lambda: Counter(
+            "chat_dropped_by_reason",
+            "Отброшенные сообщения чата по причине.",
+            ("reason",),
+        )
+    )
+    control_loop_seconds: Histogram = field(
+        default_factory=lambda: Histogram(
+            "control_loop_seconds",
+            "Чтение ControlSnapshot в начале прохода цикла.",
+        )
+    )
+    # Значения, которые ведёт сам источник (callback аудиоплеера), — читаются
+    # при выдаче /metrics, а не копируются сюда на каждом событии.
+    _sources: dict[str, Callable[[], float]] = field(default_factory=dict, repr=False)
+
+    def register_source(self, key: str, read: Callable[[], float]) -> None:
+        """key в as_dict и /metrics — результат read() в момент выдачи."""
+        self._sources[key] = read
+
+    def observe_control_loop(self, seconds: float) -> None:
+        """Время чтения ControlSnapshot в начале прохода цикла."""
+        self.control_loop_total += 1
+        self.control_loop_seconds_total += seconds
+        self.control_loop_seconds.observe(seconds)
+
+    def observe_tts_post(self, kept_seconds: float, trimmed_seconds: float) -> None:
+        """Длительность фразы после обработки и срезанная с краёв тишина."""
+        self.tts_speech_seconds_total += kept_seconds
+        self.tts_trimmed_seconds_total += trimmed_seconds
 
     def uptime_seconds(self) -> int:
         return int(time.time() - self.started_at)
@@ -45,10 +273,44 @@ class AppMetrics:
             "ffmpeg_restarts_total": self.ffmpeg_restarts_total,
             "chat_events_total": self.chat_events_total,
             "chat_dropped_total": self.chat_dropped_total,
+            "control_loop_total": self.control_loop_total,
+            "control_loop_avg_ms": round(
+                self.control_loop_seconds_total * 1000 / self.control_loop_total, 3
+            )
+            if self.control_loop_total
+            else 0.0,
+            "tts_speech_seconds_total": round(self.tts_speech_seconds_total, 3),
+            "tts_trimmed_seconds_total": round(self.tts_trimmed_seconds_total, 3),
+            # Сколько секунд эфира сэкономлено на каждый час озвучки.
+            "tts_airtime_saved_seconds_per_hour": round(
+                self.tts_trimmed_seconds_total * 3600 / self.tts_speech_seconds_total, 1
+            )
+            if self.tts_speech_seconds_total
+            else 0.0,
         }
+        for key, read in self._sources.items():
+            data[key] = read()
         if extra:
             data.update(extra)
         return data
 
+    def render_prometheus(self, extra: dict | None = None) -> str:
+        """Текстовый формат Prometheus: плоские значения as_dict + метрики с метками."""
+        lines: list[str] = []
+        for key, value in self.as_dict(extra).items():
+            if isinstance(value, bool):
+                value = int(value)
+            if not isinstance(value, (int, float)):
+                continue
+            name = f"{_PREFIX}{key}"
+            kind = "counter" if key.endswith("_total") else "gauge"
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {_format_value(value)}")
+        for item in fields(self):
+            metric = getattr(self, item.name)
+            if isinstance(metric, _Metric):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
 
 metrics = AppMetrics()
@@ -0,0 +1,43 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupProfile:
+    """
+    Фазы запуска процесса: начало от старта профиля и длительность.
+    Фазы из фоновых потоков (загрузка модели) пишутся наравне с основными.
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.perf_counter()
+        self._phases: list[tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._phases.append(
+                    (name, started - self._origin, finished - started)
+                )
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._origin
+
+    def report(self) -> str:
+        with self._lock:
+            phases = sorted(self._phases, key=lambda p: p[1])
+        width = max([len(name) for name, _, _ in phases] + [4])
+        lines = [f"{'фаза':<{width}}  начало, с  длительность, с"]
+        for name, offset, duration in phases:
+            lines.append(f"{name:<{width}}  {offset:9.3f}  {duration:15.3f}")
+        lines.append(f"{'готов':<{width}}  {self.elapsed():9.3f}")
+        return "\n".join(lines)
+
+
+startup_profile = StartupProfile()
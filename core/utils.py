@@ -1,4 +1,3 @@
-import re
 import socket
 from transliterate import translit
 
@@ -15,16 +14,8 @@ def is_tcp_port_in_use(host: str, port: int) -> bool:
 
 
 def transliterate_and_replace_symbols(text):
-    symbol_map = {
-        "_": " ",
-    }
-
-    # Сначала заменяем символы
-    def replace_symbols(match):
-        ch = match.group(0)
-        return symbol_map.get(ch, ch)
-
-    text = re.sub(r'[_.,!?:;\-\(\)"\'/@#$%&*+=<>\[\]{}^`~|]', replace_symbols, text)
+    # Из знаков препинания заменяется только "_" — остальные остаются как есть.
+    text = text.replace("_", " ")
     text = translit(text, "ru")
     return text
 
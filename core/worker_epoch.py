@@ -13,17 +13,29 @@ async def bump_stream_epoch(redis_manager: RedisManager) -> str:
     return epoch
 
 
-async def worker_epoch_valid(redis_manager: RedisManager) -> bool:
+_UNKNOWN = object()
+
+
+async def worker_epoch_valid(
+    redis_manager: RedisManager,
+    current_epoch=_UNKNOWN,
+) -> bool:
     expected = os.getenv("STREAM_EPOCH", "").strip()
     if not expected:
         return True
-    current = await redis_manager.get_stream_epoch()
-    return current == expected
-
-
-async def retire_stale_worker(redis_manager: RedisManager, role: str) -> bool:
-    """True — воркер устарел и запрошен shutdown."""
-    if await worker_epoch_valid(redis_manager):
+    if current_epoch is _UNKNOWN:
+        current_epoch = await redis_manager.get_stream_epoch()
+    return current_epoch == expected
+
+
+async def retire_stale_worker(
+    redis_manager: RedisManager,
+    role: str,
+    *,
+    current_epoch=_UNKNOWN,
+) -> bool:
+    """True — воркер устарел и запрошен shutdown (current_epoch — из ControlSnapshot)."""
+    if await worker_epoch_valid(redis_manager, current_epoch):
         return False
     from core.logger import logger
 
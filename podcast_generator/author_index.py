@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from core.disk_guard import DiskGuard
+from core.logger import logger
+
+
+@dataclass(frozen=True)
+class AuthorEntry:
+    """Участник категории персоналий и заранее посчитанные признаки пригодности."""
+
+    title: str
+    archetype: bool
+    foreign_agent: bool
+    region: bool | None
+    concrete: bool
+    categories: tuple[str, ...] = ()
+
+    @property
+    def eligible(self) -> bool:
+        return (
+            self.concrete
+            and not self.archetype
+            and not self.foreign_agent
+            and self.region is not False
+        )
+
+
+class AuthorIndex:
+    """
+    Локальный индекс участников категории персоналий (SQLite, WAL).
+
+    Полный обход категории идёт пачками, позиция continue сохраняется после
+    каждой: прерванная сборка продолжается с того же места после перезапуска.
+    Готовый индекс дополняется новыми страницами из recentchanges, а раз в
+    rebuild_after секунд категория обходится заново — так уходят удалённые
+    страницы и обновляются признаки. Пригодные авторы держатся в памяти:
+    случайный выбор равномерен по всей категории и не ходит в сеть.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        category: str,
+        *,
+        refresh_after: float,
+        rebuild_after: float,
+    ) -> None:
+        self._category = category
+        self._refresh_after = refresh_after
+        self._rebuild_after = rebuild_after
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS authors ("
+            " category TEXT NOT NULL,"
+            " title TEXT NOT NULL,"
+            " archetype INTEGER NOT NULL,"
+            " foreign_agent INTEGER NOT NULL,"
+            " region INTEGER,"
+            " concrete INTEGER NOT NULL,"
+            " rejected INTEGER NOT NULL DEFAULT 0,"
+            " categories TEXT NOT NULL,"
+            " generation INTEGER NOT NULL,"
+            " PRIMARY KEY (category, title))"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS author_index_state ("
+            " category TEXT PRIMARY KEY,"
+            " generation INTEGER NOT NULL,"
+            " position TEXT,"
+            " built_at REAL NOT NULL,"
+            " rc_since TEXT,"
+            " rc_checked_at REAL NOT NULL)"
+        )
+        self._db.commit()
+        row = self._db.execute(
+            "SELECT generation, position, built_at, rc_since, rc_checked_at"
+            " FROM author_index_state WHERE category = ?",
+            (category,),
+        ).fetchone()
+        if row is None:
+            row = (0, None, 0.0, None, 0.0)
+        self._generation, position, self._built_at, self._rc_since, self._rc_checked_at = row
+        self._position: dict | None = json.loads(position) if position else None
+        self._titles: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._reload()
+
+    # --- выборка ---
+
+    def _reload(self) -> None:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT title FROM authors WHERE category = ? AND rejected = 0"
+                " AND concrete = 1 AND archetype = 0 AND foreign_agent = 0"
+                " AND (region IS NULL OR region = 1)",
+                (self._category,),
+            ).fetchall()
+        self._titles = [title for (title,) in rows]
+        self._positions = {title: i for i, title in enumerate(self._titles)}
+
+    @property
+    def ready(self) -> bool:
+        """Категория обойдена хотя бы раз полностью."""
+        return self._generation > 0
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def sample(self, exclude: set[str], *, attempts: int = 16) -> str | None:
+        """
+        Равномерно случайный пригодный автор не из exclude (имена в нижнем
+        регистре). Обычно — первая же попытка; если exclude покрывает почти
+        весь индекс, выбор идёт из явно отфильтрованного списка.
+        """
+        if not self._titles:
+            return None
+        for _ in range(attempts):
+            title = random.choice(self._titles)
+            if title.lower() not in exclude:
+                return title
+        pool = [title for title in self._titles if title.lower() not in exclude]
+        return random.choice(pool) if pool else None
+
+    def _remove(self, title: str) -> None:
+        index = self._positions.pop(title, None)
+        if index is None:
+            return
+        last = self._titles.pop()
+        if index < len(self._titles):
+            self._titles[index] = last
+            self._positions[last] = index
+
+    async def reject(self, title: str) -> None:
+        """Автор не прошёл проверку на странице — не предлагать до следующего обхода."""
+        self._remove(title)
+        await self._run(
+            "UPDATE authors SET rejected = 1 WHERE category = ? AND title = ?",
+            (self._category, title),
+        )
+
+    # --- обновление ---
+
+    @property
+    def build_position(self) -> dict | None:
+        """continue для продолжения прерванного обхода; None — обход с начала."""
+        return self._position
+
+    def needs_rebuild(self) -> bool:
+        return (
+            not self.ready
+            or self._position is not None
+            or time.time() - self._built_at > self._rebuild_after
+        )
+
+    def needs_recent_changes(self) -> bool:
+        return self.ready and time.time() - self._rc_checked_at > self._refresh_after
+
+    @property
+    def recent_changes_since(self) -> str | None:
+        return self._rc_since
+
+    def _write_generation(self) -> int:
+        building = self._position is not None or not self.ready
+        return self._generation + 1 if building else self._generation
+
+    def _save_state(self) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO author_index_state VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                self._category,
+                self._generation,
+                json.dumps(self._position) if self._position else None,
+                self._built_at,
+                self._rc_since,
+                self._rc_checked_at,
+            ),
+        )
+
+    def _store_entries(self, entries: list[AuthorEntry], generation: int) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO authors VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?)",
+            [
+                (
+                    self._category,
+                    entry.title,
+                    int(entry.archetype),
+                    int(entry.foreign_agent),
+                    None if entry.region is None else int(entry.region),
+                    int(entry.concrete),
+                    json.dumps(entry.categories, ensure_ascii=False),
+                    generation,
+                )
+                for entry in entries
+            ],
+        )
+
+    def _store_batch(self, entries: list[AuthorEntry], position: dict | None) -> None:
+        with self._lock:
+            generation = self._generation + 1
+            self._store_entries(entries, generation)
+            self._position = position
+            if position is None:
+                # Обход завершён: всё, что не встретилось, из категории ушло.
+                self._db.execute(
+                    "DELETE FROM authors WHERE category = ? AND generation < ?",
+                    (self._category, generation),
+                )
+                self._generation = generation
+                self._built_at = time.time()
+            self._save_state()
+            self._db.commit()
+
+    async def store_batch(
+        self,
+        entries: list[AuthorEntry],
+        position: dict | None,
+        *,
+        started_at: str | None = None,
+    ) -> None:
+        """
+        Пачка полного обхода. position=None — обход завершён: индекс
+        перечитывается, а recentchanges дальше смотрятся с started_at.
+        """
+        loop = asyncio.get_running_loop()
+        if position is None and started_at and not self._rc_since:
+            self._rc_since = started_at
+            self._rc_checked_at = time.time()
+        await loop.run_in_executor(None, self._store_batch, entries, position)
+        if position is None:
+            self._reload()
+            logger.info(
+                "Индекс авторов: %s пригодных из категории «%s»",
+                len(self._titles),
+                self._category,
+            )
+
+    def _store_recent(self, entries: list[AuthorEntry], since: str) -> None:
+        with self._lock:
+            self._store_entries(entries, self._write_generation())
+            self._rc_since = since
+            self._rc_checked_at = time.time()
+            self._save_state()
+            self._db.commit()
+
+    async def store_recent(self, entries: list[AuthorEntry], since: str) -> None:
+        """Новые страницы категории из recentchanges; since — откуда смотреть дальше."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._store_recent, entries, since)
+        for entry in entries:
+            if entry.eligible and entry.title not in self._positions:
+                self._positions[entry.title] = len(self._titles)
+                self._titles.append(entry.title)
+
+    async def _run(self, sql: str, args: tuple) -> None:
+        if DiskGuard.low_disk_mode():
+            return
+
+        def execute() -> None:
+            with self._lock:
+                self._db.execute(sql, args)
+                self._db.commit()
+
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, execute)
+        except sqlite3.Error as exc:
+            logger.warning("Индекс авторов: запись не удалась: %s", exc)
@@ -18,14 +18,21 @@ from core.config import Config
 from core.app_state import app_state
 from core.worker_epoch import retire_stale_worker
 from core.chat_guard import chat_guard
-from core.chat_queue import has_actionable_chat_messages, parse_chat_payload
+from core.chat_queue import (
+    has_actionable_chat_messages,
+    parse_chat_payload,
+    snapshot_has_actionable_chat,
+)
 from core.disk_guard import DiskGuard
+from core.metrics import metrics
 from redis_client.redis_manager import RedisManager
 from redis_client.topic_apply import apply_topic_with_interrupt
 from redis_client.topic_control_store import TopicControlStore
 from redis_client.chat_notify_store import ChatNotifyStore
 from redis_client.chat_outbound_store import ChatOutboundStore
+from redis_client.control_snapshot import ControlSnapshot, ControlSnapshotReader
 from redis_client.prepared_monologue_store import PreparedMonologueStore
+from redis_client.revision_watcher import RevisionWatcher
 from redis_client.visual_overlay_store import VisualOverlayStore
 from podcast_generator.build_prompts import PromptsBuilder
 from podcast_generator.topic_rules import decode_topic_list
@@ -51,6 +58,8 @@ class PodcastGenerator:
         self.chat_outbound_store = ChatOutboundStore(redis_manager.redis_client)
         self.visual_overlay_store = VisualOverlayStore(redis_manager.redis_client)
         self.prepared_store = PreparedMonologueStore(redis_manager.redis_client)
+        self.snapshot_reader = ControlSnapshotReader(redis_manager)
+        self.revision_watcher = RevisionWatcher(redis_manager.redis_client)
         self.prompts_builder = PromptsBuilder()
         self.wikiquote = WikiquoteClient()
         self._last_monologue_at = 0.0
@@ -74,8 +83,11 @@ class PodcastGenerator:
     def _set_manual_fetch_cooldown(self, seconds: float = 15.0) -> None:
         self._manual_fetch_cooldown_until = time.monotonic() + seconds
 
-    async def _peek_prepared(self, gen_rev: int) -> _PreparedMonologue | None:
-        data = await self.prepared_store.peek(gen_rev)
+    @staticmethod
+    def _peek_prepared(
+        snapshot: ControlSnapshot, gen_rev: int
+    ) -> _PreparedMonologue | None:
+        data = snapshot.prepared_for(gen_rev)
         if data is None:
             return None
         return _PreparedMonologue(
@@ -116,48 +128,43 @@ class PodcastGenerator:
     async def _clear_prepared(self) -> None:
         await self.prepared_store.clear()
 
-    async def _kick_prep(self, session) -> None:
-        if await self.topic_store.is_manual_topic_active():
-            return
+    async def _kick_prep(
+        self, session, snapshot: ControlSnapshot | None = None
+    ) -> None:
         if self._prep_task and not self._prep_task.done():
             return
-        gen_rev = await self.topic_store.get_topic_revision()
-        if await self.prepared_store.has_for_revision(gen_rev):
+        if snapshot is None:
+            snapshot = await self.snapshot_reader.read()
+        if snapshot.manual_topic_active:
             return
-        if not await self._can_prepare_monologue():
+        if snapshot.prepared_for(snapshot.topic_revision) is not None:
+            return
+        if not self._can_prepare_monologue(snapshot):
             return
-        forced_person = None
-        if await self.topic_store.is_manual_topic_active():
-            forced_person = (await self.topic_store.get_manual_person()).strip()
-            if forced_person and self._manual_fetch_on_cooldown():
-                return
         self._prep_task = asyncio.create_task(
-            self._prepare_one_monologue(session, forced_person or None)
+            self._prepare_one_monologue(session, snapshot.topic_revision)
         )
 
-    async def _can_prepare_monologue(self) -> bool:
+    @staticmethod
+    def _can_prepare_monologue(snapshot: ControlSnapshot) -> bool:
         if app_state.shutting_down or not app_state.monologues_enabled:
             return False
         if DiskGuard.low_disk_mode():
             return False
         if chat_guard.is_chat_busy():
             return False
-        if await has_actionable_chat_messages(self.redis_manager):
-            return False
-        if await self.redis_manager.is_chat_processing():
+        if snapshot_has_actionable_chat(snapshot):
             return False
         return True
 
-    async def _prepare_one_monologue(self, session, forced_person: str | None) -> None:
-        gen_rev = await self.topic_store.get_topic_revision()
-        quote_item = await self._fetch_wikiquote_quote(session, forced_person)
+    async def _prepare_one_monologue(self, session, gen_rev: int) -> None:
+        quote_item = await self._fetch_wikiquote_quote(session, None)
         if quote_item is None:
             return
-        if await self.topic_store.get_topic_revision() != gen_rev:
+        snapshot = await self.snapshot_reader.read()
+        if snapshot.topic_revision != gen_rev:
             return
-        if await has_actionable_chat_messages(self.redis_manager):
-            return
-        if await self.redis_manager.is_chat_processing():
+        if snapshot_has_actionable_chat(snapshot):
             return
         commentary = await self.generate_wikiquote_commentary(
             session,
@@ -166,7 +173,7 @@ class PodcastGenerator:
         )
         if not commentary or not commentary.strip():
             return
-        if await self.topic_store.get_topic_revision() != gen_rev:
+        if self.revision_watcher.is_stale(gen_rev):
             return
         await self._store_prepared(
             _PreparedMonologue(quote_item, commentary.strip(), gen_rev)
@@ -178,27 +185,19 @@ class PodcastGenerator:
         while not app_state.shutting_down:
             try:
                 await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
-                if await self.topic_store.is_manual_topic_active():
-                    continue
-                gen_rev = await self.topic_store.get_topic_revision()
-                if await self.prepared_store.has_for_revision(gen_rev):
-                    continue
-                if not await self._can_prepare_monologue():
-                    continue
                 await self._kick_prep(session)
             except asyncio.CancelledError:
                 break
             except Exception:
                 logger.exception("Ошибка цикла подготовки монолога")
 
-    async def _monologue_emit_allowed(self, gen_rev: int) -> bool:
-        if await has_actionable_chat_messages(self.redis_manager):
-            return False
-        if await self.redis_manager.is_chat_processing():
+    @staticmethod
+    def _monologue_emit_allowed(snapshot: ControlSnapshot, gen_rev: int) -> bool:
+        if snapshot_has_actionable_chat(snapshot):
             return False
-        if await self._has_pending_chat():
+        if snapshot.chat_queue_length > 0:
             return False
-        if await self.topic_store.get_topic_revision() != gen_rev:
+        if snapshot.topic_revision != gen_rev:
             return False
         return True
 
@@ -224,17 +223,16 @@ class PodcastGenerator:
             )
             return False
 
-        enqueue_rev = await self.topic_store.get_topic_revision()
-        if enqueue_rev != gen_rev:
+        if self.revision_watcher.is_stale(gen_rev):
             return False
+        enqueue_rev = gen_rev
 
         self._current_person = quote_item.person
         await self.visual_overlay_store.set_page_image(quote_item.image_url)
         await self.visual_overlay_store.set_page_quote(quote_item.quote)
         await self.topic_store.set_current_topic(quote_item.person, notify=False)
         await self.visual_overlay_store.clear_chat_overlay()
-        await self._wait_podcast_queue_slot()
-        if await self.topic_store.get_topic_revision() != enqueue_rev:
+        if self.revision_watcher.is_stale(enqueue_rev):
             logger.info("Цитата отменена — смена перед озвучкой")
             return False
 
@@ -257,8 +255,9 @@ class PodcastGenerator:
         await self._enqueue_sentences(commentary, topic_revision=enqueue_rev)
         return True
 
-    async def _sync_external_topic(self) -> bool:
-        revision = await self.topic_store.get_topic_revision()
+    async def _sync_external_topic(self, revision: int | None = None) -> bool:
+        if revision is None:
+            revision = await self.topic_store.get_topic_revision()
         if revision == self._last_topic_revision:
             return False
 
@@ -288,6 +287,30 @@ class PodcastGenerator:
         logger.info("Синхронизирован автор: %s", self._current_person)
         return True
 
+    async def _idle(self, gen_rev: int) -> None:
+        """Пауза цикла, прерываемая сменой автора."""
+        await self.revision_watcher.wait_newer(
+            gen_rev, timeout=Config.STREAMER_POLL_INTERVAL
+        )
+
+    async def _unless_superseded(self, coro, gen_rev: int):
+        """Выполняет coro; при смене автора отменяет его и возвращает None."""
+        task = asyncio.ensure_future(coro)
+        while not task.done():
+            if self.revision_watcher.is_stale(gen_rev):
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+                return None
+            watch = asyncio.ensure_future(self.revision_watcher.wait_newer(gen_rev))
+            try:
+                await asyncio.wait({task, watch}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                watch.cancel()
+        return task.result()
+
     async def _has_pending_chat(self) -> bool:
         return await self.redis_manager.get_chat_messages_queue_length() > 0
 
@@ -305,31 +328,42 @@ class PodcastGenerator:
     async def run(self, session):
         """Основной цикл: цитата → комментарий → озвучка."""
         self._current_person = await self.topic_store.get_current_topic()
-        self._last_topic_revision = await self.topic_store.get_topic_revision()
+        self._last_topic_revision = await self.revision_watcher.start()
         chat_task = asyncio.create_task(self._chat_watch_loop(session))
         prep_task = asyncio.create_task(self._monologue_prep_loop(session))
         await self._kick_prep(session)
         try:
             while not app_state.shutting_down:
                 app_state.touch_heartbeat()
-                if await retire_stale_worker(self.redis_manager, "podcaster"):
+                loop_started = time.perf_counter()
+                snapshot = await self.snapshot_reader.read()
+                if await retire_stale_worker(
+                    self.redis_manager,
+                    "podcaster",
+                    current_epoch=snapshot.stream_epoch,
+                ):
                     break
 
-                await self._sync_external_topic()
+                changed = await self._sync_external_topic(snapshot.topic_revision)
 
-                pending = await self.topic_store.consume_pending_topic()
-                if pending:
+                if snapshot.pending_topic:
+                    await self.topic_store.clear_pending_topic()
                     await apply_topic_with_interrupt(
-                        self.topic_store, self.redis_manager, pending
+                        self.topic_store, self.redis_manager, snapshot.pending_topic
                     )
                     await self._sync_external_topic()
+                    changed = True
+
+                if changed:
+                    snapshot = await self.snapshot_reader.read()
+                metrics.observe_control_loop(time.perf_counter() - loop_started)
 
-                gen_rev = await self.topic_store.get_topic_revision()
-                prepared = await self._peek_prepared(gen_rev)
+                gen_rev = snapshot.topic_revision
+                prepared = self._peek_prepared(snapshot, gen_rev)
                 if (
                     prepared
-                    and await self._can_start_commentary()
-                    and await self._monologue_emit_allowed(gen_rev)
+                    and self._can_start_commentary(snapshot)
+                    and self._monologue_emit_allowed(snapshot, gen_rev)
                 ):
                     taken = await self._take_prepared(gen_rev)
                     if taken is None:
@@ -353,27 +387,27 @@ class PodcastGenerator:
                         await asyncio.sleep(Config.CHAT_POLL_INTERVAL_SECONDS)
                         continue
 
-                if await has_actionable_chat_messages(self.redis_manager):
+                if snapshot_has_actionable_chat(snapshot):
                     await asyncio.sleep(Config.CHAT_POLL_INTERVAL_SECONDS)
                     continue
 
-                if not await self._recover_stale_tts_queue():
-                    await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+                if not await self._recover_stale_tts_queue(snapshot):
+                    await self._idle(gen_rev)
                     continue
 
-                if not await self._recover_stale_tts_busy():
-                    await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+                if not await self._recover_stale_tts_busy(snapshot):
+                    await self._idle(gen_rev)
                     continue
 
-                if not await self._can_start_commentary():
-                    await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+                if not self._can_start_commentary(snapshot):
+                    await self._idle(gen_rev)
                     continue
 
                 forced_person = None
-                if await self.topic_store.is_manual_topic_active():
-                    forced_person = (await self.topic_store.get_manual_person()).strip()
+                if snapshot.manual_topic_active:
+                    forced_person = snapshot.manual_person
                     if forced_person and self._manual_fetch_on_cooldown():
-                        await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+                        await self._idle(gen_rev)
                         continue
 
                 quote_item = await self._fetch_wikiquote_quote(session, forced_person)
@@ -407,18 +441,19 @@ class PodcastGenerator:
                         await self.chat_outbound_store.enqueue(
                             "Ищу новых авторов на Викицитатах…"
                         )
-                    await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+                    await self._idle(gen_rev)
                     continue
 
                 self._consecutive_fetch_failures = 0
                 self._forced_fetch_failures = 0
                 self._last_manual_fail_announced = ""
 
-                if await self.topic_store.get_topic_revision() != gen_rev:
+                snapshot = await self.snapshot_reader.read()
+                if snapshot.topic_revision != gen_rev:
                     logger.info("Цитата отменена — смена во время загрузки")
                     continue
 
-                if await self._has_pending_chat():
+                if snapshot.chat_queue_length > 0:
                     logger.info("Чат ожидает — загрузка цитаты отменена")
                     continue
 
@@ -427,16 +462,22 @@ class PodcastGenerator:
                     quote_item.person,
                     quote_item.quote[:80],
                 )
-                commentary = await self.generate_wikiquote_commentary(session, quote_item)
+                commentary = await self._unless_superseded(
+                    self.generate_wikiquote_commentary(session, quote_item), gen_rev
+                )
+                if commentary is None and self.revision_watcher.is_stale(gen_rev):
+                    logger.info("Комментарий отменён — автор сменился во время генерации")
+                    continue
                 if commentary is None:
                     await asyncio.sleep(Config.MONOLOGUE_MIN_INTERVAL_SECONDS)
                     continue
 
-                if await self.topic_store.get_topic_revision() != gen_rev:
+                snapshot = await self.snapshot_reader.read()
+                if snapshot.topic_revision != gen_rev:
                     logger.info("Комментарий отменён — автор сменился во время генерации")
                     continue
 
-                if await self._has_pending_chat():
+                if snapshot.chat_queue_length > 0:
                     logger.info("Чат ожидает — сгенерированный комментарий отменён")
                     continue
 
@@ -450,7 +491,8 @@ class PodcastGenerator:
                 await self._remember_quote(quote_item)
                 logger.info("Комментарий: %s символов", len(commentary))
 
-                if not await self._monologue_emit_allowed(gen_rev):
+                snapshot = await self.snapshot_reader.read()
+                if not self._monologue_emit_allowed(snapshot, gen_rev):
                     logger.info("Монолог отменён — чат или смена автора перед озвучкой")
                     continue
 
@@ -471,18 +513,19 @@ class PodcastGenerator:
                     await task
                 except asyncio.CancelledError:
                     pass
+            await self.revision_watcher.stop()
 
-    async def _recover_stale_tts_queue(self) -> bool:
+    async def _recover_stale_tts_queue(self, snapshot: ControlSnapshot) -> bool:
         """
         True — можно продолжать цикл.
         False — в очереди TTS ещё есть реплики, ждём озвучки.
         """
-        queue_len = await self.redis_manager.get_podcast_messages_queue_length()
+        queue_len = snapshot.podcast_queue_length
         if queue_len <= 0:
             self._stale_queue_since = None
             return True
 
-        if await self.redis_manager.is_tts_busy():
+        if snapshot.tts_busy:
             self._stale_queue_since = None
             return False
 
@@ -491,7 +534,7 @@ class PodcastGenerator:
             self._stale_queue_since = now
 
         stale_for = now - self._stale_queue_since
-        if stale_for >= 120:
+        if stale_for >= 120 and not self.redis_manager.uses_tts_streams:
             from speech.audio_player import stop_audio
 
             dropped = await self.redis_manager.clear_podcast_messages_queue()
@@ -513,20 +556,16 @@ class PodcastGenerator:
             self._last_stale_queue_log = now
         return False
 
-    async def _recover_stale_tts_busy(self) -> bool:
+    async def _recover_stale_tts_busy(self, snapshot: ControlSnapshot) -> bool:
         """True — можно продолжать; сбрасывает зависший tts_busy без работы в очередях."""
-        if not await self.redis_manager.is_tts_busy():
+        if not snapshot.tts_busy:
             self._tts_busy_stale_since = None
             return True
 
-        podcast_len = await self.redis_manager.get_podcast_messages_queue_length()
-        reacted_len = (
-            await self.redis_manager.get_reacted_to_chat_messages_queue_length()
-        )
         if (
-            podcast_len > 0
-            or reacted_len > 0
-            or await has_actionable_chat_messages(self.redis_manager)
+            snapshot.podcast_queue_length > 0
+            or snapshot.reacted_queue_length > 0
+            or snapshot_has_actionable_chat(snapshot)
         ):
             self._tts_busy_stale_since = None
             return False
@@ -553,7 +592,7 @@ class PodcastGenerator:
             self._last_tts_busy_log = now
         return False
 
-    async def _can_start_commentary(self) -> bool:
+    def _can_start_commentary(self, snapshot: ControlSnapshot) -> bool:
         if app_state.shutting_down or not app_state.monologues_enabled:
             return False
         if DiskGuard.low_disk_mode():
@@ -562,11 +601,8 @@ class PodcastGenerator:
             logger.info("Комментарии отключены — высокая активность чата")
             return False
         if time.time() - self._last_monologue_at < Config.MONOLOGUE_MIN_INTERVAL_SECONDS:
-            gen_rev = await self.topic_store.get_topic_revision()
-            prepared = await self.prepared_store.peek(gen_rev)
-            queue_empty = (
-                await self.redis_manager.get_podcast_messages_queue_length() == 0
-            )
+            prepared = snapshot.prepared_for(snapshot.topic_revision)
+            queue_empty = snapshot.podcast_queue_length == 0
             if not (prepared and queue_empty):
                 return False
         return True
@@ -783,40 +819,28 @@ class PodcastGenerator:
 
     async def _flush_chat_batch(self, session, current_person) -> None:
         while not app_state.shutting_down:
-            if await self.redis_manager.get_chat_messages_queue_length() == 0:
-                break
             if (
                 await self.redis_manager.get_reacted_to_chat_messages_queue_length()
                 >= Config.CHAT_TTS_QUEUE_MAX_SIZE
             ):
                 logger.warning("Очередь ответов чата переполнена — новые AI-ответы отложены")
                 break
-
-            handled = False
-            for raw in await self.redis_manager.list_chat_messages():
-                message = self._parse_chat_payload(raw)
-                if message is None:
-                    await self.redis_manager.remove_chat_message_raw(raw)
-                    logger.warning("Удалено повреждённое сообщение из очереди чата")
-                    continue
-
-                author = message.get("author", "Аноним")
-                if not chat_guard.can_respond_to_user(author):
-                    continue
-
-                if not await self.redis_manager.remove_chat_message_raw(raw):
-                    continue
-
-                await self.redis_manager.set_chat_processing(True)
-                try:
-                    await self.react_to_chat(raw, session, current_person)
-                finally:
-                    await self.redis_manager.set_chat_processing(False)
-                handled = True
+            if not chat_guard.can_respond_now():
                 break
 
-            if not handled:
+            popped = await self.redis_manager.pop_respondable_chat_message()
+            if popped is None:
                 break
+            _author, raw = popped
+            if self._parse_chat_payload(raw) is None:
+                logger.warning("Удалено повреждённое сообщение из очереди чата")
+                continue
+
+            await self.redis_manager.set_chat_processing(True)
+            try:
+                await self.react_to_chat(raw, session, current_person)
+            finally:
+                await self.redis_manager.set_chat_processing(False)
 
     async def generate_wikiquote_commentary(
         self,
@@ -845,18 +869,28 @@ class PodcastGenerator:
             max_tokens=Config.WIKIQUOTE_COMMENTARY_MAX_TOKENS,
         )
 
-    async def _wait_podcast_queue_slot(self) -> None:
-        """Ждёт, пока в очереди есть место — иначе ltrim отрежет начало реплики."""
-        while (
-            not app_state.shutting_down
-            and await self.redis_manager.get_podcast_messages_queue_length()
-            >= Config.TTS_QUEUE_MAX_SIZE
-        ):
+    async def _wait_podcast_queue_slot(self, topic_revision: int) -> int:
+        """
+        Ждёт, пока в очереди есть место — иначе ltrim отрежет начало реплики.
+        Возвращает число свободных мест; 0 — автор сменился, ждать нечего.
+        """
+        while not app_state.shutting_down:
+            if self.revision_watcher.is_stale(topic_revision):
+                return 0
+            free = (
+                Config.TTS_QUEUE_MAX_SIZE
+                - await self.redis_manager.get_podcast_messages_queue_length()
+            )
+            if free > 0:
+                return free
             now = time.time()
             if now - self._last_queue_wait_log >= 10.0:
                 logger.info("Очередь TTS заполнена, ожидание освобождения")
                 self._last_queue_wait_log = now
-            await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+            await self.revision_watcher.wait_newer(
+                topic_revision, timeout=Config.STREAMER_POLL_INTERVAL
+            )
+        return 0
 
     async def _enqueue_sentences(
         self,
@@ -865,23 +899,30 @@ class PodcastGenerator:
         topic_revision: int,
         priority: bool = False,
     ) -> int:
-        """Кладёт в очередь TTS каждое предложение отдельно."""
-        sentences = split_sentences(text)
-        # priority=LPUSH кладёт в начало списка — идём в обратном порядке, чтобы LPOP читал с начала.
-        ordered = list(reversed(sentences)) if priority else sentences
+        """
+        Кладёт в очередь TTS каждое предложение отдельно — пачками по числу
+        свободных мест, одна проверка длины очереди на пачку.
+        """
+        sentences = [s for s in split_sentences(text) if s.strip()]
         enqueued = 0
-        for sentence in ordered:
-            if await self.topic_store.get_topic_revision() != topic_revision:
+        while sentences:
+            free = await self._wait_podcast_queue_slot(topic_revision)
+            if free <= 0:
                 logger.info(
                     "Постановка в очередь прервана — автор сменился (rev %s)",
                     topic_revision,
                 )
                 break
-            await self._wait_podcast_queue_slot()
-            await self.redis_manager.add_podcast_message(
-                sentence, priority=priority, topic_revision=topic_revision
+            if priority:
+                # priority кладёт в голову очереди — пачки берём с конца текста,
+                # чтобы LPOP читал предложения по порядку.
+                batch, sentences = sentences[-free:], sentences[:-free]
+            else:
+                batch, sentences = sentences[:free], sentences[free:]
+            await self.redis_manager.add_podcast_messages(
+                batch, priority=priority, topic_revision=topic_revision
             )
-            enqueued += 1
+            enqueued += len(batch)
         logger.info(
             "Озвучка по предложениям: %s шт., %s символов всего",
             enqueued,
@@ -961,13 +1002,13 @@ class PodcastGenerator:
                 response_message = cut.rstrip()
 
             chat_guard.mark_responded(author)
+            await self.redis_manager.mark_chat_author_responded(author)
             await self.chat_notify_store.enqueue(author, content, response_message)
             response_message = transliterate_and_replace_symbols(response_message)
             sentences = split_sentences(response_message)
-            for sentence in sentences:
-                await self.redis_manager.add_reacted_to_chat_message(
-                    sentence, priority=False
-                )
+            await self.redis_manager.add_reacted_to_chat_messages(
+                sentences, priority=False
+            )
             logger.info(
                 "Озвучка ответа чата: %s шт., %s символов",
                 len(sentences),
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html import unescape
+
+# Элементы-кандидаты в цитаты, в порядке, в котором их отдавал прежний разбор.
+CANDIDATE_TAGS = ("li", "dd", "p", "blockquote", "td")
+
+# Служебные блоки: сноски, плашки, навигация — пропускаются целиком
+# (по атрибутам открывающего тега); стили и скрипты — всегда.
+_SKIP_RULES = {
+    "ol": re.compile(r"\breferences\b", re.IGNORECASE),
+    "div": re.compile(r"\b(?:mw-references-wrap|hatnote|noprint|mbox)\b", re.IGNORECASE),
+    "table": re.compile(r"\bambox\b", re.IGNORECASE),
+    "style": re.compile(""),
+    "script": re.compile(""),
+}
+_SECTION_HEADING = "h2"
+_HEADINGS = ("h2", "h3", "h4")
+# Один проход по документу: комментарии и только структурные теги
+# (кандидаты, заголовки, служебные контейнеры); атрибуты в кавычках могут
+# содержать ">". Строчная разметка между ними (a, i, sup, span...) остаётся
+# в исходном срезе блока и снимается одной заменой при его закрытии.
+_TOKEN_RE = re.compile(
+    r"<!--.*?(?:-->|$)"
+    r"|<(/?)(" + "|".join((*CANDIDATE_TAGS, *_HEADINGS, *_SKIP_RULES)) + r")\b"
+    r"([^>\"']*(?:(?:\"[^\"]*\"|'[^']*')[^>\"']*)*)>",
+    re.IGNORECASE | re.DOTALL,
+)
+_MARKUP_RE = re.compile(r"<!--.*?(?:-->|$)|<[^>]*>", re.DOTALL)
+_TITLE_TAIL_RE = re.compile(r"\s*\[.*$")
+
+
+@dataclass
+class HtmlSection:
+    """Раздел <h2>: заголовок и подразделы <h3>/<h4> (первый — преамбула "")."""
+
+    title: str
+    subsections: list[str] = field(default_factory=lambda: [""])
+
+
+@dataclass(frozen=True)
+class HtmlBlock:
+    """Текст элемента-кандидата с привязкой к разделу и подразделу."""
+
+    tag: str
+    text: str
+    order: int
+    section: int
+    subsection: int
+
+    @property
+    def rank(self) -> tuple[int, int]:
+        return CANDIDATE_TAGS.index(self.tag), self.order
+
+
+def _plain(text: str) -> str:
+    text = _MARKUP_RE.sub(" ", text)
+    if "&" in text:
+        text = unescape(text)
+    return " ".join(text.split())
+
+
+class QuoteHtmlScanner:
+    """
+    Один проход по HTML action=parse: разделы и текстовые блоки цитат.
+
+    Блок — самый внешний li / dd / p / blockquote / td своего тега со всем
+    вложенным текстом (вложенные списки не обрывают цитату на первом </li>);
+    теги заменяются пробелом, сущности раскрываются. Содержимое до первого
+    <h2> и служебные блоки в разделы не попадают. Разметку режет одно
+    скомпилированное выражение, и по совпадениям идут только структурные
+    теги: текст блока — срез исходника от открывающего до закрывающего тега
+    без служебных блоков и комментариев, он собирается один раз при
+    закрытии блока. html.parser на страницах в сотни КБ в несколько раз
+    медленнее прежних регулярок.
+    """
+
+    def __init__(self) -> None:
+        self.sections: list[HtmlSection] = []
+        self.blocks: list[HtmlBlock] = []
+        self._html = ""
+        self._skip_tag: str | None = None
+        self._skip_depth = 0
+        self._skip_start = 0
+        self._heading: str | None = None
+        self._heading_start = (0, 0)
+        self._depth = dict.fromkeys(CANDIDATE_TAGS, 0)
+        # Открытые блоки: (порядок, раздел, подраздел, начало текста, первый вырез).
+        self._open: dict[str, tuple[int, int, int, int, int]] = {}
+        # Вырезаемые из текста диапазоны (начало, конец, замена): служебные
+        # блоки и комментарии внутри открытого блока или заголовка, по возрастанию.
+        self._cuts: list[tuple[int, int, str]] = []
+        self._order = 0
+
+    def feed(self, html: str) -> None:
+        self._html = html
+        tokens = _TOKEN_RE.finditer(html)
+        for match in tokens:
+            closing, tag, attrs = match.groups()
+            if tag is None:
+                # Комментарий: в текст не попадает и слова не разделяет.
+                self._cut(match.start(), match.end())
+                continue
+            tag = tag.lower()
+            if ">" in attrs:
+                # Кавычки с ">" в атрибутах _MARKUP_RE не снимет — тег вырезается сам.
+                self._cut(match.start(), match.end(), " ")
+            if closing:
+                self.handle_endtag(tag, match.start(), match.end())
+            else:
+                self.handle_starttag(tag, attrs, match.start(), match.end())
+                if self._skip_tag is not None:
+                    self._skip(tokens)
+
+    def _skip(self, tokens) -> None:
+        """Дочитывает служебный блок: внутри важна только вложенность его тега."""
+        for match in tokens:
+            tag = match.group(2)
+            if tag is None or tag.lower() != self._skip_tag:
+                continue
+            if not match.group(1):
+                self._skip_depth += 1
+                continue
+            self._skip_depth -= 1
+            if self._skip_depth == 0:
+                self._skip_tag = None
+                self._cut(self._skip_start, match.end())
+                return
+
+    def _cut(self, start: int, end: int, separator: str = "") -> None:
+        if self._open or self._heading is not None:
+            self._cuts.append((start, end, separator))
+
+    def _text(self, start: int, end: int, first_cut: int) -> str:
+        html = self._html
+        if first_cut == len(self._cuts):
+            return _plain(html[start:end])
+        parts = []
+        for cut_start, cut_end, separator in self._cuts[first_cut:]:
+            parts.append(html[start:cut_start])
+            parts.append(separator)
+            start = cut_end
+        parts.append(html[start:end])
+        return _plain("".join(parts))
+
+    def handle_starttag(self, tag: str, attrs: str, start: int, end: int) -> None:
+        rule = _SKIP_RULES.get(tag)
+        if rule is not None and rule.search(attrs):
+            self._skip_tag = tag
+            self._skip_depth = 1
+            self._skip_start = start
+            return
+        if tag in _HEADINGS:
+            self._heading = tag
+            self._heading_start = (end, len(self._cuts))
+        elif tag in self._depth:
+            self._depth[tag] += 1
+            if self._depth[tag] == 1 and self.sections:
+                section = len(self.sections) - 1
+                subsection = len(self.sections[-1].subsections) - 1
+                self._open[tag] = (self._order, section, subsection, end, len(self._cuts))
+                self._order += 1
+
+    def handle_endtag(self, tag: str, start: int, end: int) -> None:
+        if tag == self._heading:
+            self._finish_heading(tag, start)
+        elif self._depth.get(tag):
+            self._depth[tag] -= 1
+            if self._depth[tag] == 0 and tag in self._open:
+                order, section, subsection, text_start, first_cut = self._open.pop(tag)
+                text = self._text(text_start, start, first_cut)
+                if text:
+                    self.blocks.append(HtmlBlock(tag, text, order, section, subsection))
+        if not self._open and self._heading is None:
+            self._cuts.clear()
+
+    def _finish_heading(self, tag: str, end: int) -> None:
+        text_start, first_cut = self._heading_start
+        title = _TITLE_TAIL_RE.sub("", self._text(text_start, end, first_cut)).strip()
+        self._heading = None
+        if tag == _SECTION_HEADING:
+            self.sections.append(HtmlSection(title))
+        elif self.sections:
+            self.sections[-1].subsections.append(title)
+
+
+def scan_quote_html(html: str) -> QuoteHtmlScanner:
+    scanner = QuoteHtmlScanner()
+    scanner.feed(html)
+    return scanner
@@ -1,5 +1,6 @@
 import asyncio
 import logging
+import time
 from typing import Optional
 
 import aiohttp
@@ -57,6 +58,9 @@ class LLMTextGenerator:
             metrics.ai_requests_total += 1
             retries = 0
             while retries <= Config.AI_MAX_RETRIES:
+                started = time.perf_counter()
+                status = "error"
+                retry = False
                 try:
                     async with session.post(
                         self._api_url,
@@ -64,11 +68,14 @@ class LLMTextGenerator:
                         json=data,
                         timeout=Config.AI_REQUEST_TIMEOUT_SECONDS,
                     ) as resp:
+                        status = str(resp.status)
                         if resp.status == 200:
                             result = await resp.json()
-                            return result["choices"][0]["message"]["content"]
+                            content = result["choices"][0]["message"]["content"]
+                            status = "ok"
+                            return content
+                        metrics.ai_errors_total += 1
                         if resp.status in (429, 500, 502, 503, 504):
-                            metrics.ai_errors_total += 1
                             logger.warning(
                                 "%s API вернул %s, попытка %s/%s",
                                 self._provider,
@@ -76,20 +83,16 @@ class LLMTextGenerator:
                                 retries + 1,
                                 Config.AI_MAX_RETRIES + 1,
                             )
-                            if retries >= Config.AI_MAX_RETRIES:
-                                break
-                            await asyncio.sleep(2**retries)
-                            retries += 1
-                            continue
-                        metrics.ai_errors_total += 1
-                        logger.error(
-                            "Ошибка %s API: %s %s",
-                            self._provider,
-                            resp.status,
-                            await resp.text(),
-                        )
-                        break
+                            retry = True
+                        else:
+                            logger.error(
+                                "Ошибка %s API: %s %s",
+                                self._provider,
+                                resp.status,
+                                await resp.text(),
+                            )
                 except asyncio.TimeoutError:
+                    status = "timeout"
                     metrics.ai_errors_total += 1
                     logger.warning(
                         "Таймаут запроса к %s (%ss), попытка %s/%s",
@@ -98,13 +101,18 @@ class LLMTextGenerator:
                         retries + 1,
                         Config.AI_MAX_RETRIES + 1,
                     )
-                    if retries >= Config.AI_MAX_RETRIES:
-                        break
-                    await asyncio.sleep(2**retries)
-                    retries += 1
+                    retry = True
                 except Exception as e:
                     metrics.ai_errors_total += 1
                     logger.error("Ошибка при запросе к %s API: %s", self._provider, e)
+                finally:
+                    # Только сама попытка — пауза перед повтором не входит.
+                    metrics.llm_request_seconds.observe(
+                        time.perf_counter() - started, self._provider, status
+                    )
+                if not retry or retries >= Config.AI_MAX_RETRIES:
                     break
+                await asyncio.sleep(2**retries)
+                retries += 1
 
         return None
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 
 TOPIC_LINE_RE = re.compile(
     r"^[\*_#\s]*(?:НОВАЯ|Следующая)\s+ТЕМА[\*_\s]*\s*[:\-—]\s*(.+?)\s*$",
@@ -8,6 +9,7 @@ TOPIC_INLINE_RE = re.compile(
     r"\s+[\*_#\s]*(?:НОВАЯ|Следующая)\s+ТЕМА[\*_\s]*\s*[:\-—]\s*.+$",
     re.IGNORECASE,
 )
+_TOPIC_PUNCT_RE = re.compile(r"[^\w\sа-яё]", re.IGNORECASE)
 
 
 def decode_topic_list(raw_topics) -> list[str]:
@@ -33,10 +35,10 @@ def format_banned_topics(topics: list[str], *, limit: int = 15) -> str:
     return "\n".join(f"- {topic}" for topic in lines)
 
 
+@lru_cache(maxsize=1024)
 def normalize_topic_key(topic: str) -> str:
-    text = topic.lower().strip()
-    text = re.sub(r"[^\w\sа-яё]", " ", text, flags=re.IGNORECASE)
-    return re.sub(r"\s+", " ", text).strip()
+    text = _TOPIC_PUNCT_RE.sub(" ", topic.lower())
+    return " ".join(text.split())
 
 
 def topics_are_similar(left: str, right: str) -> bool:
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from urllib.parse import urlencode
+
+from core.disk_guard import DiskGuard
+from core.logger import logger
+
+_DAY = 24 * 3600.0
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Сколько ответ свежий (ttl) и сколько ещё его можно отдавать, обновляя в фоне."""
+
+    name: str
+    ttl: float
+    stale: float
+
+
+# Страницы цитат и категории персоналий меняются редко; поиск и списки
+# категорий — чаще. Устаревший ответ отдаётся сразу и обновляется в фоне.
+_POLICIES = {
+    "parse": CachePolicy("parse", 7 * _DAY, 30 * _DAY),
+    "categorymembers": CachePolicy("categorymembers", 1 * _DAY, 7 * _DAY),
+    "search": CachePolicy("search", 1 * _DAY, 7 * _DAY),
+    "categories": CachePolicy("categories", 7 * _DAY, 30 * _DAY),
+    "pageimages": CachePolicy("pageimages", 7 * _DAY, 30 * _DAY),
+    "titles": CachePolicy("titles", 7 * _DAY, 30 * _DAY),
+    # Проверка ревизии для ParsedQuoteCache — смысл только в свежем ответе.
+    "revisions": CachePolicy("revisions", 3600.0, 0.0),
+    "query": CachePolicy("query", 1 * _DAY, 7 * _DAY),
+}
+
+
+def cache_policy(params: dict[str, str | int]) -> CachePolicy:
+    action = str(params.get("action", ""))
+    if action == "parse":
+        return _POLICIES["parse"]
+    for key in (str(params.get("list", "")), str(params.get("prop", ""))):
+        if key in _POLICIES:
+            return _POLICIES[key]
+    if "titles" in params:
+        return _POLICIES["titles"]
+    return _POLICIES["query"]
+
+
+def wiki_cache_key(base: str, params: dict[str, str | int]) -> str:
+    """Адрес ответа: база API и параметры в каноническом порядке."""
+    canonical = urlencode(sorted((str(k), str(v)) for k, v in params.items()))
+    raw = f"{base.rstrip('/')}?{canonical}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class WikiHttpCache:
+    """
+    Постоянный кэш ответов Wiki API в SQLite (WAL): ключ — база и параметры,
+    тело — JSON в zlib. Время получения хранится с ответом, решение
+    «свежий / устаревший / просрочен» принимает вызывающий по CachePolicy.
+    Объём ограничен max_bytes: лишнее и просроченное удаляется по времени.
+    Обращения к базе — в потоках executor, event loop не блокируется.
+    """
+
+    _PRUNE_EVERY = 100
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        self._path = Path(path)
+        self._max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(self._path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " policy TEXT NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " body BLOB NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS responses_fetched ON responses(fetched_at)"
+        )
+        self._db.commit()
+        self._prune()
+
+    def _lookup(self, key: str) -> tuple[dict, float] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fetched_at, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        fetched_at, body = row
+        try:
+            return json.loads(zlib.decompress(body)), fetched_at
+        except (zlib.error, ValueError) as exc:
+            logger.warning("Кэш Wiki API: повреждённая запись %s: %s", key, exc)
+            return None
+
+    def _store(self, key: str, policy: CachePolicy, data: dict) -> None:
+        body = zlib.compress(
+            json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        )
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (key, policy.name, now, now + policy.ttl + policy.stale, body),
+            )
+            self._db.commit()
+            self._stores += 1
+            prune = self._stores % self._PRUNE_EVERY == 0
+        if prune:
+            self._prune()
+
+    def _prune(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM responses WHERE expires_at < ?", (time.time(),))
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(LENGTH(body)), 0) FROM responses"
+            ).fetchone()[0]
+            if total > self._max_bytes:
+                excess = total - self._max_bytes
+                freed = 0
+                doomed: list[str] = []
+                for key, size in self._db.execute(
+                    "SELECT key, LENGTH(body) FROM responses ORDER BY fetched_at"
+                ):
+                    if freed >= excess:
+                        break
+                    doomed.append(key)
+                    freed += size
+                self._db.executemany(
+                    "DELETE FROM responses WHERE key = ?", [(k,) for k in doomed]
+                )
+            self._db.commit()
+
+    async def lookup(self, key: str) -> tuple[dict, float] | None:
+        """(ответ, возраст в секундах) или None."""
+        loop = asyncio.get_running_loop()
+        try:
+            found = await loop.run_in_executor(None, self._lookup, key)
+        except sqlite3.Error as exc:
+            logger.warning("Кэш Wiki API: чтение не удалось: %s", exc)
+            return None
+        if found is None:
+            return None
+        data, fetched_at = found
+        return data, max(0.0, time.time() - fetched_at)
+
+    async def store(self, key: str, policy: CachePolicy, data: dict) -> None:
+        if DiskGuard.low_disk_mode():
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._store, key, policy, data)
+        except sqlite3.Error as exc:
+            logger.warning("Кэш Wiki API: запись не удалась: %s", exc)
+
+
+@dataclass(frozen=True)
+class CachedQuotes:
+    page_title: str
+    revid: int
+    quotes: list[tuple[str, str | None]]
+    age: float
+
+
+class ParsedQuoteCache:
+    """
+    Извлечённые цитаты страницы по (заголовок, revid) — в том же файле SQLite.
+
+    Пока ревизия страницы не сменилась, HTML не разбирается заново. Записи
+    другой версии извлечения (extractor_version) считаются отсутствующими:
+    смена правил разбора не отдаёт старые результаты.
+    """
+
+    def __init__(self, path: str, extractor_version: int) -> None:
+        self._version = extractor_version
+        self._lock = threading.Lock()
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS quotes ("
+            " title TEXT PRIMARY KEY,"
+            " page_title TEXT NOT NULL,"
+            " revid INTEGER NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " checked_at REAL NOT NULL,"
+            " body BLOB NOT NULL)"
+        )
+        self._db.commit()
+
+    def _lookup(self, title: str) -> CachedQuotes | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT page_title, revid, checked_at, body FROM quotes"
+                " WHERE title = ? AND version = ?",
+                (title, self._version),
+            ).fetchone()
+        if row is None:
+            return None
+        page_title, revid, checked_at, body = row
+        try:
+            quotes = [tuple(item) for item in json.loads(zlib.decompress(body))]
+        except (zlib.error, ValueError):
+            return None
+        return CachedQuotes(page_title, revid, quotes, max(0.0, time.time() - checked_at))
+
+    def _store(
+        self,
+        title: str,
+        page_title: str,
+        revid: int,
+        quotes: list[tuple[str, str | None]],
+    ) -> None:
+        body = zlib.compress(
+            json.dumps(quotes, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        )
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?, ?, ?)",
+                (title, page_title, revid, self._version, time.time(), body),
+            )
+            self._db.commit()
+
+    def _touch(self, title: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE quotes SET checked_at = ? WHERE title = ?", (time.time(), title)
+            )
+            self._db.commit()
+
+    async def lookup(self, title: str) -> CachedQuotes | None:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(None, self._lookup, title)
+        except sqlite3.Error as exc:
+            logger.warning("Кэш цитат: чтение не удалось: %s", exc)
+            return None
+
+    async def store(
+        self,
+        title: str,
+        page_title: str,
+        revid: int,
+        quotes: list[tuple[str, str | None]],
+    ) -> None:
+        if DiskGuard.low_disk_mode():
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                None, self._store, title, page_title, revid, quotes
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Кэш цитат: запись не удалась: %s", exc)
+
+    async def touch(self, title: str) -> None:
+        """Ревизия подтверждена — доверять записи ещё на TTL."""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._touch, title)
+        except sqlite3.Error as exc:
+            logger.warning("Кэш цитат: обновление не удалось: %s", exc)
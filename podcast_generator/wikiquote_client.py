@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import asyncio
 import random
 import re
+import time
+from collections import defaultdict
 from dataclasses import dataclass
 from difflib import SequenceMatcher
-from html import unescape
+from functools import lru_cache
 from urllib.parse import urlencode
 
 import aiohttp
 
+from podcast_generator.author_index import AuthorEntry, AuthorIndex
 from podcast_generator.person_eligibility import region_verdict_from_categories
 from podcast_generator.foreign_agents_registry import person_is_foreign_agent
 from podcast_generator.quote_content_guard import quote_contains_forbidden_content
+from podcast_generator.quote_html import HtmlBlock, HtmlSection, scan_quote_html
 from podcast_generator.quote_selection import WikiquoteQuoteCandidate
+from podcast_generator.wiki_http_cache import (
+    CachedQuotes,
+    ParsedQuoteCache,
+    WikiHttpCache,
+    cache_policy,
+    wiki_cache_key,
+)
 from core.config import Config
 from core.logger import logger
+from core.metrics import metrics
 
 
 @dataclass(frozen=True)
@@ -41,14 +54,10 @@ class ExtractedQuote:
 class WikiquoteClient:
     """Случайная цитата известного человека с ru.wikiquote.org."""
 
-    _REFERENCE_BLOCK_RE = re.compile(
-        r"<ol[^>]*\breferences\b[^>]*>.*?</ol>",
-        re.IGNORECASE | re.DOTALL,
-    )
-    _REFERENCE_WRAP_RE = re.compile(
-        r'<div[^>]*\bmw-references-wrap\b[^>]*>.*?</div>',
-        re.IGNORECASE | re.DOTALL,
-    )
+    # Меняется вместе с правилами _extract_quotes: старые записи кэша цитат
+    # с другой версией не используются.
+    EXTRACTOR_VERSION = 2
+
     _FOOTNOTE_MARKER_RE = re.compile(r"\[\s*[^\]]+\s*\]")
     _BIO_DATE_RE = re.compile(
         r"\(\s*(?:\d{1,2}\s+[\w\.]+\s+)?\d{4}\s*[,—\-]"
@@ -61,13 +70,16 @@ class WikiquoteClient:
         r"^[^«»!?]{3,80} — (?:старая|старый|город|фильм|книга|страна|река|поселение)",
         re.IGNORECASE,
     )
+    # Словарные шаблоны ниже (библиография, подписи, даты, заглушки, био)
+    # заданы без IGNORECASE и ищутся по тексту в нижнем регистре: для
+    # кириллицы re с IGNORECASE не использует литеральные префиксы
+    # альтернатив и на длинных цитатах медленнее в 3–8 раз.
     _BIBLIOGRAPHY_RE = re.compile(
         r"(?:"
         r"isbn|изд-во|издательство|собрание сочинений|библиотека поэта|"
         r"под ред\.|—\s*м\.:|—\s*л\.:|—\s*спб\.:|"
         r"том\s+\d+|стр\.\s*\d+|\d{4}\s*г\."
-        r")",
-        re.IGNORECASE,
+        r")"
     )
     _SOURCE_LABEL_RE = re.compile(
         r"(?:"
@@ -88,16 +100,14 @@ class WikiquoteClient:
         r"^отрывок\s+(?:из|романа|повести|книги)|"
         r"^цитата\s+из|"
         r"^из\s+(?:книги|романа|повести|статьи|письма|речи|доклада)"
-        r")",
-        re.IGNORECASE,
+        r")"
     )
     _DATE_IN_TEXT_RE = re.compile(
         r"(?:"
         r"\d{1,2}\s+(?:января|февраля|марта|апреля|мая|июня|июля|августа|"
         r"сентября|октября|ноября|декабря)\s+\d{4}|"
         r"\d{4}\s*г\.?"
-        r")",
-        re.IGNORECASE,
+        r")"
     )
     _DATE_PHRASE_RE = re.compile(
         r"^(?:—\s*)?(?:"
@@ -123,16 +133,7 @@ class WikiquoteClient:
         r"к\s+«|"
         r"по\s+(?:поводу|случаю)|"
         r"на\s+(?:съезде|конференции|собрании|заседании)"
-        r")",
-        re.IGNORECASE,
-    )
-    _QUOTES_SECTION_HEADER_RE = re.compile(
-        r"<h2[^>]*>(.*?)</h2>",
-        re.IGNORECASE | re.DOTALL,
-    )
-    _NESTED_SECTION_HEADER_RE = re.compile(
-        r"<h[34][^>]*>(.*?)</h[34]>",
-        re.IGNORECASE | re.DOTALL,
+        r")"
     )
     _YEAR_SUBSECTION_RE = re.compile(r"^\d{4}\s+год", re.IGNORECASE)
     _ABOUT_PERSON_SECTION_RE = re.compile(
@@ -171,8 +172,7 @@ class WikiquoteClient:
         r"предуведомлен|предисловие|посвящени|"
         r"кратк(?:ое|ая)|введение\s+к\s+|"
         r"список\s+цитат|заготовка"
-        r")",
-        re.IGNORECASE,
+        r")"
     )
     _CHAPTER_TAIL_RE = re.compile(
         r"^(?:"
@@ -192,8 +192,7 @@ class WikiquoteClient:
         r"в\s+(?:православн|литературн|русск|советск)\w*\s+традици|"
         r"молитва\s+о\s+|"
         r"одна\s+из\s+(?:самых|наиболее)"
-        r")",
-        re.IGNORECASE,
+        r")"
     )
     _PRAYER_QUOTE_RE = re.compile(
         r"^(?:владыко|господи|отче|боже|господь|тебе|твоему)",
@@ -225,8 +224,7 @@ class WikiquoteClient:
         r"британск(?:ий|ая)|английск(?:ий|ая)) "
         r"(?:писател|поэт|философ|режиссёр|режиссер|композитор|учёный|ученый|"
         r"деятел|актёр|актер|художник|музыкант)"
-        r")",
-        re.IGNORECASE,
+        r")"
     )
     _WIKI_STUB_RE = re.compile(
         r"(?:"
@@ -243,19 +241,43 @@ class WikiquoteClient:
         r"в настоящее время страница|"
         r"страница удалена|"
         r"создать страницу"
-        r")",
-        re.IGNORECASE,
+        r")"
     )
-    _MAINTENANCE_BLOCK_RES = (
-        re.compile(
-            r"<table[^>]*\bambox\b[^>]*>.*?</table>",
-            re.IGNORECASE | re.DOTALL,
-        ),
-        re.compile(
-            r"<div[^>]*\b(?:hatnote|noprint|mbox)\b[^>]*>.*?</div>",
-            re.IGNORECASE | re.DOTALL,
-        ),
+    # Нормализация и фильтры кандидатов: всё, что раньше собиралось в
+    # re.sub/re.search строкой на каждом вызове.
+    _NON_LETTER_RE = re.compile(r"[^a-zA-Zа-яёА-ЯЁ]")
+    _IBID_RE = re.compile(r"\(там же\)", re.IGNORECASE)
+    _ZERO_WIDTH_RE = re.compile(r"[\u200b-\u200d\ufeff]")
+    _SENTENCE_END_RE = re.compile(r"[.!?…]$")
+    _TRAILING_NUMBER_RE = re.compile(r"\b\d{1,4}$")
+    # Предлог или месяц перед обрывом — по тексту в нижнем регистре.
+    _DANGLING_WORD_RE = re.compile(
+        r"\b(?:в|на|по|при|до|после|телефону|"
+        r"январ[ея]|феврал[ея]|март[ае]?|апрел[ея]|ма[йя]|"
+        r"июн[ея]|июл[ея]|август[ае]?|сентябр[ея]|"
+        r"октябр[ея]|ноябр[ея]|декабр[ея])\s+\w*$"
     )
+    _LAST_WORD_RE = re.compile(r"\s+\S+$")
+    _TRAILING_DASH_RE = re.compile(r"\s*—+\s*$")
+    _TRAILING_GUILLEMETS_RE = re.compile(r"[»«]+\s*$")
+    _LEADING_GUILLEMETS_RE = re.compile(r"^[«»]+\s*")
+    _LEADING_ELLIPSIS_RE = re.compile(r"^…\s+")
+    _INNER_ELLIPSIS_RE = re.compile(r"\s+…\s+")
+    _LEADING_DASH_RE = re.compile(r"^—\s*")
+    _GUILLEMETS_RE = re.compile(r"«([^»]+)»")
+    _QUOTED_TITLE_RE = re.compile(r"«[^»]{1,80}»(?:\s*,\s*\d{4})?")
+    _SENTENCE_MARK_RE = re.compile(r"[.!?…]")
+    _TRADITION_RE = re.compile(r"традици|молитва|известн|употребл|литературн|православн")
+    _SAID_BY_RE = re.compile(r"\bговорил[а]?\s+\w+")
+    _TOLD_BY_RE = re.compile(r"\bсказал[а]?\s+\w+")
+    _PRESS_ROLE_RE = re.compile(r"корреспондент|журналист|редактор|обозреватель|публицист")
+    _YEAR_RE = re.compile(r"\d{4}")
+    _NAME_PUNCT_RE = re.compile(r"[«»\"!?.;:()]")
+    _YEARISH_RE = re.compile(r"\d{3,4}")
+    _EXCLAMATION_RE = re.compile(r"[!?…]")
+    _EMPHATIC_RE = re.compile(r"[!?]")
+    _DECORATION_RE = re.compile(r"[«»\"'….\s\-—]+")
+    _LEAD_NOUN_RE = re.compile(r"^[\w«»\s\-]+ — (?:старая|старый|город|фильм|книга)\b")
 
     _SKIP_MARKERS = (
         "категория:",
@@ -278,6 +300,12 @@ class WikiquoteClient:
         "исправив и дополнив",
     )
 
+    # Обход категории для индекса авторов: страниц на запрос и пауза между
+    # запросами; после неудачного обновления — следующая попытка не раньше.
+    _AUTHOR_INDEX_BATCH = 50
+    _AUTHOR_INDEX_PAUSE_SECONDS = 0.5
+    _AUTHOR_INDEX_RETRY_SECONDS = 600.0
+
     _FALLBACK_PEOPLE = (
         "Оскар Уайльд",
         "Сенека",
@@ -377,6 +405,33 @@ class WikiquoteClient:
             "User-Agent": ua,
             "Accept": "application/json",
         }
+        self._cache: WikiHttpCache | None = None
+        self._quote_cache: ParsedQuoteCache | None = None
+        if Config.WIKIQUOTE_HTTP_CACHE_PATH:
+            try:
+                self._cache = WikiHttpCache(
+                    Config.WIKIQUOTE_HTTP_CACHE_PATH,
+                    Config.WIKIQUOTE_HTTP_CACHE_MAX_MB * 1024 * 1024,
+                )
+                self._quote_cache = ParsedQuoteCache(
+                    Config.WIKIQUOTE_HTTP_CACHE_PATH, self.EXTRACTOR_VERSION
+                )
+            except Exception as exc:
+                logger.warning("Кэш Wiki API недоступен: %s", exc)
+        self._author_index: AuthorIndex | None = None
+        if Config.WIKIQUOTE_AUTHOR_INDEX_PATH:
+            try:
+                self._author_index = AuthorIndex(
+                    Config.WIKIQUOTE_AUTHOR_INDEX_PATH,
+                    Config.WIKIQUOTE_PERSON_CATEGORY,
+                    refresh_after=Config.WIKIQUOTE_AUTHOR_INDEX_REFRESH_HOURS * 3600,
+                    rebuild_after=Config.WIKIQUOTE_AUTHOR_INDEX_REBUILD_DAYS * 86400,
+                )
+            except Exception as exc:
+                logger.warning("Индекс авторов недоступен: %s", exc)
+        self._author_index_task: asyncio.Task | None = None
+        self._author_index_retry_at = 0.0
+        self._refreshing: dict[str, asyncio.Task] = {}
 
     @staticmethod
     def quote_cache_key(person: str, quote: str) -> str:
@@ -407,7 +462,7 @@ class WikiquoteClient:
 
     @classmethod
     def _is_junk_manual_page(cls, title: str) -> bool:
-        return bool(cls._JUNK_PAGE_TITLE_RE.search(title.strip()))
+        return bool(cls._JUNK_PAGE_TITLE_RE.search(title.lower()))
 
     @classmethod
     def _query_matches_author_name(cls, query: str, name: str) -> bool:
@@ -555,15 +610,76 @@ class WikiquoteClient:
         params: dict[str, str | int],
         *,
         base: str | None = None,
+        refresh: bool = False,
     ) -> dict | None:
+        """
+        Ответ Wiki API через постоянный кэш: свежий — без сети; устаревший
+        (в пределах stale политики) — сразу, с обновлением в фоне; просроченный
+        или отсутствующий — из сети, а при ошибке сети — последний известный.
+        refresh=True — сначала сеть, кэш только как запасной ответ.
+        """
         api_base = (base or self._base).rstrip("/")
+        if self._cache is None:
+            return await self._fetch_json(session, params, api_base)
+
+        policy = cache_policy(params)
+        key = wiki_cache_key(api_base, params)
+        cached = await self._cache.lookup(key)
+        if cached is not None and not refresh:
+            data, age = cached
+            if age < policy.ttl:
+                metrics.wikiquote_cache_total.inc(policy.name, "hit")
+                return data
+            if age < policy.ttl + policy.stale:
+                metrics.wikiquote_cache_total.inc(policy.name, "stale")
+                self._schedule_refresh(key, params, api_base)
+                return data
+
+        metrics.wikiquote_cache_total.inc(policy.name, "miss")
+        data = await self._fetch_json(session, params, api_base)
+        if data is None:
+            if cached is not None:
+                metrics.wikiquote_cache_total.inc(policy.name, "stale_error")
+                return cached[0]
+            return None
+        if "error" not in data:
+            await self._cache.store(key, policy, data)
+        return data
+
+    def _schedule_refresh(
+        self, key: str, params: dict[str, str | int], api_base: str
+    ) -> None:
+        if key in self._refreshing:
+            return
+
+        async def refresh() -> None:
+            try:
+                # Своя сессия: сессия вызывающего может закрыться раньше.
+                async with aiohttp.ClientSession() as session:
+                    data = await self._fetch_json(session, params, api_base)
+                if data is not None and "error" not in data:
+                    await self._cache.store(key, cache_policy(params), data)
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+    async def _fetch_json(
+        self,
+        session: aiohttp.ClientSession,
+        params: dict[str, str | int],
+        api_base: str,
+    ) -> dict | None:
         url = f"{api_base}?{urlencode(params)}"
+        started = time.perf_counter()
+        status = "error"
         try:
             async with session.get(
                 url,
                 headers=self._headers,
                 timeout=Config.WIKIQUOTE_REQUEST_TIMEOUT_SECONDS,
             ) as resp:
+                status = str(resp.status)
                 if resp.status != 200:
                     body = await resp.text()
                     hint = ""
@@ -577,10 +693,17 @@ class WikiquoteClient:
                         hint,
                     )
                     return None
-                return await resp.json(content_type=None)
+                data = await resp.json(content_type=None)
+                status = "ok"
+                return data
         except (aiohttp.ClientError, TimeoutError) as exc:
+            status = "timeout" if isinstance(exc, TimeoutError) else "error"
             logger.warning("Wikiquote API ошибка (%s): %s", params.get("action"), exc)
             return None
+        finally:
+            metrics.wikiquote_request_seconds.observe(
+                time.perf_counter() - started, params.get("action", ""), status
+            )
 
     async def _fetch_category_page(
         self,
@@ -643,6 +766,176 @@ class WikiquoteClient:
         random.shuffle(titles)
         return titles
 
+    async def _fetch_categories_step(
+        self,
+        session: aiohttp.ClientSession,
+        params: dict[str, str | int],
+    ) -> tuple[dict[str, list[str]], dict | None] | None:
+        """
+        Один шаг запроса с prop=categories: категории каждой страницы пачки,
+        дочитанные по clcontinue, и continue следующей пачки генератора
+        (None — пачка последняя). None целиком — ошибка запроса.
+        """
+        found: dict[str, list[str]] = {}
+        extra: dict = {}
+        while True:
+            data = await self._fetch_json(session, {**params, **extra}, self._base)
+            if not data or "error" in data:
+                return None
+            pages = data.get("query", {}).get("pages") or {}
+            for page in pages.values():
+                if not isinstance(page, dict) or "missing" in page:
+                    continue
+                title = (page.get("title") or "").strip()
+                if not title:
+                    continue
+                found.setdefault(title, []).extend(
+                    (item.get("title") or "").strip()
+                    for item in page.get("categories") or []
+                    if isinstance(item, dict) and (item.get("title") or "").strip()
+                )
+            extra = data.get("continue") or {}
+            if "clcontinue" not in extra:
+                return found, extra or None
+
+    @classmethod
+    def _author_entry(cls, title: str, categories: list[str]) -> AuthorEntry:
+        return AuthorEntry(
+            title=title,
+            archetype=cls._is_archetype_title(title),
+            foreign_agent=person_is_foreign_agent(title),
+            region=region_verdict_from_categories(categories),
+            concrete=cls._is_concrete_person_by_categories(categories, title=title),
+            categories=tuple(categories),
+        )
+
+    async def _build_author_index(self, session: aiohttp.ClientSession) -> bool:
+        """
+        Полный обход категории персоналий: generator=categorymembers сразу с
+        категориями страниц. Позиция сохраняется после каждой пачки — при
+        ошибке или рестарте обход продолжится с неё.
+        """
+        index = self._author_index
+        params: dict[str, str | int] = {
+            "action": "query",
+            "generator": "categorymembers",
+            "gcmtitle": Config.WIKIQUOTE_PERSON_CATEGORY,
+            "gcmnamespace": 0,
+            "gcmtype": "page",
+            "gcmlimit": self._AUTHOR_INDEX_BATCH,
+            "prop": "categories",
+            "cllimit": "max",
+            "format": "json",
+        }
+        position = index.build_position
+        started_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        logger.info(
+            "Индекс авторов: %s обход «%s»",
+            "продолжаем" if position else "начинаем",
+            Config.WIKIQUOTE_PERSON_CATEGORY,
+        )
+        while True:
+            step = await self._fetch_categories_step(session, {**params, **(position or {})})
+            if step is None:
+                logger.warning("Индекс авторов: обход прерван, продолжим позже")
+                return False
+            pages, position = step
+            entries = [self._author_entry(title, cats) for title, cats in pages.items()]
+            await index.store_batch(entries, position, started_at=started_at)
+            if position is None:
+                return True
+            await asyncio.sleep(self._AUTHOR_INDEX_PAUSE_SECONDS)
+
+    async def _refresh_author_index(self, session: aiohttp.ClientSession) -> bool:
+        """
+        Новые страницы из recentchanges с прошлой проверки; в индекс идут
+        только попавшие в категорию персоналий. Удаления и смена категорий
+        подхватываются следующим полным обходом.
+        """
+        index = self._author_index
+        checked_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        params: dict[str, str | int] = {
+            "action": "query",
+            "list": "recentchanges",
+            "rctype": "new",
+            "rcnamespace": 0,
+            "rcprop": "title",
+            "rcdir": "newer",
+            "rclimit": "max",
+            "format": "json",
+        }
+        if index.recent_changes_since:
+            params["rcstart"] = index.recent_changes_since
+        titles: list[str] = []
+        extra: dict = {}
+        while True:
+            data = await self._fetch_json(session, {**params, **extra}, self._base)
+            if not data or "error" in data:
+                return False
+            titles.extend(
+                (item.get("title") or "").strip()
+                for item in data.get("query", {}).get("recentchanges") or []
+                if isinstance(item, dict)
+            )
+            extra = data.get("continue") or {}
+            if not extra:
+                break
+
+        titles = list(dict.fromkeys(title for title in titles if title))
+        entries: list[AuthorEntry] = []
+        for start in range(0, len(titles), self._AUTHOR_INDEX_BATCH):
+            step = await self._fetch_categories_step(
+                session,
+                {
+                    "action": "query",
+                    "titles": "|".join(titles[start : start + self._AUTHOR_INDEX_BATCH]),
+                    "prop": "categories",
+                    "cllimit": "max",
+                    "format": "json",
+                },
+            )
+            if step is None:
+                return False
+            entries.extend(
+                self._author_entry(title, cats)
+                for title, cats in step[0].items()
+                if Config.WIKIQUOTE_PERSON_CATEGORY in cats
+            )
+        await index.store_recent(entries, checked_at)
+        if entries:
+            logger.info("Индекс авторов: новых страниц в категории — %s", len(entries))
+        return True
+
+    def _schedule_author_index_update(self) -> None:
+        index = self._author_index
+        if index is None or self._author_index_task is not None:
+            return
+        if time.monotonic() < self._author_index_retry_at:
+            return
+        if index.needs_rebuild():
+            job = self._build_author_index
+        elif index.needs_recent_changes():
+            job = self._refresh_author_index
+        else:
+            return
+
+        async def update() -> None:
+            done = False
+            try:
+                # Своя сессия: обход дольше любого запроса вызывающего.
+                async with aiohttp.ClientSession() as session:
+                    done = await job(session)
+            except Exception as exc:
+                logger.warning("Индекс авторов: обновление не удалось: %s", exc)
+            finally:
+                if not done:
+                    self._author_index_retry_at = (
+                        time.monotonic() + self._AUTHOR_INDEX_RETRY_SECONDS
+                    )
+                self._author_index_task = None
+
+        self._author_index_task = asyncio.create_task(update())
+
     async def _resolve_exact_title(
         self,
         session: aiohttp.ClientSession,
@@ -1136,6 +1429,15 @@ class WikiquoteClient:
         session: aiohttp.ClientSession,
         exclude_people: set[str],
     ) -> str | None:
+        index = self._author_index
+        if index is not None:
+            self._schedule_author_index_update()
+            if index.ready:
+                person = index.sample(exclude_people)
+                if person:
+                    metrics.wikiquote_author_pick_total.inc("index")
+                    return person
+
         people = await self.fetch_category_people(session)
         pool = [
             person
@@ -1144,6 +1446,7 @@ class WikiquoteClient:
             and not self._is_archetype_title(person)
         ]
         if pool:
+            metrics.wikiquote_author_pick_total.inc("category")
             return random.choice(pool)
 
         fallback = [
@@ -1153,9 +1456,69 @@ class WikiquoteClient:
         ]
         if fallback:
             logger.info("Wikiquote: используем резервный список авторов")
+            metrics.wikiquote_author_pick_total.inc("fallback")
             return random.choice(fallback)
         return None
 
+    async def _reject_author(self, page_title: str) -> None:
+        if self._author_index is not None:
+            await self._author_index.reject(page_title)
+
+    async def _current_revid(
+        self,
+        session: aiohttp.ClientSession,
+        title: str,
+    ) -> int | None:
+        data = await self._get_json(
+            session,
+            {
+                "action": "query",
+                "prop": "revisions",
+                "rvprop": "ids",
+                "titles": title,
+                "redirects": 1,
+                "format": "json",
+            },
+        )
+        if not data:
+            return None
+        pages = data.get("query", {}).get("pages") or {}
+        for page in pages.values():
+            if not isinstance(page, dict):
+                continue
+            revisions = page.get("revisions") or []
+            if revisions and isinstance(revisions[0], dict):
+                return int(revisions[0].get("revid") or 0)
+        return None
+
+    async def _cached_page_quotes(
+        self,
+        session: aiohttp.ClientSession,
+        title: str,
+    ) -> tuple[CachedQuotes | None, bool]:
+        """
+        Цитаты из кэша: в пределах TTL — без запросов, дальше — если ревизия
+        страницы не сменилась (один лёгкий запрос вместо parse и разбора HTML).
+        Второе значение — страница изменилась и parse нужен мимо кэша ответов.
+        """
+        cached = await self._quote_cache.lookup(title)
+        if cached is None:
+            metrics.wikiquote_cache_total.inc("quotes", "miss")
+            return None, False
+        if cached.age < Config.WIKIQUOTE_QUOTE_CACHE_TTL_HOURS * 3600:
+            metrics.wikiquote_cache_total.inc("quotes", "hit")
+            return cached, False
+        revid = await self._current_revid(session, title)
+        if revid is None:
+            metrics.wikiquote_cache_total.inc("quotes", "stale_error")
+            return cached, False
+        if revid == cached.revid:
+            metrics.wikiquote_cache_total.inc("quotes", "revalidated")
+            await self._quote_cache.touch(title)
+            return cached, False
+        metrics.wikiquote_cache_total.inc("quotes", "changed")
+        return None, True
+
     async def _fetch_page_quotes(
         self,
         session: aiohttp.ClientSession,
@@ -1167,14 +1530,26 @@ class WikiquoteClient:
         if not title or _depth > 2:
             return None
 
+        changed = False
+        if self._quote_cache is not None:
+            cached, changed = await self._cached_page_quotes(session, title)
+            if cached is not None:
+                if not cached.quotes:
+                    return None
+                return cached.page_title, [
+                    ExtractedQuote(text=text, work_title=work_title)
+                    for text, work_title in cached.quotes
+                ]
+
         data = await self._get_json(
             session,
             {
                 "action": "parse",
                 "page": title,
                 "format": "json",
-                "prop": "text|links",
+                "prop": "text|links|revid",
             },
+            refresh=changed,
         )
         if not data or "parse" not in data:
             return None
@@ -1192,6 +1567,14 @@ class WikiquoteClient:
                 )
 
         quotes = self._extract_quotes(html, page_title=page_title)
+        revid = int(parse.get("revid") or 0)
+        if self._quote_cache is not None and revid:
+            await self._quote_cache.store(
+                title,
+                page_title,
+                revid,
+                [(quote.text, quote.work_title) for quote in quotes],
+            )
         if not quotes:
             logger.info("Wikiquote: у «%s» нет подходящих цитат", page_title)
             return None
@@ -1215,6 +1598,7 @@ class WikiquoteClient:
             return None
         if person_is_foreign_agent(person) or person_is_foreign_agent(page_title):
             logger.info("Wikiquote: «%s» — иноагент", person or page_title)
+            await self._reject_author(page_title)
             return None
 
         parsed = await self._fetch_page_quotes(session, page_title)
@@ -1228,6 +1612,7 @@ class WikiquoteClient:
             skip_region=for_manual_request,
         ):
             logger.info("Wikiquote: «%s» — не конкретная личность, пропуск", page_title)
+            await self._reject_author(page_title)
             return None
 
         exclude = exclude_quote_keys or set()
@@ -1358,31 +1743,17 @@ class WikiquoteClient:
                 return target
         return None
 
-    @classmethod
-    def _strip_html(cls, fragment: str) -> str:
-        text = re.sub(r"<br\s*/?>", " ", fragment, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", " ", text)
-        text = unescape(text)
-        return re.sub(r"\s+", " ", text).strip()
-
-    @classmethod
-    def _strip_reference_sections(cls, html: str) -> str:
-        html = cls._REFERENCE_WRAP_RE.sub("", html)
-        html = cls._REFERENCE_BLOCK_RE.sub("", html)
-        return html
-
     @classmethod
     def _letter_count(cls, text: str) -> int:
-        return len(re.sub(r"[^a-zA-Zа-яёА-ЯЁ]", "", text))
+        return len(cls._NON_LETTER_RE.sub("", text))
 
     @classmethod
     def _clean_quote_text(cls, text: str) -> str:
         text = cls._FOOTNOTE_MARKER_RE.sub("", text)
         text = cls._WIKI_OMISSION_RE.sub(" ", text)
-        text = re.sub(r"\(там же\)", "", text, flags=re.IGNORECASE)
-        text = re.sub(r"[\u200b-\u200d\ufeff]", "", text)
-        text = re.sub(r"\s+", " ", text).strip(" .—-")
-        return text.strip()
+        text = cls._IBID_RE.sub("", text)
+        text = cls._ZERO_WIDTH_RE.sub("", text)
+        return " ".join(text.split()).strip(" .—-").strip()
 
     @classmethod
     def _trim_quote_length(cls, text: str, max_chars: int) -> str:
@@ -1395,21 +1766,16 @@ class WikiquoteClient:
                 return cut[: idx + 1].strip()
         cut = cut.strip()
         while len(cut) > 40:
-            if re.search(r"[.!?…]$", cut):
+            if cls._SENTENCE_END_RE.search(cut):
                 break
-            if re.search(r"\b\d{1,4}$", cut) or re.search(
-                r"\b(?:в|на|по|при|до|после|телефону|"
-                r"январ[ея]|феврал[ея]|март[ае]?|апрел[ея]|ма[йя]|"
-                r"июн[ея]|июл[ея]|август[ае]?|сентябр[ея]|"
-                r"октябр[ея]|ноябр[ея]|декабр[ея])\s+\w*$",
-                cut,
-                re.I,
+            if cls._TRAILING_NUMBER_RE.search(cut) or cls._DANGLING_WORD_RE.search(
+                cut.lower()
             ):
-                cut = re.sub(r"\s+\S+$", "", cut).strip()
+                cut = cls._LAST_WORD_RE.sub("", cut).strip()
                 continue
             break
         idx = cut.rfind(", ")
-        if idx >= int(max_chars * 0.5) and not re.search(r"[.!?…]$", cut):
+        if idx >= int(max_chars * 0.5) and not cls._SENTENCE_END_RE.search(cut):
             cut = cut[:idx].strip()
         if len(cut) < 40:
             return ""
@@ -1419,16 +1785,18 @@ class WikiquoteClient:
     def _strip_quote_for_speech(cls, text: str) -> str:
         text = cls._strip_trailing_source_marks(text)
         text = text.replace("«", "").replace("»", "").strip()
-        text = re.sub(r"\s*—+\s*$", "", text).strip()
+        if text.endswith("—"):
+            text = cls._TRAILING_DASH_RE.sub("", text).strip()
         return text
 
     @classmethod
     def _strip_trailing_source_marks(cls, text: str) -> str:
         text = cls._clean_quote_text(text)
-        text = re.sub(r"[»«]+\s*$", "", text).strip()
-        text = re.sub(r"^[«»]+\s*", "", text).strip()
+        text = cls._TRAILING_GUILLEMETS_RE.sub("", text).strip()
+        text = cls._LEADING_GUILLEMETS_RE.sub("", text).strip()
         while True:
-            text = re.sub(r"\s*—+\s*$", "", text).strip()
+            if text.endswith("—"):
+                text = cls._TRAILING_DASH_RE.sub("", text).strip()
             if " — " not in text:
                 break
             body, tail = text.rsplit(" — ", 1)
@@ -1449,10 +1817,11 @@ class WikiquoteClient:
         text = cls._clean_quote_text(text)
         if not text:
             return ""
-        text = re.sub(r"^…\s+", "", text)
-        text = re.sub(r"\s+…\s+", " ", text)
+        text = cls._LEADING_ELLIPSIS_RE.sub("", text)
+        text = cls._INNER_ELLIPSIS_RE.sub(" ", text)
         text = cls._strip_trailing_source_marks(text)
-        while cls._PAGE_REF_TAIL_RE.search(text):
+        # Ссылка на страницу всегда кончается цифрой — без неё не искать.
+        while text[-1:].isdigit() and cls._PAGE_REF_TAIL_RE.search(text):
             text = cls._PAGE_REF_TAIL_RE.sub("", text).strip()
         text = text.replace("«", "").replace("»", "").strip()
         if cls._DATE_PHRASE_RE.match(text.strip()):
@@ -1493,13 +1862,13 @@ class WikiquoteClient:
             return True
         if cls._ATTRIBUTION_CONTEXT_RE.match(lowered):
             return True
-        if cls._BIBLIOGRAPHY_RE.search(text):
+        if cls._BIBLIOGRAPHY_RE.search(lowered):
             return True
-        if cls._DATE_IN_TEXT_RE.search(text) and len(text) < 80:
+        if cls._DATE_IN_TEXT_RE.search(lowered) and len(text) < 80:
             return True
         if len(text) < 60 and lowered.startswith(("из ", "в ", "к ", "при ")):
             return True
-        if re.fullmatch(r"«[^»]{1,80}»(?:\s*,\s*\d{4})?", text):
+        if cls._QUOTED_TITLE_RE.fullmatch(text):
             return True
         if cls._looks_like_byline_attribution(text):
             return True
@@ -1507,13 +1876,10 @@ class WikiquoteClient:
             return True
         if cls._ENCYCLOPEDIA_TAIL_RE.search(lowered):
             return True
-        if re.search(r"^(?:заявлени|комментари|реплик)", lowered):
+        if lowered.startswith(("заявлени", "комментари", "реплик")):
             return True
-        if len(text) > 50 and not re.search(r"[.!?…]", text):
-            if re.search(
-                r"традици|молитва|известн|употребл|литературн|православн",
-                lowered,
-            ):
+        if len(text) > 50 and not cls._SENTENCE_MARK_RE.search(text):
+            if cls._TRADITION_RE.search(lowered):
                 return True
         return False
 
@@ -1531,24 +1897,25 @@ class WikiquoteClient:
         lowered = text.lower()
         if lowered.count(" — ") >= 3:
             return True
-        if re.search(r"\bговорил[а]?\s+\w+", lowered):
+        if cls._SAID_BY_RE.search(lowered):
             return True
-        if re.search(r"\bсказал[а]?\s+\w+", lowered) and lowered.count(" — ") >= 2:
+        if cls._TOLD_BY_RE.search(lowered) and lowered.count(" — ") >= 2:
             return True
         return False
 
     @classmethod
-    def _normalize_quote_candidate(cls, raw: str) -> str:
-        text = cls._clean_quote_text(cls._strip_html(raw))
+    @lru_cache(maxsize=8192)
+    def _normalize_plain_candidate(cls, text: str) -> str:
+        text = cls._clean_quote_text(text)
         if not text:
             return ""
 
-        text = re.sub(r"^—\s*", "", text).strip()
+        text = cls._LEADING_DASH_RE.sub("", text).strip()
 
-        guillemets = re.findall(r"«([^»]+)»", text)
+        guillemets = cls._GUILLEMETS_RE.findall(text)
         if guillemets and len(guillemets) == 1:
             inner = guillemets[0].strip()
-            outer = re.sub(r"«[^»]+»", "", text).strip(" .—-")
+            outer = cls._GUILLEMETS_RE.sub("", text).strip(" .—-")
             if outer and cls._looks_like_source_tail(inner) and len(outer) >= 15:
                 text = outer
             elif not outer and not cls._looks_like_source_tail(inner):
@@ -1570,114 +1937,18 @@ class WikiquoteClient:
 
         return cls._finalize_quote_text(text)
 
-    @classmethod
-    def _section_title_plain(cls, header_inner_html: str) -> str:
-        title = cls._strip_html(header_inner_html).strip()
-        return re.sub(r"\s*\[.*$", "", title).strip()
-
     @classmethod
     def _is_about_person_section(cls, title: str) -> bool:
-        plain = re.sub(r"\s+", " ", title.strip().lower())
+        plain = " ".join(title.lower().split())
         return bool(cls._ABOUT_PERSON_SECTION_RE.search(plain))
 
     @classmethod
     def _is_own_quotes_section(cls, title: str) -> bool:
-        plain = re.sub(r"\s+", " ", title.strip().lower())
+        plain = " ".join(title.lower().split())
         if cls._is_about_person_section(plain):
             return False
         return bool(cls._OWN_QUOTES_SECTION_RE.match(plain))
 
-    @classmethod
-    def _split_wiki_sections(cls, html: str) -> list[tuple[str, str]]:
-        matches = list(cls._QUOTES_SECTION_HEADER_RE.finditer(html))
-        sections: list[tuple[str, str]] = []
-        for idx, match in enumerate(matches):
-            title = cls._section_title_plain(match.group(1))
-            start = match.end()
-            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(html)
-            sections.append((title, html[start:end]))
-        return sections
-
-    @classmethod
-    def _split_nested_sections(cls, html: str) -> list[tuple[str, str]]:
-        matches = list(cls._NESTED_SECTION_HEADER_RE.finditer(html))
-        if not matches:
-            return []
-        sections: list[tuple[str, str]] = []
-        if matches[0].start() > 0:
-            preamble = html[: matches[0].start()].strip()
-            if preamble:
-                sections.append(("", preamble))
-        for idx, match in enumerate(matches):
-            title = cls._section_title_plain(match.group(1))
-            start = match.end()
-            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(html)
-            sections.append((title, html[start:end]))
-        return sections
-
-    @classmethod
-    def _collect_from_own_quotes_body(
-        cls,
-        html: str,
-        *,
-        page_title: str,
-    ) -> list[ExtractedQuote]:
-        results: list[ExtractedQuote] = []
-        for title, body in cls._split_nested_sections(html):
-            if title and cls._SKIP_SUBSECTION_RE.match(title.strip().lower()):
-                continue
-            work_title = title.strip() if title and cls._YEAR_SUBSECTION_RE.match(title) else None
-            results.extend(
-                cls._collect_quotes_from_fragment(
-                    body,
-                    page_title=page_title,
-                    work_title=work_title,
-                )
-            )
-        if not results:
-            results.extend(
-                cls._collect_quotes_from_fragment(
-                    html,
-                    page_title=page_title,
-                    work_title=None,
-                )
-            )
-        return results
-
-    @classmethod
-    def _collect_from_book_quotes_body(
-        cls,
-        html: str,
-        *,
-        page_title: str,
-    ) -> list[ExtractedQuote]:
-        results: list[ExtractedQuote] = []
-        nested = cls._split_nested_sections(html)
-        if not nested:
-            return cls._collect_quotes_from_fragment(
-                html,
-                page_title=page_title,
-                work_title=None,
-            )
-        for title, body in nested:
-            if not title:
-                continue
-            work = cls._normalize_work_title(title)
-            if (
-                not work
-                or cls._is_about_person_section(work)
-                or cls._SKIP_SUBSECTION_RE.match(work)
-            ):
-                continue
-            results.extend(
-                cls._collect_quotes_from_fragment(
-                    body,
-                    page_title=page_title,
-                    work_title=work,
-                )
-            )
-        return results
-
     @classmethod
     def _looks_like_byline_attribution(cls, text: str) -> bool:
         text = text.strip().strip("«»\"'")
@@ -1686,36 +1957,17 @@ class WikiquoteClient:
         if cls._BYLINE_ATTRIBUTION_RE.match(text):
             return True
         lowered = text.lower()
-        if re.search(
-            r"корреспондент|журналист|редактор|обозреватель|публицист",
-            lowered,
-        ):
-            if re.search(r"\d{4}", text) and len(text) < 120:
+        if cls._PRESS_ROLE_RE.search(lowered):
+            if cls._YEAR_RE.search(text) and len(text) < 120:
                 return True
         return False
 
-    @classmethod
-    def _strip_maintenance_blocks(cls, html: str) -> str:
-        for pattern in cls._MAINTENANCE_BLOCK_RES:
-            html = pattern.sub("", html)
-        return html
-
-    @classmethod
-    def _focus_quotes_section(cls, html: str) -> str:
-        for title, body in cls._split_wiki_sections(html):
-            if cls._is_own_quotes_section(title):
-                logger.debug("Wikiquote: раздел собственных цитат «%s»", title)
-                return body
-
-        logger.debug("Wikiquote: на странице нет раздела собственных цитат")
-        return ""
-
     @classmethod
     def _looks_like_bio_about_person(cls, text: str, page_title: str = "") -> bool:
-        if cls._BIOGRAPHY_ABOUT_RE.search(text):
+        lowered = text.lower()
+        if cls._BIOGRAPHY_ABOUT_RE.search(lowered):
             return True
 
-        lowered = text.lower()
         encyclopedic = (
             "считается",
             "является",
@@ -1758,9 +2010,9 @@ class WikiquoteClient:
         text = text.strip()
         if len(text) < 12 or len(text) > 90:
             return False
-        if re.search(r"[«»\"!?.;:()]", text):
+        if cls._NAME_PUNCT_RE.search(text):
             return False
-        if re.search(r"\d{3,4}", text):
+        if cls._YEARISH_RE.search(text):
             return False
 
         words = text.split()
@@ -1820,18 +2072,19 @@ class WikiquoteClient:
             "заседание",
         )
         has_source_word = any(word in lowered for word in source_words)
-        has_date = bool(cls._DATE_IN_TEXT_RE.search(text))
+        has_date = bool(cls._DATE_IN_TEXT_RE.search(lowered))
 
         if has_source_word and has_date and len(text) < 120:
             return True
         if has_source_word and len(text) < 55:
             return True
-        if has_date and len(text) < 45 and not re.search(r"[!?…]", text):
+        if has_date and len(text) < 45 and not cls._EXCLAMATION_RE.search(text):
             return True
 
         return False
 
     @classmethod
+    @lru_cache(maxsize=4096)
     def _has_quote_substance(cls, text: str) -> bool:
         """Есть ли в тексте содержание цитаты, а не только метаданные."""
         if cls._looks_like_source_label(text):
@@ -1846,17 +2099,17 @@ class WikiquoteClient:
         if cls._letter_count(text) < 20:
             return False
 
-        stripped = re.sub(r"[«»\"'….\s\-—]+", "", text)
+        stripped = cls._DECORATION_RE.sub("", text)
         if len(stripped) < 12:
             return False
 
         lowered = text.lower().strip()
         if lowered.startswith(("о ", "об ", "при ", "из ", "в ", "к ")) and len(text) < 80:
             return False
-        if re.search(r"[!?]", text):
+        if cls._EMPHATIC_RE.search(text):
             return True
 
-        words = [word for word in re.split(r"\s+", text.strip()) if word]
+        words = text.split()
         if len(words) >= 8:
             return True
 
@@ -1874,26 +2127,34 @@ class WikiquoteClient:
         return len(text) >= 45 and len(words) >= 5
 
     @classmethod
+    @lru_cache(maxsize=8192)
     def _is_skippable(cls, text: str, *, page_title: str = "") -> bool:
-        lowered = text.lower().strip()
-        if quote_contains_forbidden_content(text):
-            return True
+        """
+        Проверки идут от дешёвых к дорогим: длина и подстроки отсекают
+        большую часть мусора до регулярных выражений. Результат зависит
+        только от аргументов — повторные кандидаты берутся из кэша.
+        """
         if len(text) < 20:
             return True
+        lowered = text.lower().strip()
         if lowered.startswith("↑") or "↑" in text[:12]:
             return True
         if lowered.startswith("см.") or lowered.startswith("см "):
             return True
-        if cls._BIBLIOGRAPHY_RE.search(text):
+        if any(marker in lowered for marker in cls._SKIP_MARKERS):
             return True
-        if cls._LEAD_DEFINITION_RE.match(text):
+        if quote_contains_forbidden_content(text):
             return True
-        if cls._looks_like_bio_about_person(text, page_title):
+        if cls._BIBLIOGRAPHY_RE.search(lowered):
+            return True
+        if cls._LEAD_DEFINITION_RE.match(text):
             return True
-        if cls._WIKI_STUB_RE.search(text):
+        if cls._WIKI_STUB_RE.search(lowered):
             return True
         if cls._BIO_DATE_RE.search(text) and len(text) > 180:
             return True
+        if cls._looks_like_bio_about_person(text, page_title):
+            return True
         if len(text) > 260 and any(
             word in lowered
             for word in (
@@ -1910,9 +2171,7 @@ class WikiquoteClient:
             )
         ):
             return True
-        if re.match(r"^[\w«»\s\-]+ — (?:старая|старый|город|фильм|книга)\b", lowered):
-            return True
-        if any(marker in lowered for marker in cls._SKIP_MARKERS):
+        if cls._LEAD_NOUN_RE.match(lowered):
             return True
         if cls._looks_like_attribution_name(text):
             return True
@@ -1928,39 +2187,22 @@ class WikiquoteClient:
             return True
         return False
 
-    @classmethod
-    def _collect_normalized_candidates(cls, html: str) -> list[str]:
-        candidates: list[str] = []
-        patterns = (
-            r"<li[^>]*>(.*?)</li>",
-            r"<dd[^>]*>(.*?)</dd>",
-            r"<p[^>]*>(.*?)</p>",
-            r"<blockquote[^>]*>(.*?)</blockquote>",
-            r"<td[^>]*>(.*?)</td>",
-        )
-        for pattern in patterns:
-            for match in re.finditer(pattern, html, flags=re.IGNORECASE | re.DOTALL):
-                text = cls._normalize_quote_candidate(match.group(1))
-                if text:
-                    candidates.append(text)
-        return candidates
-
     @classmethod
     def _is_book_quotes_section(cls, title: str) -> bool:
-        plain = re.sub(r"\s+", " ", title.strip().lower())
+        plain = " ".join(title.lower().split())
         return bool(cls._BOOK_QUOTES_SECTION_RE.match(plain))
 
     @classmethod
-    def _collect_quotes_from_fragment(
+    def _filter_candidates(
         cls,
-        html: str,
+        candidates: list[str],
         *,
         page_title: str,
         work_title: str | None,
     ) -> list[ExtractedQuote]:
         items: list[ExtractedQuote] = []
         seen: set[str] = set()
-        for text in cls._collect_normalized_candidates(html):
+        for text in candidates:
             key = text.strip().lower()[:400]
             if key in seen:
                 continue
@@ -1971,36 +2213,83 @@ class WikiquoteClient:
         return items
 
     @classmethod
-    def _extract_quotes(cls, html: str, *, page_title: str = "") -> list[ExtractedQuote]:
-        if not html.strip():
-            return []
-
-        html = cls._strip_reference_sections(html)
-        html = cls._strip_maintenance_blocks(html)
+    def _quotes_from_blocks(
+        cls,
+        blocks: list[HtmlBlock],
+        *,
+        page_title: str,
+        work_title: str | None,
+    ) -> list[ExtractedQuote]:
+        candidates = []
+        for block in sorted(blocks, key=lambda b: b.rank):
+            text = cls._normalize_plain_candidate(block.text)
+            if text:
+                candidates.append(text)
+        return cls._filter_candidates(
+            candidates, page_title=page_title, work_title=work_title
+        )
 
-        sections = cls._split_wiki_sections(html)
+    @classmethod
+    def _quotes_from_own_section(
+        cls,
+        section: HtmlSection,
+        blocks: list[HtmlBlock],
+        *,
+        page_title: str,
+    ) -> list[ExtractedQuote]:
         results: list[ExtractedQuote] = []
-
-        for title, body in sections:
-            if cls._is_about_person_section(title):
-                continue
-            if cls._is_own_quotes_section(title):
-                results.extend(
-                    cls._collect_from_own_quotes_body(body, page_title=page_title)
+        if len(section.subsections) > 1:
+            for index, title in enumerate(section.subsections):
+                if title and cls._SKIP_SUBSECTION_RE.match(title.strip().lower()):
+                    continue
+                work_title = (
+                    title.strip() if title and cls._YEAR_SUBSECTION_RE.match(title) else None
                 )
-                continue
-            if cls._is_book_quotes_section(title):
                 results.extend(
-                    cls._collect_from_book_quotes_body(body, page_title=page_title)
+                    cls._quotes_from_blocks(
+                        [b for b in blocks if b.subsection == index],
+                        page_title=page_title,
+                        work_title=work_title,
+                    )
                 )
-
         if not results:
-            focused = cls._focus_quotes_section(html)
-            if focused.strip():
-                results.extend(
-                    cls._collect_from_own_quotes_body(focused, page_title=page_title)
+            results.extend(
+                cls._quotes_from_blocks(blocks, page_title=page_title, work_title=None)
+            )
+        return results
+
+    @classmethod
+    def _quotes_from_book_section(
+        cls,
+        section: HtmlSection,
+        blocks: list[HtmlBlock],
+        *,
+        page_title: str,
+    ) -> list[ExtractedQuote]:
+        if len(section.subsections) == 1:
+            return cls._quotes_from_blocks(blocks, page_title=page_title, work_title=None)
+        results: list[ExtractedQuote] = []
+        for index, title in enumerate(section.subsections):
+            if not title:
+                continue
+            work = cls._normalize_work_title(title)
+            if (
+                not work
+                or cls._is_about_person_section(work)
+                or cls._SKIP_SUBSECTION_RE.match(work)
+            ):
+                continue
+            results.extend(
+                cls._quotes_from_blocks(
+                    [b for b in blocks if b.subsection == index],
+                    page_title=page_title,
+                    work_title=work,
                 )
+            )
+        return results
 
+    @staticmethod
+    def _dedupe_quotes(results: list[ExtractedQuote]) -> list[ExtractedQuote]:
         seen: set[str] = set()
         quotes: list[ExtractedQuote] = []
         for item in results:
@@ -2010,3 +2299,35 @@ class WikiquoteClient:
             seen.add(key)
             quotes.append(item)
         return quotes
+
+    @classmethod
+    def _extract_quotes(cls, html: str, *, page_title: str = "") -> list[ExtractedQuote]:
+        """
+        Цитаты страницы за один проход по разметке (QuoteHtmlScanner):
+        разделы собственных цитат и цитат из произведений, фильтры — прежние.
+        """
+        if not html.strip():
+            return []
+
+        scan = scan_quote_html(html)
+        by_section: dict[int, list[HtmlBlock]] = defaultdict(list)
+        for block in scan.blocks:
+            by_section[block.section].append(block)
+
+        results: list[ExtractedQuote] = []
+        for index, section in enumerate(scan.sections):
+            if cls._is_about_person_section(section.title):
+                continue
+            if cls._is_own_quotes_section(section.title):
+                results.extend(
+                    cls._quotes_from_own_section(
+                        section, by_section[index], page_title=page_title
+                    )
+                )
+            elif cls._is_book_quotes_section(section.title):
+                results.extend(
+                    cls._quotes_from_book_section(
+                        section, by_section[index], page_title=page_title
+                    )
+                )
+        return cls._dedupe_quotes(results)
@@ -0,0 +1,67 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] — список; ARGV[1] — лимит (0 — без обрезки); ARGV[2] — "head"/"tail";
+# ARGV[3..] — значения в порядке вставки. Возвращает число отброшенных элементов.
+_BOUNDED_PUSH_LUA = """
+local key = KEYS[1]
+local max_size = tonumber(ARGV[1])
+local head = ARGV[2] == "head"
+if #ARGV > 2 then
+    if head then
+        redis.call("LPUSH", key, unpack(ARGV, 3))
+    else
+        redis.call("RPUSH", key, unpack(ARGV, 3))
+    end
+end
+if max_size <= 0 then
+    return 0
+end
+local length = redis.call("LLEN", key)
+if length <= max_size then
+    return 0
+end
+local dropped = length - max_size
+if head then
+    redis.call("LTRIM", key, 0, max_size - 1)
+else
+    redis.call("LTRIM", key, dropped, -1)
+end
+return dropped
+"""
+
+
+class BoundedList:
+    """Атомарная вставка пачки в список с обрезкой за один round-trip (Lua)."""
+
+    def __init__(self, redis_client) -> None:
+        self._script = redis_client.register_script(_BOUNDED_PUSH_LUA)
+
+    async def push(
+        self,
+        key: str,
+        values: list[str],
+        max_size: int,
+        *,
+        head: bool = False,
+    ) -> int:
+        """
+        head=False — RPUSH, при переполнении отбрасываются самые старые с начала.
+        head=True — LPUSH по порядку values, отбрасывается хвост списка.
+        """
+        if not values:
+            return 0
+        dropped = int(
+            await self._script(
+                keys=[key],
+                args=[max(0, int(max_size)), "head" if head else "tail", *values],
+            )
+        )
+        if dropped:
+            logger.warning(
+                "Очередь %s переполнена — отброшено %s реплик",
+                key,
+                dropped,
+            )
+        return dropped
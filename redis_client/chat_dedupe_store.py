@@ -0,0 +1,73 @@
+import time
+
+from core.chat_dedupe import sliced_layout
+
+# KEYS — битовые карты срезов, текущий первым; ARGV[1] — TTL текущего среза (с),
+# ARGV[2..] — номера битов. 0 — уже встречалось (все биты в одном из срезов),
+# 1 — новое: биты выставлены в текущем срезе.
+_CLAIM_LUA = """
+for _, key in ipairs(KEYS) do
+    local hit = true
+    for i = 2, #ARGV do
+        if redis.call("GETBIT", key, ARGV[i]) == 0 then
+            hit = false
+            break
+        end
+    end
+    if hit then
+        return 0
+    end
+end
+for i = 2, #ARGV do
+    redis.call("SETBIT", KEYS[1], ARGV[i], 1)
+end
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class ChatDedupeStore:
+    """
+    Дедуп сообщений чата фильтром Блума по часовым срезам (битовые карты Redis).
+
+    Вместо ключа на каждое сообщение — window_hours строк фиксированного размера;
+    срезы старше окна истекают сами. Возможны ложные «повторы» с долей error_rate,
+    пропусков настоящих повторов внутри окна нет.
+    """
+
+    _KEY = "chat:dedupe:bloom"
+    _SLICE_SECONDS = 3600
+
+    def __init__(
+        self,
+        redis_client,
+        key_prefix: str,
+        *,
+        window_hours: int,
+        hourly_capacity: int,
+        error_rate: float,
+    ) -> None:
+        self._redis = redis_client
+        self._base = f"{key_prefix}{self._KEY}:"
+        self._slices = max(1, int(window_hours))
+        self._layout = sliced_layout(hourly_capacity, error_rate, self._slices)
+        self._claim = redis_client.register_script(_CLAIM_LUA)
+
+    @property
+    def bytes_per_slice(self) -> int:
+        return (self._layout.bits + 7) // 8
+
+    def _slice_keys(self) -> list[str]:
+        current = int(time.time() // self._SLICE_SECONDS)
+        return [f"{self._base}{current - i}" for i in range(self._slices)]
+
+    async def claim(self, dedupe_key: str) -> bool:
+        """True — сообщение ещё не встречалось в окне (и теперь помечено)."""
+        result = await self._claim(
+            keys=self._slice_keys(),
+            args=[
+                self._slices * self._SLICE_SECONDS,
+                *self._layout.positions(dedupe_key),
+            ],
+        )
+        return bool(int(result))
@@ -0,0 +1,228 @@
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Общие KEYS для всех скриптов:
+#   1 seq      — счётчик порядка поступления
+#   2 items    — HASH seq → payload
+#   3 owners   — HASH seq → author
+#   4 order    — ZSET seq (score = seq): общая очередь, ZCARD = длина
+#   5 ready    — ZSET author (score = seq головы): авторы без cooldown
+#   6 cooldown — ZSET author (score = конец cooldown, мс): авторы с сообщениями на паузе
+# ARGV[1] — префикс ключей авторов (…author:{name} — LIST seq, …until:{name} — метка cooldown).
+# Ключи авторов строятся в скрипте: рассчитано на один инстанс Redis, не на кластер.
+
+_PUSH_LUA = """
+local author_prefix, until_prefix = ARGV[1], ARGV[2]
+local author, payload = ARGV[3], ARGV[4]
+local max_size, now = tonumber(ARGV[5]), tonumber(ARGV[6])
+local seq = redis.call("INCR", KEYS[1])
+redis.call("HSET", KEYS[2], seq, payload)
+redis.call("HSET", KEYS[3], seq, author)
+redis.call("ZADD", KEYS[4], seq, seq)
+redis.call("RPUSH", author_prefix .. author, seq)
+local blocked_ms = redis.call("PTTL", until_prefix .. author)
+if blocked_ms > 0 then
+    redis.call("ZADD", KEYS[6], "NX", now + blocked_ms, author)
+else
+    -- Cooldown истёк, но pop ещё не перенёс автора из cooldown: переносим
+    -- здесь, иначе автор окажется в обоих ZSET. Score — голова его списка
+    -- (там могут ждать более ранние сообщения), а не seq нового.
+    redis.call("ZREM", KEYS[6], author)
+    local head = redis.call("LINDEX", author_prefix .. author, 0)
+    redis.call("ZADD", KEYS[5], "NX", head, author)
+end
+local dropped = 0
+if max_size > 0 then
+    while redis.call("ZCARD", KEYS[4]) > max_size do
+        local oldest = redis.call("ZPOPMIN", KEYS[4])[1]
+        local owner = redis.call("HGET", KEYS[3], oldest)
+        redis.call("HDEL", KEYS[2], oldest)
+        redis.call("HDEL", KEYS[3], oldest)
+        if owner then
+            local list = author_prefix .. owner
+            redis.call("LREM", list, 1, oldest)
+            local head = redis.call("LINDEX", list, 0)
+            if head then
+                redis.call("ZADD", KEYS[5], "XX", head, owner)
+            else
+                redis.call("ZREM", KEYS[5], owner)
+                redis.call("ZREM", KEYS[6], owner)
+            end
+        end
+        dropped = dropped + 1
+    end
+end
+return dropped
+"""
+
+_POP_LUA = """
+local author_prefix, now = ARGV[1], tonumber(ARGV[2])
+for _, author in ipairs(redis.call("ZRANGEBYSCORE", KEYS[6], "-inf", now)) do
+    redis.call("ZREM", KEYS[6], author)
+    local head = redis.call("LINDEX", author_prefix .. author, 0)
+    if head then
+        redis.call("ZADD", KEYS[5], "NX", head, author)
+    end
+end
+while true do
+    local author = redis.call("ZRANGE", KEYS[5], 0, 0)[1]
+    if not author then
+        return false
+    end
+    local list = author_prefix .. author
+    local seq = redis.call("LPOP", list)
+    local head = redis.call("LINDEX", list, 0)
+    if head then
+        redis.call("ZADD", KEYS[5], "XX", head, author)
+    else
+        redis.call("ZREM", KEYS[5], author)
+    end
+    if seq then
+        local payload = redis.call("HGET", KEYS[2], seq)
+        redis.call("HDEL", KEYS[2], seq)
+        redis.call("HDEL", KEYS[3], seq)
+        redis.call("ZREM", KEYS[4], seq)
+        if payload then
+            return {author, payload}
+        end
+    end
+end
+"""
+
+_MARK_LUA = """
+local author_prefix, until_prefix = ARGV[1], ARGV[2]
+local author, cooldown_ms, now = ARGV[3], tonumber(ARGV[4]), tonumber(ARGV[5])
+if cooldown_ms <= 0 then
+    return 0
+end
+redis.call("SET", until_prefix .. author, "1", "PX", cooldown_ms)
+if redis.call("LLEN", author_prefix .. author) > 0 then
+    redis.call("ZREM", KEYS[5], author)
+    redis.call("ZADD", KEYS[6], now + cooldown_ms, author)
+end
+return 1
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _text(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+
+class ChatIngestStore:
+    """
+    Входящий чат с индексом по авторам.
+
+    У каждого автора своя подочередь, авторы без cooldown лежат в ZSET по
+    номеру головного сообщения, авторы на паузе — в ZSET по концу cooldown.
+    Следующее сообщение, на которое можно ответить, — один ZRANGE 0 0 без
+    разбора JSON; лимит AI_QUEUE_MAX_SIZE держится по общему ZSET order.
+    """
+
+    _BASE = "chat:ingest:"
+
+    def __init__(self, redis_client, key_prefix: str) -> None:
+        self._redis = redis_client
+        base = f"{key_prefix}{self._BASE}"
+        self._keys = [
+            f"{base}seq",
+            f"{base}items",
+            f"{base}owners",
+            f"{base}order",
+            f"{base}ready",
+            f"{base}cooldown",
+        ]
+        self._author_prefix = f"{base}author:"
+        self._until_prefix = f"{base}until:"
+        self._push = redis_client.register_script(_PUSH_LUA)
+        self._pop = redis_client.register_script(_POP_LUA)
+        self._mark = redis_client.register_script(_MARK_LUA)
+
+    @property
+    def order_key(self) -> str:
+        return self._keys[3]
+
+    async def push(self, author: str, payload: str, max_size: int) -> int:
+        """Добавляет сообщение; возвращает число отброшенных самых старых."""
+        dropped = int(
+            await self._push(
+                keys=self._keys,
+                args=[
+                    self._author_prefix,
+                    self._until_prefix,
+                    author,
+                    payload,
+                    max(0, int(max_size)),
+                    _now_ms(),
+                ],
+            )
+        )
+        if dropped:
+            logger.warning(
+                "Очередь чата переполнена — отброшено %s сообщений",
+                dropped,
+            )
+        return dropped
+
+    async def pop_respondable(self) -> tuple[str, bytes] | None:
+        """Самое раннее сообщение автора без cooldown: (author, payload)."""
+        result = await self._pop(
+            keys=self._keys,
+            args=[self._author_prefix, _now_ms()],
+        )
+        if not result:
+            return None
+        return _text(result[0]), result[1]
+
+    async def mark_responded(self, author: str, cooldown_seconds: float) -> None:
+        """Ставит автора на cooldown: его сообщения не выдаются до истечения."""
+        await self._mark(
+            keys=self._keys,
+            args=[
+                self._author_prefix,
+                self._until_prefix,
+                author,
+                int(cooldown_seconds * 1000),
+                _now_ms(),
+            ],
+        )
+
+    def length_commands(self, pipe) -> int:
+        """Длина очереди и число авторов, готовых к ответу, — 3 команды в pipeline."""
+        pipe.zcard(self._keys[3])
+        pipe.zcard(self._keys[4])
+        pipe.zcount(self._keys[5], "-inf", _now_ms())
+        return 3
+
+    @staticmethod
+    def parse_lengths(results) -> tuple[int, int]:
+        """(длина очереди, готовых авторов) из результатов length_commands."""
+        total, ready, expired = (int(n) for n in results)
+        return total, ready + expired
+
+    async def lengths(self) -> tuple[int, int]:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            self.length_commands(pipe)
+            return self.parse_lengths(await pipe.execute())
+
+    async def length(self) -> int:
+        return int(await self._redis.zcard(self._keys[3]))
+
+    async def clear(self) -> int:
+        """Удаляет все сообщения; метки cooldown авторов сохраняются."""
+        length = await self.length()
+        owners = await self._redis.hvals(self._keys[2])
+        authors = {_text(owner) for owner in owners}
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*self._keys[1:])
+            for author in authors:
+                pipe.delete(f"{self._author_prefix}{author}")
+            await pipe.execute()
+        return length
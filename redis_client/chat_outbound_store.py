@@ -1,4 +1,5 @@
 from core.config import Config
+from redis_client.bounded_list import BoundedList
 
 _PERSON_HINT = "Автор: !set_topic ИМЯ | сброс: !set_topic сброс"
 _QUOTE_PREFIX = "Следующая цитата: "
@@ -8,19 +9,24 @@ class ChatOutboundStore:
     """Очередь исходящих сообщений в Twitch-чат."""
 
     _OUTBOUND = "control:chat_outbound"
+    _MAX_SIZE = 50
 
     def __init__(self, redis_client) -> None:
         self._redis = redis_client
+        self._bounded = BoundedList(redis_client)
 
     def _key(self) -> str:
         return f"{Config.REDIS_KEY_PREFIX}{self._OUTBOUND}"
 
     async def enqueue(self, text: str) -> None:
-        text = text.strip()
-        if not text:
+        await self.enqueue_many([text])
+
+    async def enqueue_many(self, texts: list[str]) -> None:
+        """Кладёт несколько сообщений за один round-trip; уходят в чат по порядку."""
+        lines = [text.strip()[:500] for text in texts if text.strip()]
+        if not lines:
             return
-        await self._redis.lpush(self._key(), text[:500])
-        await self._redis.ltrim(self._key(), 0, 49)
+        await self._bounded.push(self._key(), lines, self._MAX_SIZE, head=True)
 
     async def enqueue_quote_announcement(self, person: str, quote: str) -> None:
         person = person.strip()
@@ -29,15 +35,15 @@ class ChatOutboundStore:
             return
         short_quote = quote if len(quote) <= 180 else f"{quote[:177]}…"
         line = f"{_QUOTE_PREFIX}{person}: «{short_quote}»"
-        await self.enqueue(line[:500])
-        await self.enqueue(_PERSON_HINT)
+        await self.enqueue_many([line[:500], _PERSON_HINT])
 
     async def enqueue_page_announcement(self, page_title: str) -> None:
         await self.enqueue_quote_announcement(page_title, "…")
 
     async def enqueue_topic_announcement(self, topic: str) -> None:
-        await self.enqueue(f"Следующая случайная цитата: {topic.strip()[:400]}")
-        await self.enqueue(_PERSON_HINT)
+        await self.enqueue_many(
+            [f"Следующая случайная цитата: {topic.strip()[:400]}", _PERSON_HINT]
+        )
 
     async def clear(self) -> None:
         await self._redis.delete(self._key())
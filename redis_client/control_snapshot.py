@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from redis_client.prepared_monologue_store import PreparedMonologueStore
+from redis_client.redis_manager import RedisManager
+from redis_client.topic_control_store import TopicControlStore
+
+
+def _decode(value) -> str | None:
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+
+def _parse_int(value) -> int | None:
+    text = _decode(value)
+    if text is None:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return None
+
+
+def _strip_or_empty(value) -> str:
+    text = _decode(value)
+    return text.strip() if text and text.strip() else ""
+
+
+@dataclass(frozen=True)
+class ControlSnapshot:
+    """Состояние управляющих ключей Redis, прочитанное за один round-trip."""
+
+    taken_at: float
+    topic_revision: int
+    manual_topic_revision: int | None
+    manual_person: str
+    current_topic: str
+    pending_topic: str | None
+    chat_processing: bool
+    tts_busy: bool
+    stream_epoch: str | None
+    podcast_queue_length: int
+    reacted_queue_length: int
+    chat_queue_length: int
+    chat_ready_authors: int
+    prepared_monologue: dict | None
+
+    @property
+    def manual_topic_active(self) -> bool:
+        return (
+            self.manual_topic_revision is not None
+            and self.manual_topic_revision == self.topic_revision
+        )
+
+    def prepared_for(self, gen_rev: int) -> dict | None:
+        prepared = self.prepared_monologue
+        if prepared is None or prepared["gen_rev"] != gen_rev:
+            return None
+        return prepared
+
+
+class ControlSnapshotReader:
+    """MGET управляющих ключей + длины очередей одним pipeline."""
+
+    def __init__(self, redis_manager: RedisManager) -> None:
+        self._redis_manager = redis_manager
+        self._keys = [
+            redis_manager._key(name)
+            for name in (
+                TopicControlStore._REVISION,
+                TopicControlStore._MANUAL_REV,
+                TopicControlStore._MANUAL_PERSON,
+                TopicControlStore._CURRENT,
+                TopicControlStore._PENDING,
+                "control:chat_processing",
+                "control:tts_busy",
+                "control:stream_epoch",
+                PreparedMonologueStore._KEY,
+            )
+        ]
+
+    async def read(self) -> ControlSnapshot:
+        manager = self._redis_manager
+        async with manager.redis_client.pipeline(transaction=False) as pipe:
+            pipe.mget(self._keys)
+            podcast_n = manager.queue_length_commands(pipe, "podcast")
+            reacted_n = manager.queue_length_commands(pipe, "reacted")
+            manager.chat_length_commands(pipe)
+            results = await pipe.execute()
+
+        (
+            revision,
+            manual_rev,
+            manual_person,
+            current_topic,
+            pending_topic,
+            chat_processing,
+            tts_busy,
+            stream_epoch,
+            prepared_raw,
+        ) = results[0]
+        lengths = results[1:]
+        podcast_len = sum(int(n) for n in lengths[:podcast_n])
+        lengths = lengths[podcast_n:]
+        reacted_len = sum(int(n) for n in lengths[:reacted_n])
+        chat_len, chat_ready = manager.parse_chat_lengths(lengths[reacted_n:])
+
+        prepared_text = _decode(prepared_raw)
+        return ControlSnapshot(
+            taken_at=time.time(),
+            topic_revision=_parse_int(revision) or 0,
+            manual_topic_revision=_parse_int(manual_rev),
+            manual_person=_strip_or_empty(manual_person),
+            current_topic=_strip_or_empty(current_topic),
+            pending_topic=_strip_or_empty(pending_topic) or None,
+            chat_processing=chat_processing is not None,
+            tts_busy=tts_busy is not None,
+            stream_epoch=_decode(stream_epoch),
+            podcast_queue_length=podcast_len,
+            reacted_queue_length=reacted_len,
+            chat_queue_length=chat_len,
+            chat_ready_authors=chat_ready,
+            prepared_monologue=(
+                PreparedMonologueStore._from_payload(prepared_text)
+                if prepared_text
+                else None
+            ),
+        )
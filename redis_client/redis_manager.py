@@ -1,16 +1,39 @@
 import json
 import logging
+import time
 
 import redis.asyncio as aioredis
 
 from core.config import Config
+from redis_client.bounded_list import BoundedList
+from redis_client.chat_dedupe_store import ChatDedupeStore
+from redis_client.chat_ingest_store import ChatIngestStore
+from redis_client.tts_stream_queue import TtsStreamQueues
+from redis_client.visual_overlay_store import overlay_events_channel
 
 logger = logging.getLogger(__name__)
 
 
+def _timestamp(value: float | None = None) -> float:
+    return round(time.time() if value is None else value, 3)
+
+
+def _parse_float(value) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class RedisManager:
     def __init__(self):
         self.redis_client = None
+        self._bounded: BoundedList | None = None
+        self._tts_streams: TtsStreamQueues | None = None
+        self._chat_ingest: ChatIngestStore | None = None
+        self._chat_dedupe: ChatDedupeStore | None = None
 
     def _key(self, name: str) -> str:
         return f"{Config.REDIS_KEY_PREFIX}{name}"
@@ -19,60 +42,153 @@ class RedisManager:
         """Подключение к Redis с проверкой доступности."""
         redis_url = f"redis://{Config.REDIS_HOST}:{Config.REDIS_PORT}/{Config.REDIS_DB}"
         self.redis_client = aioredis.from_url(redis_url)
+        self._bounded = BoundedList(self.redis_client)
+        self._chat_ingest = ChatIngestStore(self.redis_client, Config.REDIS_KEY_PREFIX)
+        if Config.CHAT_DEDUPE_BACKEND == "bloom":
+            self._chat_dedupe = ChatDedupeStore(
+                self.redis_client,
+                Config.REDIS_KEY_PREFIX,
+                window_hours=Config.CHAT_DEDUPE_WINDOW_HOURS,
+                hourly_capacity=Config.CHAT_DEDUPE_HOURLY_CAPACITY,
+                error_rate=Config.CHAT_DEDUPE_ERROR_RATE,
+            )
         await self.redis_client.ping()
+        if Config.TTS_QUEUE_BACKEND == "stream":
+            self._tts_streams = TtsStreamQueues(
+                self.redis_client, Config.REDIS_KEY_PREFIX
+            )
+            await self._tts_streams.ensure_groups()
 
     async def disconnect(self):
         """Отключение от Redis"""
         if self.redis_client:
             await self.redis_client.close()
 
-    async def _bounded_rpush(self, key: str, value: str, max_size: int) -> None:
-        await self.redis_client.rpush(key, value)
-        length = await self.redis_client.llen(key)
-        if length > max_size:
-            dropped = length - max_size
-            await self.redis_client.ltrim(key, dropped, -1)
-            logger.warning(
-                "Очередь %s переполнена — отброшено %s старых реплик с начала",
-                key,
-                dropped,
-            )
+    async def _bounded_push(
+        self,
+        key: str,
+        values: list[str],
+        max_size: int,
+        *,
+        head: bool = False,
+    ) -> int:
+        """Вставка пачки + обрезка одним вызовом; возвращает число отброшенных."""
+        return await self._bounded.push(key, values, max_size, head=head)
+
+    @property
+    def uses_tts_streams(self) -> bool:
+        """True — очереди озвучки на Redis Streams с подтверждением (ack)."""
+        return self._tts_streams is not None
+
+    async def _pop_stream_message(self, kinds: tuple[str, ...], timeout: float = 0.0):
+        popped = await self._tts_streams.pop(kinds, timeout=timeout)
+        if popped is None:
+            return None
+        kind, fields = popped
+        text = fields.get("text", "")
+        enqueued_at = _parse_float(fields.get("ts"))
+        if kind == "podcast":
+            try:
+                rev = int(fields.get("rev", 0))
+            except ValueError:
+                rev = 0
+            return kind, self.encode_podcast_message(text, rev, enqueued_at)
+        return kind, self.encode_reacted_message(text, enqueued_at)
 
     async def get_podcast_message(self):
+        if self._tts_streams:
+            popped = await self._pop_stream_message(("podcast",))
+            return popped[1] if popped else None
         return await self.redis_client.lpop(self._key("podcast_messages_queue"))
 
-    async def get_chat_message(self):
-        return await self.redis_client.lpop(self._key("chat_messages_queue"))
-
-    async def list_chat_messages(self, limit: int = 50) -> list:
+    async def peek_podcast_messages(self, count: int) -> list[str | bytes]:
+        """Следующие count реплик монолога без извлечения (формат get_podcast_message)."""
+        if count <= 0:
+            return []
+        if self._tts_streams:
+            return [
+                self.encode_podcast_message(
+                    fields.get("text", ""),
+                    int(fields.get("rev", 0) or 0),
+                    _parse_float(fields.get("ts")),
+                )
+                for fields in await self._tts_streams.peek("podcast", count)
+            ]
         return await self.redis_client.lrange(
-            self._key("chat_messages_queue"), 0, max(0, limit - 1)
+            self._key("podcast_messages_queue"), 0, count - 1
         )
 
-    async def remove_chat_message_raw(self, payload) -> bool:
-        removed = await self.redis_client.lrem(
-            self._key("chat_messages_queue"), 1, payload
+    async def pop_respondable_chat_message(self) -> tuple[str, bytes] | None:
+        """Самое раннее сообщение автора без cooldown: (author, payload)."""
+        return await self._chat_ingest.pop_respondable()
+
+    async def mark_chat_author_responded(self, author: str) -> None:
+        await self._chat_ingest.mark_responded(
+            author, Config.CHAT_USER_COOLDOWN_SECONDS
         )
-        return int(removed) > 0
+
+    async def get_chat_queue_lengths(self) -> tuple[int, int]:
+        """(сообщений в очереди чата, авторов без cooldown)."""
+        return await self._chat_ingest.lengths()
+
+    def chat_length_commands(self, pipe) -> int:
+        """Команды длин очереди чата в pipeline; разбор — parse_chat_lengths."""
+        return self._chat_ingest.length_commands(pipe)
+
+    def parse_chat_lengths(self, results) -> tuple[int, int]:
+        return self._chat_ingest.parse_lengths(results)
 
     @staticmethod
-    def encode_podcast_message(text: str, topic_revision: int) -> str:
+    def encode_podcast_message(
+        text: str, topic_revision: int, enqueued_at: float | None = None
+    ) -> str:
         return json.dumps(
-            {"text": text, "rev": topic_revision},
+            {"text": text, "rev": topic_revision, "ts": _timestamp(enqueued_at)},
             ensure_ascii=False,
         )
 
     @staticmethod
-    def decode_podcast_message(raw) -> tuple[str, int]:
+    def decode_podcast_entry(raw) -> tuple[str, int, float | None]:
+        """(текст, ревизия, время постановки в очередь)."""
         if isinstance(raw, bytes):
             raw = raw.decode("utf-8")
         try:
             data = json.loads(raw)
             if isinstance(data, dict) and "text" in data:
-                return str(data["text"]), int(data.get("rev", 0))
+                return (
+                    str(data["text"]),
+                    int(data.get("rev", 0)),
+                    _parse_float(data.get("ts")),
+                )
         except (json.JSONDecodeError, TypeError, ValueError):
             pass
-        return str(raw), 0
+        return str(raw), 0, None
+
+    @classmethod
+    def decode_podcast_message(cls, raw) -> tuple[str, int]:
+        text, rev, _enqueued_at = cls.decode_podcast_entry(raw)
+        return text, rev
+
+    @staticmethod
+    def encode_reacted_message(text: str, enqueued_at: float | None = None) -> str:
+        return json.dumps(
+            {"text": text, "ts": _timestamp(enqueued_at)},
+            ensure_ascii=False,
+        )
+
+    @staticmethod
+    def decode_reacted_message(raw) -> tuple[str, float | None]:
+        """(текст, время постановки); старые реплики — просто строка."""
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        if raw.startswith("{"):
+            try:
+                data = json.loads(raw)
+                if isinstance(data, dict) and "text" in data:
+                    return str(data["text"]), _parse_float(data.get("ts"))
+            except (json.JSONDecodeError, TypeError):
+                pass
+        return str(raw), None
 
     async def add_podcast_message(
         self,
@@ -81,14 +197,35 @@ class RedisManager:
         *,
         topic_revision: int = 0,
     ):
-        payload = self.encode_podcast_message(message, topic_revision)
-        key = self._key("podcast_messages_queue")
-        if priority:
-            await self.redis_client.lpush(key, payload)
-        else:
-            await self._bounded_rpush(
-                key, payload, Config.TTS_QUEUE_MAX_SIZE * 2
-            )
+        await self.add_podcast_messages(
+            [message], priority=priority, topic_revision=topic_revision
+        )
+
+    async def requeue_tts_message(self, kind: str, payload) -> None:
+        """Возвращает взятую, но не озвученную реплику в голову очереди."""
+        if self._tts_streams:
+            self._tts_streams.release(kind)
+            return
+        name = (
+            "reacted_to_chat_messages_queue"
+            if kind == "reacted"
+            else "podcast_messages_queue"
+        )
+        await self.redis_client.lpush(self._key(name), payload)
+
+    async def ack_tts_message(self, kind: str) -> None:
+        """Реплика озвучена (или пропущена) — для Streams снимает её из PEL."""
+        if self._tts_streams:
+            await self._tts_streams.ack(kind)
+        if kind == "reacted":
+            await self._notify_chat_overlay()
+
+    async def _notify_chat_overlay(self) -> None:
+        """
+        Показ чата в оверлее зависит от длины очереди ответов и флага
+        chat_processing — их смена публикуется как событие overlay.
+        """
+        await self.redis_client.publish(overlay_events_channel(), "chat")
 
     async def add_podcast_messages(
         self,
@@ -108,53 +245,108 @@ class RedisManager:
         ]
         if not payloads:
             return
+        if self._tts_streams:
+            await self._tts_streams.add(
+                "podcast",
+                [
+                    {
+                        "text": message,
+                        "rev": str(topic_revision),
+                        "ts": str(_timestamp()),
+                    }
+                    for message in messages
+                    if message.strip()
+                ],
+                0 if priority else Config.TTS_QUEUE_MAX_SIZE * 2,
+                priority=priority,
+            )
+            return
         if priority:
-            for payload in reversed(payloads):
-                await self.redis_client.lpush(key, payload)
+            # LPUSH по очереди кладёт каждый элемент в голову — идём с конца.
+            await self._bounded_push(key, list(reversed(payloads)), 0, head=True)
         else:
-            for payload in payloads:
-                await self._bounded_rpush(
-                    key, payload, Config.TTS_QUEUE_MAX_SIZE * 2
-                )
+            await self._bounded_push(key, payloads, Config.TTS_QUEUE_MAX_SIZE * 2)
 
     async def claim_chat_dedupe(self, dedupe_key: str, *, ttl: int = 86400) -> bool:
         """True — сообщение ещё не обрабатывали (атомарно помечает)."""
+        if self._chat_dedupe:
+            return await self._chat_dedupe.claim(dedupe_key)
         key = self._key(f"chat:dedupe:{dedupe_key}")
         return bool(await self.redis_client.set(key, "1", nx=True, ex=ttl))
 
     async def clear_reacted_to_chat_messages_queue(self) -> int:
-        key = self._key("reacted_to_chat_messages_queue")
-        length = await self.redis_client.llen(key)
-        if length:
-            await self.redis_client.delete(key)
-        return int(length)
+        if self._tts_streams:
+            cleared = await self._tts_streams.clear("reacted")
+        else:
+            key = self._key("reacted_to_chat_messages_queue")
+            cleared = int(await self.redis_client.llen(key))
+            if cleared:
+                await self.redis_client.delete(key)
+        if cleared:
+            await self._notify_chat_overlay()
+        return cleared
 
     async def add_chat_message(self, message: dict):
         payload = json.dumps(message, ensure_ascii=False)
-        await self._bounded_rpush(
-            self._key("chat_messages_queue"),
+        await self._chat_ingest.push(
+            str(message.get("author", "Аноним")),
             payload,
             Config.AI_QUEUE_MAX_SIZE,
         )
 
     async def get_podcast_messages_queue_length(self):
+        if self._tts_streams:
+            return await self._tts_streams.length("podcast")
         return await self.redis_client.llen(self._key("podcast_messages_queue"))
 
+    def queue_length_commands(self, pipe, kind: str) -> int:
+        """Длина очереди озвучки ("podcast" | "reacted") в pipeline; число команд."""
+        if self._tts_streams:
+            return self._tts_streams.length_commands(pipe, kind)
+        name = (
+            "reacted_to_chat_messages_queue"
+            if kind == "reacted"
+            else "podcast_messages_queue"
+        )
+        pipe.llen(self._key(name))
+        return 1
+
     async def get_chat_messages_queue_length(self):
-        return await self.redis_client.llen(self._key("chat_messages_queue"))
+        return await self._chat_ingest.length()
 
     async def add_reacted_to_chat_message(self, message: str, priority: bool = False):
+        await self.add_reacted_to_chat_messages([message], priority=priority)
+
+    async def add_reacted_to_chat_messages(
+        self,
+        messages: list[str],
+        priority: bool = False,
+    ) -> None:
+        """Добавляет реплики ответа чата одним вызовом, сохраняя порядок."""
+        if not messages:
+            return
         key = self._key("reacted_to_chat_messages_queue")
         max_size = Config.CHAT_TTS_QUEUE_MAX_SIZE
-        if priority:
-            await self.redis_client.lpush(key, message)
-            length = await self.redis_client.llen(key)
-            if length > max_size:
-                await self.redis_client.ltrim(key, 0, max_size - 1)
+        if self._tts_streams:
+            await self._tts_streams.add(
+                "reacted",
+                [{"text": message, "ts": str(_timestamp())} for message in messages],
+                max_size,
+                priority=priority,
+            )
         else:
-            await self._bounded_rpush(key, message, max_size)
+            payloads = [self.encode_reacted_message(message) for message in messages]
+            if priority:
+                await self._bounded_push(
+                    key, list(reversed(payloads)), max_size, head=True
+                )
+            else:
+                await self._bounded_push(key, payloads, max_size)
+        await self._notify_chat_overlay()
 
     async def clear_podcast_messages_queue(self) -> int:
+        if self._tts_streams:
+            return await self._tts_streams.clear("podcast")
         key = self._key("podcast_messages_queue")
         length = await self.redis_client.llen(key)
         if length:
@@ -162,11 +354,7 @@ class RedisManager:
         return int(length)
 
     async def clear_chat_messages_queue(self) -> int:
-        key = self._key("chat_messages_queue")
-        length = await self.redis_client.llen(key)
-        if length:
-            await self.redis_client.delete(key)
-        return int(length)
+        return await self._chat_ingest.clear()
 
     async def get_stream_epoch(self) -> str | None:
         raw = await self.redis_client.get(self._key("control:stream_epoch"))
@@ -181,20 +369,61 @@ class RedisManager:
 
     async def set_chat_processing(self, active: bool) -> None:
         key = self._key("control:chat_processing")
-        if active:
-            await self.redis_client.set(key, "1", ex=180)
-        else:
-            await self.redis_client.delete(key)
+        async with self.redis_client.pipeline(transaction=False) as pipe:
+            if active:
+                pipe.set(key, "1", ex=180)
+            else:
+                pipe.delete(key)
+            pipe.publish(overlay_events_channel(), "chat")
+            await pipe.execute()
 
     async def is_chat_processing(self) -> bool:
         return bool(await self.redis_client.exists(self._key("control:chat_processing")))
 
     async def get_reacted_to_chat_message(self):
-        return await self.redis_client.lpop(
+        if self._tts_streams:
+            popped = await self._pop_stream_message(("reacted",))
+            return popped[1] if popped else None
+        payload = await self.redis_client.lpop(
             self._key("reacted_to_chat_messages_queue")
         )
+        if payload is not None:
+            await self._notify_chat_overlay()
+        return payload
+
+    async def pop_tts_message_blocking(
+        self,
+        *,
+        include_podcast: bool = True,
+        timeout: float = 5.0,
+    ) -> tuple[str, bytes | str] | None:
+        """
+        BLPOP по очередям озвучки: ответы чата всегда проверяются первыми.
+        Возвращает ("reacted" | "podcast", payload) или None по таймауту.
+        """
+        if self._tts_streams:
+            kinds = ("reacted", "podcast") if include_podcast else ("reacted",)
+            return await self._pop_stream_message(kinds, timeout=timeout)
+        reacted_key = self._key("reacted_to_chat_messages_queue")
+        keys = [reacted_key]
+        if include_podcast:
+            keys.append(self._key("podcast_messages_queue"))
+        result = await self.redis_client.blpop(keys, timeout=timeout)
+        if result is None:
+            return None
+        key, payload = result
+        if isinstance(key, bytes):
+            key = key.decode("utf-8")
+        if key == reacted_key:
+            # Реплика ушла из списка — показ чата мог смениться (у Streams
+            # запись остаётся в очереди до ack, событие — там).
+            await self._notify_chat_overlay()
+            return "reacted", payload
+        return "podcast", payload
 
     async def get_reacted_to_chat_messages_queue_length(self):
+        if self._tts_streams:
+            return await self._tts_streams.length("reacted")
         return await self.redis_client.llen(
             self._key("reacted_to_chat_messages_queue")
         )
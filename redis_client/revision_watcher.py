@@ -0,0 +1,96 @@
+import asyncio
+import logging
+
+from redis_client.topic_control_store import TopicControlStore
+
+logger = logging.getLogger(__name__)
+
+
+class RevisionWatcher:
+    """
+    Локальная копия control:topic_revision, обновляемая через pub/sub.
+
+    bump_revision публикует новое значение — процесс узнаёт о смене автора
+    без GET на каждое предложение. После (пере)подписки значение сверяется
+    GET-ом: публикации, пришедшие без подписки, теряются.
+    """
+
+    _RECONNECT_DELAY_SECONDS = 1.0
+
+    def __init__(self, redis_client) -> None:
+        self._redis = redis_client
+        self._topic_store = TopicControlStore(redis_client)
+        self._current = 0
+        self._changed = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def current(self) -> int:
+        return self._current
+
+    def is_stale(self, revision: int) -> bool:
+        """
+        Известна ли ревизия новее revision. Ревизия растёт только через INCR;
+        если snapshot успел увидеть её раньше публикации — revision не устарела.
+        """
+        return self._current > revision
+
+    async def start(self) -> int:
+        self._set(await self._topic_store.get_topic_revision())
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_loop())
+        return self._current
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def wait_newer(self, revision: int, timeout: float | None = None) -> int:
+        """Ждёт ревизию новее revision (или таймаут); возвращает текущую."""
+        if self._current <= revision:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._current
+
+    def _set(self, revision: int) -> None:
+        # Ревизия только растёт: запоздавшая публикация или GET после
+        # переподписки не должны откатывать текущее значение назад.
+        if revision <= self._current:
+            return
+        self._current = revision
+        # Ожидающие держат ссылку на старое событие — будим их и начинаем новое.
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _listen_loop(self) -> None:
+        while True:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self._topic_store.revision_channel())
+                self._set(await self._topic_store.get_topic_revision())
+                while True:
+                    message = await pubsub.get_message(timeout=None)
+                    if message is None:
+                        continue
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode("utf-8")
+                    try:
+                        self._set(int(data))
+                    except ValueError:
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Подписка на ревизию темы прервана: %s", exc)
+                await asyncio.sleep(self._RECONNECT_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
@@ -1,7 +1,16 @@
 from core.config import Config
+from redis_client.visual_overlay_store import overlay_events_channel
 
 DEFAULT_TOPIC = "Цитаты известных людей"
 
+# KEYS[1] — счётчик ревизии, ARGV[1] — канал. INCR и PUBLISH одним шагом:
+# публикации идут строго в порядке значений.
+_BUMP_LUA = """
+local rev = redis.call("INCR", KEYS[1])
+redis.call("PUBLISH", ARGV[1], rev)
+return rev
+"""
+
 
 class TopicControlStore:
     """Текущая/следующая тема монолога и очередь уведомлений для Telegram."""
@@ -12,9 +21,11 @@ class TopicControlStore:
     _REVISION = "control:topic_revision"
     _MANUAL_REV = "control:topic_manual_revision"
     _MANUAL_PERSON = "control:manual_person"
+    _REVISION_EVENTS = "control:topic_revision_events"
 
     def __init__(self, redis_client) -> None:
         self._redis = redis_client
+        self._bump = redis_client.register_script(_BUMP_LUA)
 
     def _key(self, name: str) -> str:
         return f"{Config.REDIS_KEY_PREFIX}{name}"
@@ -32,13 +43,19 @@ class TopicControlStore:
         return value.strip() if value and value.strip() else ""
 
     async def clear_current_topic(self) -> None:
-        await self._redis.delete(self._key(self._CURRENT))
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.delete(self._key(self._CURRENT))
+            pipe.publish(overlay_events_channel(), "topic")
+            await pipe.execute()
 
     async def set_current_topic(self, topic: str, *, notify: bool = True) -> None:
         topic = topic.strip()
         prev_raw = self._decode(await self._redis.get(self._key(self._CURRENT)))
         prev = prev_raw.strip() if prev_raw and prev_raw.strip() else None
-        await self._redis.set(self._key(self._CURRENT), topic)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self._key(self._CURRENT), topic)
+            pipe.publish(overlay_events_channel(), "topic")
+            await pipe.execute()
         if notify and prev != topic:
             await self.enqueue_notification(topic)
 
@@ -71,8 +88,16 @@ class TopicControlStore:
         except ValueError:
             return 0
 
+    def revision_channel(self) -> str:
+        return self._key(self._REVISION_EVENTS)
+
     async def bump_revision(self) -> int:
-        return int(await self._redis.incr(self._key(self._REVISION)))
+        """INCR + PUBLISH нового значения — RevisionWatcher узнаёт о смене сразу."""
+        return int(
+            await self._bump(
+                keys=[self._key(self._REVISION)], args=[self.revision_channel()]
+            )
+        )
 
     async def get_manual_topic_revision(self) -> int | None:
         raw = await self._redis.get(self._key(self._MANUAL_REV))
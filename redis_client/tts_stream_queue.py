@@ -0,0 +1,258 @@
+import logging
+import time
+
+from redis.exceptions import ResponseError
+
+from core.config import Config
+
+logger = logging.getLogger(__name__)
+
+# KEYS — потоки в порядке приоритета; ARGV: группа, consumer, min-idle (мс).
+# Для каждого потока по порядку: свои неподтверждённые записи (перезапуск после
+# падения), записи умершего consumer (XAUTOCLAIM), затем новые. Если ничего нет —
+# возвращает последние id потоков, чтобы дождаться новых записей через XREAD BLOCK.
+_CLAIM_NEXT_LUA = """
+local group, consumer, min_idle = ARGV[1], ARGV[2], ARGV[3]
+for _, key in ipairs(KEYS) do
+    local own = redis.call("XREADGROUP", "GROUP", group, consumer,
+        "COUNT", 16, "STREAMS", key, "0")
+    if own and own[1] then
+        for _, entry in ipairs(own[1][2]) do
+            if entry[2] then
+                return {"entry", key, entry[1], entry[2]}
+            end
+            redis.call("XACK", key, group, entry[1])
+        end
+    end
+    local claimed = redis.call("XAUTOCLAIM", key, group, consumer, min_idle,
+        "0-0", "COUNT", 1)
+    local entry = claimed[2][1]
+    if entry then
+        if entry[2] then
+            return {"entry", key, entry[1], entry[2]}
+        end
+        redis.call("XACK", key, group, entry[1])
+    end
+    local fresh = redis.call("XREADGROUP", "GROUP", group, consumer,
+        "COUNT", 1, "STREAMS", key, ">")
+    if fresh and fresh[1] and fresh[1][2][1] then
+        entry = fresh[1][2][1]
+        return {"entry", key, entry[1], entry[2]}
+    end
+end
+local result = {"wait"}
+for _, key in ipairs(KEYS) do
+    local tail = redis.call("XREVRANGE", key, "+", "-", "COUNT", 1)
+    if tail[1] then
+        table.insert(result, tail[1][1])
+    else
+        table.insert(result, "0-0")
+    end
+end
+return result
+"""
+
+# KEYS[1] — поток; ARGV: группа, предел длины. Лишние записи удаляются с
+# головы, но только ещё не выданные: всё до последней записи в PEL (реплика
+# в работе, не подтверждённая после падения) остаётся — XTRIM MAXLEN удалил
+# бы именно её. Подтверждённые записи ack удаляет сам, поэтому после PEL идут
+# только невыданные. Возвращает число удалённых.
+_TRIM_LUA = """
+local key, group, max_size = KEYS[1], ARGV[1], tonumber(ARGV[2])
+local over = redis.call("XLEN", key) - max_size
+if over <= 0 then
+    return 0
+end
+local start = "-"
+local pending = redis.call("XPENDING", key, group)
+if pending[1] > 0 then
+    start = "(" .. pending[3]
+end
+local victims = redis.call("XRANGE", key, start, "+", "COUNT", over)
+for _, entry in ipairs(victims) do
+    redis.call("XDEL", key, entry[1])
+end
+return #victims
+"""
+
+
+def _text(value) -> str:
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return str(value)
+
+
+class TtsStreamQueues:
+    """
+    Очереди озвучки на Redis Streams (XADD / XREADGROUP / XACK).
+
+    Каждая логическая очередь — два потока: приоритетный (замена LPUSH) и обычный.
+    Запись остаётся в PEL, пока streamer не подтвердит озвучку, поэтому падение
+    посреди синтеза не теряет реплику, а второй streamer подбирает её XAUTOCLAIM.
+    При переполнении отбрасываются самые старые невыданные записи; выданные и
+    не подтверждённые (PEL) не удаляются никогда.
+    """
+
+    GROUP = "streamer"
+    _KINDS = ("reacted", "podcast")
+
+    def __init__(self, redis_client, key_prefix: str) -> None:
+        self._redis = redis_client
+        self._prefix = key_prefix
+        self._consumer = Config.TTS_STREAM_CONSUMER
+        self._claim_next = redis_client.register_script(_CLAIM_NEXT_LUA)
+        self._trim = redis_client.register_script(_TRIM_LUA)
+        self._in_flight: dict[str, tuple[str, str]] = {}
+
+    def _keys(self, kind: str) -> tuple[str, str]:
+        base = f"{self._prefix}tts_stream:{kind}"
+        return f"{base}:priority", base
+
+    def _kind_of(self, key: str) -> str:
+        for kind in self._KINDS:
+            if key in self._keys(kind):
+                return kind
+        return "podcast"
+
+    async def ensure_groups(self) -> None:
+        for kind in self._KINDS:
+            for key in self._keys(kind):
+                try:
+                    await self._redis.xgroup_create(
+                        key, self.GROUP, id="0", mkstream=True
+                    )
+                except ResponseError as exc:
+                    if "BUSYGROUP" not in str(exc):
+                        raise
+
+    async def add(
+        self,
+        kind: str,
+        entries: list[dict[str, str]],
+        max_size: int,
+        *,
+        priority: bool = False,
+    ) -> int:
+        """
+        XADD пачкой и обрезка до max_size за один round-trip (см. _TRIM_LUA:
+        запись в работе не удаляется); возвращает число отброшенных.
+        """
+        if not entries:
+            return 0
+        priority_key, normal_key = self._keys(kind)
+        key = priority_key if priority else normal_key
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for fields in entries:
+                pipe.xadd(key, fields)
+            if max_size > 0:
+                await self._trim(keys=[key], args=[self.GROUP, max_size], client=pipe)
+            results = await pipe.execute()
+        dropped = int(results[-1]) if max_size > 0 else 0
+        if dropped:
+            logger.warning(
+                "Поток %s переполнен — отброшено %s реплик",
+                key,
+                dropped,
+            )
+        return dropped
+
+    def length_commands(self, pipe, kind: str) -> int:
+        """Добавляет XLEN в pipeline; возвращает число добавленных команд."""
+        keys = self._keys(kind)
+        for key in keys:
+            pipe.xlen(key)
+        return len(keys)
+
+    async def length(self, kind: str) -> int:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            self.length_commands(pipe, kind)
+            return sum(int(n) for n in await pipe.execute())
+
+    async def clear(self, kind: str) -> int:
+        """XTRIM MAXLEN 0 — поток и группа остаются, PEL подчистится при ack/claim."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for key in self._keys(kind):
+                pipe.xtrim(key, maxlen=0, approximate=False)
+            return sum(int(n) for n in await pipe.execute())
+
+    async def peek(self, kind: str, count: int) -> list[dict]:
+        """
+        Ближайшие записи без захвата: XRANGE приоритетного, затем обычного потока.
+        Запись в работе (до ack) сюда не попадает.
+        """
+        if count <= 0:
+            return []
+        in_flight = self._in_flight.get(kind)
+        skip = in_flight[1] if in_flight else None
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in self._keys(kind):
+                pipe.xrange(key, count=count + 1)
+            ranges = await pipe.execute()
+        entries: list[dict] = []
+        for entry_id, raw_fields in (entry for batch in ranges for entry in batch):
+            if _text(entry_id) == skip:
+                continue
+            entries.append({_text(k): _text(v) for k, v in raw_fields.items()})
+            if len(entries) >= count:
+                break
+        return entries
+
+    async def _try_claim(self, kinds: tuple[str, ...]) -> tuple[str, dict] | list:
+        keys = [key for kind in kinds for key in self._keys(kind)]
+        result = await self._claim_next(
+            keys=keys,
+            args=[
+                self.GROUP,
+                self._consumer,
+                int(Config.TTS_STREAM_CLAIM_IDLE_SECONDS * 1000),
+            ],
+        )
+        if _text(result[0]) == "wait":
+            return [_text(entry_id) for entry_id in result[1:]]
+        key, entry_id, raw_fields = _text(result[1]), _text(result[2]), result[3]
+        fields = {
+            _text(raw_fields[i]): _text(raw_fields[i + 1])
+            for i in range(0, len(raw_fields) - 1, 2)
+        }
+        kind = self._kind_of(key)
+        self._in_flight[kind] = (key, entry_id)
+        return kind, fields
+
+    async def pop(
+        self,
+        kinds: tuple[str, ...],
+        *,
+        timeout: float = 0.0,
+    ) -> tuple[str, dict] | None:
+        """
+        Следующая запись по приоритету kinds. timeout > 0 — ждать XREAD BLOCK.
+        Запись считается в работе до ack(kind).
+        """
+        deadline = time.monotonic() + timeout
+        keys = [key for kind in kinds for key in self._keys(kind)]
+        while True:
+            claimed = await self._try_claim(kinds)
+            if isinstance(claimed, tuple):
+                return claimed
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            await self._redis.xread(
+                dict(zip(keys, claimed)),
+                count=1,
+                block=max(1, int(remaining * 1000)),
+            )
+
+    async def ack(self, kind: str) -> None:
+        in_flight = self._in_flight.pop(kind, None)
+        if in_flight is None:
+            return
+        key, entry_id = in_flight
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xack(key, self.GROUP, entry_id)
+            pipe.xdel(key, entry_id)
+            await pipe.execute()
+
+    def release(self, kind: str) -> None:
+        """Не подтверждаем — запись вернётся первой из собственного PEL."""
+        self._in_flight.pop(kind, None)
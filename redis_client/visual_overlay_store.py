@@ -2,9 +2,20 @@ import json
 
 from core.config import Config
 
+OVERLAY_EVENTS_CHANNEL = "visual:overlay_events"
+
+
+def overlay_events_channel() -> str:
+    return f"{Config.REDIS_KEY_PREFIX}{OVERLAY_EVENTS_CHANNEL}"
+
 
 class VisualOverlayStore:
-    """Данные для текстового оверлея на визуале (OBS Browser Source)."""
+    """
+    Данные для текстового оверлея на визуале (OBS Browser Source).
+
+    Каждое изменение публикуется в OVERLAY_EVENTS_CHANNEL — визуал-сервер
+    рассылает новое состояние по SSE вместо опроса Redis.
+    """
 
     _CHAT = "visual:chat_overlay"
     _PAGE_IMAGE = "visual:page_image"
@@ -13,6 +24,16 @@ class VisualOverlayStore:
     def __init__(self, redis_client) -> None:
         self._redis = redis_client
 
+    async def _set_and_publish(self, key: str, value: str | None, field: str) -> None:
+        """SET/DEL + PUBLISH одним round-trip."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            if value is None:
+                pipe.delete(key)
+            else:
+                pipe.set(key, value)
+            pipe.publish(overlay_events_channel(), field)
+            await pipe.execute()
+
     def _key(self) -> str:
         return f"{Config.REDIS_KEY_PREFIX}{self._CHAT}"
 
@@ -24,10 +45,7 @@ class VisualOverlayStore:
 
     async def set_page_quote(self, quote: str | None) -> None:
         quote = (quote or "").strip()
-        if quote:
-            await self._redis.set(self._quote_key(), quote)
-        else:
-            await self._redis.delete(self._quote_key())
+        await self._set_and_publish(self._quote_key(), quote or None, "quote")
 
     async def get_page_quote(self) -> str | None:
         raw = await self._redis.get(self._quote_key())
@@ -39,14 +57,11 @@ class VisualOverlayStore:
         return quote or None
 
     async def clear_page_quote(self) -> None:
-        await self._redis.delete(self._quote_key())
+        await self._set_and_publish(self._quote_key(), None, "quote")
 
     async def set_page_image(self, image_url: str | None) -> None:
         image_url = (image_url or "").strip()
-        if image_url:
-            await self._redis.set(self._image_key(), image_url)
-        else:
-            await self._redis.delete(self._image_key())
+        await self._set_and_publish(self._image_key(), image_url or None, "image")
 
     async def get_page_image(self) -> str | None:
         raw = await self._redis.get(self._image_key())
@@ -58,7 +73,7 @@ class VisualOverlayStore:
         return url if url.startswith("https://") else None
 
     async def clear_page_image(self) -> None:
-        await self._redis.delete(self._image_key())
+        await self._set_and_publish(self._image_key(), None, "image")
 
     async def set_chat_overlay(self, author: str, content: str) -> None:
         payload = json.dumps(
@@ -68,10 +83,13 @@ class VisualOverlayStore:
             },
             ensure_ascii=False,
         )
-        await self._redis.set(self._key(), payload)
+        await self._set_and_publish(self._key(), payload, "chat")
 
     async def get_chat_overlay(self) -> dict | None:
-        raw = await self._redis.get(self._key())
+        return self._parse_chat(await self._redis.get(self._key()))
+
+    @staticmethod
+    def _parse_chat(raw) -> dict | None:
         if raw is None:
             return None
         if isinstance(raw, bytes):
@@ -89,4 +107,22 @@ class VisualOverlayStore:
         return {"author": author, "content": content}
 
     async def clear_chat_overlay(self) -> None:
-        await self._redis.delete(self._key())
+        await self._set_and_publish(self._key(), None, "chat")
+
+    async def get_overlay_fields(self) -> tuple[str | None, str | None, dict | None]:
+        """(image_url, quote, chat) одним MGET."""
+        image_raw, quote_raw, chat_raw = await self._redis.mget(
+            [self._image_key(), self._quote_key(), self._key()]
+        )
+        image_url = self._decode_text(image_raw)
+        if image_url and not image_url.startswith("https://"):
+            image_url = None
+        return image_url, self._decode_text(quote_raw), self._parse_chat(chat_raw)
+
+    @staticmethod
+    def _decode_text(raw) -> str | None:
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return str(raw).strip() or None
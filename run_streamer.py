@@ -1,19 +1,32 @@
+import argparse
 import asyncio
 
 from core.app_state import app_state
 from core.health_server import HealthServer
 from core.logger import logger
 from core.shutdown import shutdown
+from core.startup_profile import startup_profile
 from core.worker_epoch import retire_stale_worker
 from redis_client.redis_manager import RedisManager
 from speech.audio_player import stop_audio
+from speech.speech_synthesizer import SpeechSynthesizer
 from streamer.streamer import Streamer
 
 
-async def main():
+def _prepare_synthesizer() -> None:
+    """Модель и прогрев первого синтеза — в потоке, параллельно с Redis."""
+    synthesizer = SpeechSynthesizer()
+    synthesizer.warm_up()
+
+
+async def main(profile_startup: bool = False):
     app_state.role = "streamer"
+    loop = asyncio.get_event_loop()
+    synthesizer_ready = loop.run_in_executor(None, _prepare_synthesizer)
+
     redis_manager = RedisManager()
-    await redis_manager.connect()
+    with startup_profile.phase("подключение к Redis"):
+        await redis_manager.connect()
 
     health = HealthServer(redis_manager)
     await health.start()
@@ -21,16 +34,19 @@ async def main():
     if await retire_stale_worker(redis_manager, "streamer"):
         return
 
+    with startup_profile.phase("ожидание модели"):
+        await synthesizer_ready
     streamer = Streamer(redis_manager)
     stop_audio()
     await redis_manager.set_tts_busy(False)
     await redis_manager.set_chat_processing(False)
     logger.info("Сброс tts_busy при старте streamer")
+    if profile_startup:
+        logger.info("Профиль запуска streamer:\n%s", startup_profile.report())
 
     shutdown.register(health.stop)
     shutdown.register(redis_manager.disconnect)
 
-    loop = asyncio.get_event_loop()
     shutdown.install_signal_handlers(loop)
 
     streamer_task = asyncio.create_task(streamer.run())
@@ -47,4 +63,11 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Streamer: озвучка очередей Redis")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Вывести время фаз запуска (импорт torch, модель, прогрев, Redis)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.profile_startup))
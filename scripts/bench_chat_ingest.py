@@ -0,0 +1,126 @@
+"""
+Выбор следующего сообщения чата: LRANGE + JSON + LREM против ChatIngestStore.
+
+    python scripts/bench_chat_ingest.py --messages 200 --authors 40 --blocked 0.8
+
+Моделирует поток 100+ сообщений в минуту: очередь держится полной
+(--queue, как AI_QUEUE_MAX_SIZE), доля авторов --blocked на cooldown.
+Каждый шаг — приход нового сообщения и выбор ответа. Работает с Redis
+из .env под отдельным префиксом bench:, после себя ключи удаляет.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from redis_client.bounded_list import BoundedList  # noqa: E402
+from redis_client.chat_ingest_store import ChatIngestStore  # noqa: E402
+from redis_client.redis_manager import RedisManager  # noqa: E402
+
+_PREFIX = "bench:"
+_LEGACY_KEY = f"{_PREFIX}chat_messages_queue"
+
+
+def _message(i: int, authors: int) -> tuple[str, str]:
+    author = f"user{random.randrange(authors)}"
+    payload = json.dumps(
+        {"author": author, "content": f"сообщение {i}", "id": str(i)},
+        ensure_ascii=False,
+    )
+    return author, payload
+
+
+async def _legacy_step(redis, bounded, payload, queue, blocked: set[str]) -> None:
+    """Как _flush_chat_batch до индекса: LRANGE 50, разбор JSON, LREM."""
+    await bounded.push(_LEGACY_KEY, [payload], queue)
+    for raw in await redis.lrange(_LEGACY_KEY, 0, 49):
+        author = json.loads(raw).get("author", "Аноним")
+        if author in blocked:
+            continue
+        if await redis.lrem(_LEGACY_KEY, 1, raw):
+            return
+
+
+async def _indexed_step(store, author, payload, queue, _blocked) -> None:
+    await store.push(author, payload, queue)
+    await store.pop_respondable()
+
+
+async def _total_calls(redis) -> int:
+    stats = await redis.info("commandstats")
+    return sum(int(v.get("calls", 0)) for v in stats.values())
+
+
+async def _measure(label, redis, messages, step) -> None:
+    calls_before = await _total_calls(redis)
+    started = time.perf_counter()
+    for author, payload in messages:
+        await step(author, payload)
+    elapsed = time.perf_counter() - started
+    calls = await _total_calls(redis) - calls_before - 1
+    print(
+        f"{label:<8} {elapsed * 1000 / len(messages):8.3f} мс/сообщение  "
+        f"{calls / len(messages):6.1f} команд/сообщение  "
+        f"{len(messages) * 60 / elapsed:10.0f} сообщений/мин"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--authors", type=int, default=40)
+    parser.add_argument("--queue", type=int, default=50)
+    parser.add_argument("--blocked", type=float, default=0.8)
+    args = parser.parse_args()
+
+    random.seed(7)
+    # Переполнение очереди здесь штатное — без предупреждений на каждое сообщение.
+    logging.getLogger("redis_client").setLevel(logging.ERROR)
+    manager = RedisManager()
+    await manager.connect()
+    redis = manager.redis_client
+    bounded = BoundedList(redis)
+    store = ChatIngestStore(redis, _PREFIX)
+
+    blocked = {
+        f"user{i}" for i in range(int(args.authors * args.blocked))
+    }
+    for author in blocked:
+        await store.mark_responded(author, 3600)
+    # Предзаполнение: очередь в установившемся режиме — полная.
+    warmup = [_message(i, args.authors) for i in range(args.queue)]
+    for author, payload in warmup:
+        await bounded.push(_LEGACY_KEY, [payload], args.queue)
+        await store.push(author, payload, args.queue)
+    messages = [_message(i, args.authors) for i in range(args.messages)]
+
+    try:
+        await _measure(
+            "legacy",
+            redis,
+            messages,
+            lambda a, p: _legacy_step(redis, bounded, p, args.queue, blocked),
+        )
+        await _measure(
+            "indexed",
+            redis,
+            messages,
+            lambda a, p: _indexed_step(store, a, p, args.queue, blocked),
+        )
+    finally:
+        keys = [key async for key in redis.scan_iter(match=f"{_PREFIX}*")]
+        if keys:
+            await redis.delete(*keys)
+        await manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Сравнение прохода цикла управления: отдельные GET/EXISTS/LLEN против ControlSnapshot.
+
+    python scripts/bench_control_snapshot.py --iterations 500
+
+Работает с Redis из .env (REDIS_HOST/PORT/DB); данные не изменяет.
+Печатает среднее время прохода и число команд Redis на проход (INFO commandstats).
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.chat_queue import has_actionable_chat_messages  # noqa: E402
+from redis_client.control_snapshot import ControlSnapshotReader  # noqa: E402
+from redis_client.prepared_monologue_store import PreparedMonologueStore  # noqa: E402
+from redis_client.redis_manager import RedisManager  # noqa: E402
+from redis_client.topic_control_store import TopicControlStore  # noqa: E402
+
+
+async def _legacy_pass(
+    manager: RedisManager,
+    topics: TopicControlStore,
+    prepared: PreparedMonologueStore,
+) -> None:
+    """Те же чтения, что делал один проход PodcastGenerator.run до snapshot."""
+    await manager.get_stream_epoch()
+    rev = await topics.get_topic_revision()
+    await topics.get_pending_topic()
+    await topics.get_topic_revision()
+    await prepared.peek(rev)
+    await topics.get_topic_revision()
+    await prepared.peek(rev)
+    await manager.get_podcast_messages_queue_length()
+    await has_actionable_chat_messages(manager)
+    await manager.is_chat_processing()
+    await manager.get_chat_messages_queue_length()
+    await topics.get_topic_revision()
+    await has_actionable_chat_messages(manager)
+    await manager.get_podcast_messages_queue_length()
+    await manager.is_tts_busy()
+    await topics.is_manual_topic_active()
+
+
+async def _total_calls(manager: RedisManager) -> int:
+    stats = await manager.redis_client.info("commandstats")
+    return sum(int(v.get("calls", 0)) for v in stats.values())
+
+
+async def _measure(label: str, manager: RedisManager, iterations: int, step) -> None:
+    calls_before = await _total_calls(manager)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await step()
+    elapsed = time.perf_counter() - started
+    # Сам INFO тоже считается командой — вычитаем его.
+    calls = await _total_calls(manager) - calls_before - 1
+    print(
+        f"{label:<10} {elapsed * 1000 / iterations:8.3f} мс/проход  "
+        f"{calls / iterations:6.1f} команд/проход  "
+        f"{iterations / elapsed:8.1f} проходов/с"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+
+    manager = RedisManager()
+    await manager.connect()
+    topics = TopicControlStore(manager.redis_client)
+    prepared = PreparedMonologueStore(manager.redis_client)
+    reader = ControlSnapshotReader(manager)
+    try:
+        await _measure(
+            "legacy",
+            manager,
+            args.iterations,
+            lambda: _legacy_pass(manager, topics, prepared),
+        )
+        await _measure("snapshot", manager, args.iterations, reader.read)
+    finally:
+        await manager.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,466 @@
+"""
+Разбор страниц Wikiquote: CPU на извлечение цитат без кэша и из кэша цитат.
+
+    python scripts/bench_quote_extraction.py
+    python scripts/bench_quote_extraction.py --titles "Фаина Раневская,Марк Твен"
+    python scripts/bench_quote_extraction.py --titles "Марк Твен" --save-fixtures output/wikiquote_fixtures
+
+По умолчанию страницы берутся из scripts/fixtures/wikiquote: сокращённые
+страницы в разметке action=parse с теми же конструкциями, что встречаются на
+ru.wikiquote.org (вложенные разделы, сноски, плашки, источники под цитатой),
+плюс одна сгенерированная полноразмерная страница (--generated, ~150 КБ,
+детерминированная) — на маленьких страницах разбор разметки не виден за
+фильтрами. Это не настоящие страницы: настоящие добавляются в корпус так
+
+    python scripts/bench_quote_extraction.py --titles "Марк Твен" --save-fixtures scripts/fixtures/wikiquote
+
+С --titles HTML запрашивается через WikiquoteClient (с постоянным кэшем
+ответов — повторный запуск без сети). Для каждой страницы — процессорное
+время прежнего разбора регулярными выражениями (LegacyQuoteExtractor),
+однопроходного сканера разметки (_extract_quotes) и чтения готового списка из
+ParsedQuoteCache во временном файле, в миллисекундах на страницу.
+Расхождения списков цитат печатаются, при них код выхода — 1.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import sys
+import tempfile
+import time
+from html import unescape
+from pathlib import Path
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.logger import logger  # noqa: E402
+from podcast_generator.quote_content_guard import quote_contains_forbidden_content  # noqa: E402
+from podcast_generator.topic_rules import normalize_topic_key  # noqa: E402
+from podcast_generator.wiki_http_cache import ParsedQuoteCache  # noqa: E402
+from podcast_generator.wikiquote_client import ExtractedQuote, WikiquoteClient  # noqa: E402
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures" / "wikiquote"
+
+
+class LegacyQuoteExtractor(WikiquoteClient):
+    """
+    Прежний разбор регулярными выражениями — эталон для сверки сканера.
+    Нормализация и фильтры кандидатов наследуются от WikiquoteClient:
+    отличается только то, как из разметки достаются разделы и кандидаты.
+    """
+
+    _REFERENCE_BLOCK_RE = re.compile(
+        r"<ol[^>]*\breferences\b[^>]*>.*?</ol>",
+        re.IGNORECASE | re.DOTALL,
+    )
+    _REFERENCE_WRAP_RE = re.compile(
+        r'<div[^>]*\bmw-references-wrap\b[^>]*>.*?</div>',
+        re.IGNORECASE | re.DOTALL,
+    )
+    _QUOTES_SECTION_HEADER_RE = re.compile(
+        r"<h2[^>]*>(.*?)</h2>",
+        re.IGNORECASE | re.DOTALL,
+    )
+    _NESTED_SECTION_HEADER_RE = re.compile(
+        r"<h[34][^>]*>(.*?)</h[34]>",
+        re.IGNORECASE | re.DOTALL,
+    )
+    _BR_TAG_RE = re.compile(r"<br\s*/?>", re.IGNORECASE)
+    _TAG_RE = re.compile(r"<[^>]+>")
+    _MAINTENANCE_BLOCK_RES = (
+        re.compile(
+            r"<table[^>]*\bambox\b[^>]*>.*?</table>",
+            re.IGNORECASE | re.DOTALL,
+        ),
+        re.compile(
+            r"<div[^>]*\b(?:hatnote|noprint|mbox)\b[^>]*>.*?</div>",
+            re.IGNORECASE | re.DOTALL,
+        ),
+    )
+
+    @classmethod
+    def _strip_html(cls, fragment: str) -> str:
+        text = cls._BR_TAG_RE.sub(" ", fragment)
+        text = cls._TAG_RE.sub(" ", text)
+        text = unescape(text)
+        return " ".join(text.split())
+
+    @classmethod
+    def _strip_reference_sections(cls, html: str) -> str:
+        html = cls._REFERENCE_WRAP_RE.sub("", html)
+        html = cls._REFERENCE_BLOCK_RE.sub("", html)
+        return html
+
+    @classmethod
+    def _normalize_quote_candidate(cls, raw: str) -> str:
+        return cls._normalize_plain_candidate(cls._strip_html(raw))
+
+    @classmethod
+    def _section_title_plain(cls, header_inner_html: str) -> str:
+        title = cls._strip_html(header_inner_html).strip()
+        return re.sub(r"\s*\[.*$", "", title).strip()
+
+    @classmethod
+    def _split_wiki_sections(cls, html: str) -> list[tuple[str, str]]:
+        matches = list(cls._QUOTES_SECTION_HEADER_RE.finditer(html))
+        sections: list[tuple[str, str]] = []
+        for idx, match in enumerate(matches):
+            title = cls._section_title_plain(match.group(1))
+            start = match.end()
+            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(html)
+            sections.append((title, html[start:end]))
+        return sections
+
+    @classmethod
+    def _split_nested_sections(cls, html: str) -> list[tuple[str, str]]:
+        matches = list(cls._NESTED_SECTION_HEADER_RE.finditer(html))
+        if not matches:
+            return []
+        sections: list[tuple[str, str]] = []
+        if matches[0].start() > 0:
+            preamble = html[: matches[0].start()].strip()
+            if preamble:
+                sections.append(("", preamble))
+        for idx, match in enumerate(matches):
+            title = cls._section_title_plain(match.group(1))
+            start = match.end()
+            end = matches[idx + 1].start() if idx + 1 < len(matches) else len(html)
+            sections.append((title, html[start:end]))
+        return sections
+
+    @classmethod
+    def _collect_from_own_quotes_body(
+        cls,
+        html: str,
+        *,
+        page_title: str,
+    ) -> list[ExtractedQuote]:
+        results: list[ExtractedQuote] = []
+        for title, body in cls._split_nested_sections(html):
+            if title and cls._SKIP_SUBSECTION_RE.match(title.strip().lower()):
+                continue
+            work_title = title.strip() if title and cls._YEAR_SUBSECTION_RE.match(title) else None
+            results.extend(
+                cls._collect_quotes_from_fragment(
+                    body,
+                    page_title=page_title,
+                    work_title=work_title,
+                )
+            )
+        if not results:
+            results.extend(
+                cls._collect_quotes_from_fragment(
+                    html,
+                    page_title=page_title,
+                    work_title=None,
+                )
+            )
+        return results
+
+    @classmethod
+    def _collect_from_book_quotes_body(
+        cls,
+        html: str,
+        *,
+        page_title: str,
+    ) -> list[ExtractedQuote]:
+        results: list[ExtractedQuote] = []
+        nested = cls._split_nested_sections(html)
+        if not nested:
+            return cls._collect_quotes_from_fragment(
+                html,
+                page_title=page_title,
+                work_title=None,
+            )
+        for title, body in nested:
+            if not title:
+                continue
+            work = cls._normalize_work_title(title)
+            if (
+                not work
+                or cls._is_about_person_section(work)
+                or cls._SKIP_SUBSECTION_RE.match(work)
+            ):
+                continue
+            results.extend(
+                cls._collect_quotes_from_fragment(
+                    body,
+                    page_title=page_title,
+                    work_title=work,
+                )
+            )
+        return results
+
+    @classmethod
+    def _strip_maintenance_blocks(cls, html: str) -> str:
+        for pattern in cls._MAINTENANCE_BLOCK_RES:
+            html = pattern.sub("", html)
+        return html
+
+    @classmethod
+    def _focus_quotes_section(cls, html: str) -> str:
+        for title, body in cls._split_wiki_sections(html):
+            if cls._is_own_quotes_section(title):
+                logger.debug("Wikiquote: раздел собственных цитат «%s»", title)
+                return body
+
+        logger.debug("Wikiquote: на странице нет раздела собственных цитат")
+        return ""
+
+    @classmethod
+    def _collect_normalized_candidates(cls, html: str) -> list[str]:
+        candidates: list[str] = []
+        patterns = (
+            r"<li[^>]*>(.*?)</li>",
+            r"<dd[^>]*>(.*?)</dd>",
+            r"<p[^>]*>(.*?)</p>",
+            r"<blockquote[^>]*>(.*?)</blockquote>",
+            r"<td[^>]*>(.*?)</td>",
+        )
+        for pattern in patterns:
+            for match in re.finditer(pattern, html, flags=re.IGNORECASE | re.DOTALL):
+                text = cls._normalize_quote_candidate(match.group(1))
+                if text:
+                    candidates.append(text)
+        return candidates
+
+    @classmethod
+    def _collect_quotes_from_fragment(
+        cls,
+        html: str,
+        *,
+        page_title: str,
+        work_title: str | None,
+    ) -> list[ExtractedQuote]:
+        return cls._filter_candidates(
+            cls._collect_normalized_candidates(html),
+            page_title=page_title,
+            work_title=work_title,
+        )
+
+    @classmethod
+    def extract_quotes(
+        cls, html: str, *, page_title: str = ""
+    ) -> list[ExtractedQuote]:
+        if not html.strip():
+            return []
+
+        html = cls._strip_reference_sections(html)
+        html = cls._strip_maintenance_blocks(html)
+
+        sections = cls._split_wiki_sections(html)
+        results: list[ExtractedQuote] = []
+
+        for title, body in sections:
+            if cls._is_about_person_section(title):
+                continue
+            if cls._is_own_quotes_section(title):
+                results.extend(
+                    cls._collect_from_own_quotes_body(body, page_title=page_title)
+                )
+                continue
+            if cls._is_book_quotes_section(title):
+                results.extend(
+                    cls._collect_from_book_quotes_body(body, page_title=page_title)
+                )
+
+        if not results:
+            focused = cls._focus_quotes_section(html)
+            if focused.strip():
+                results.extend(
+                    cls._collect_from_own_quotes_body(focused, page_title=page_title)
+                )
+        return cls._dedupe_quotes(results)
+
+
+def clear_text_caches() -> None:
+    """Сброс мемоизации нормализации: каждый раунд — холодный разбор."""
+    WikiquoteClient._normalize_plain_candidate.cache_clear()
+    WikiquoteClient._is_skippable.cache_clear()
+    WikiquoteClient._has_quote_substance.cache_clear()
+    quote_contains_forbidden_content.cache_clear()
+    normalize_topic_key.cache_clear()
+
+
+def cpu_ms(func, rounds: int, reset=None) -> float:
+    spent = 0.0
+    for _ in range(rounds):
+        if reset is not None:
+            reset()
+        started = time.process_time()
+        func()
+        spent += time.process_time() - started
+    return spent * 1000 / rounds
+
+
+async def fetch_html(client: WikiquoteClient, titles: list[str]) -> dict[str, str]:
+    pages: dict[str, str] = {}
+    async with aiohttp.ClientSession() as session:
+        for title in titles:
+            data = await client._get_json(
+                session,
+                {"action": "parse", "page": title, "format": "json", "prop": "text|links|revid"},
+            )
+            html = ((data or {}).get("parse", {}).get("text") or {}).get("*")
+            if html:
+                pages[title] = html
+            else:
+                print(f"{title}: страница не получена")
+    return pages
+
+
+def generated_page(quotes: int) -> str:
+    """
+    Полноразмерная страница в разметке action=parse: разделы по годам, ссылки
+    и курсив в цитатах, сноски, источник вложенным списком, раздел «О нём»
+    и список примечаний. Текст детерминирован, все цитаты различны.
+    """
+    words = (
+        "жизнь человек время любовь правда дорога город память счастье работа "
+        "ошибка надежда смелость тишина книга друг свобода совесть мысль утро"
+    ).split()
+    parts = [
+        '<div class="mw-parser-output">',
+        '<table class="metadata plainlinks ambox"><tr><td>Статья требует '
+        "проверки источников.</td></tr></table>",
+        "<p><b>Сгенерированный Автор</b> (1850 — 1920) — писатель.</p>",
+        '<h2><span class="mw-headline" id="Цитаты">Цитаты</span></h2>',
+    ]
+    for index in range(quotes):
+        if index % 50 == 0:
+            year = 1870 + index // 50
+            parts.append(
+                f'<h3><span class="mw-headline" id="{year}">{year}</span></h3><ul>'
+            )
+        a, b, c, d = (words[(index * k + k) % len(words)] for k in (3, 7, 11, 13))
+        parts.append(
+            f'<li>{a.capitalize()} — это <a href="/wiki/{b}" title="{b}">{b}</a>, '
+            f"которую {c} несёт сквозь <i>{d}</i>, и запись {index} "
+            f"это подтверждает.<sup class=\"reference\" id=\"cite_ref-{index}\">"
+            f'<a href="#cite_note-{index}">[{index + 1}]</a></sup>'
+            f"<ul><li><small>— «Сборник {index // 50 + 1}», с. {index + 3}</small>"
+            "</li></ul></li>"
+        )
+        if index % 50 == 49 or index == quotes - 1:
+            parts.append("</ul>")
+    parts.append(
+        '<h2><span class="mw-headline" id="О_нём">О нём</span></h2>'
+        "<ul><li>Современник говорил о нём долго и подробно.</li></ul>"
+        '<h2><span class="mw-headline" id="Примечания">Примечания</span></h2>'
+        '<div class="mw-references-wrap"><ol class="references">'
+    )
+    parts.extend(
+        f'<li id="cite_note-{index}">Сборник {index // 50 + 1}. — М., 1900.</li>'
+        for index in range(quotes)
+    )
+    parts.append("</ol></div></div>")
+    return "".join(parts)
+
+
+def load_fixtures(directory: Path) -> dict[str, str]:
+    return {
+        path.stem: path.read_text(encoding="utf-8")
+        for path in sorted(directory.glob("*.html"))
+    }
+
+
+def _save_fixtures(directory: Path, pages: dict[str, str]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    for title, html in pages.items():
+        (directory / f"{title.replace('/', '_')}.html").write_text(html, encoding="utf-8")
+    print(f"Сохранено страниц: {len(pages)} в {directory}")
+
+
+def _report_mismatch(
+    title: str, expected: list[ExtractedQuote], actual: list[ExtractedQuote]
+) -> bool:
+    old = [(q.text, q.work_title) for q in expected]
+    new = [(q.text, q.work_title) for q in actual]
+    if old == new:
+        return False
+    print(f"  {title}: расхождение ({len(old)} → {len(new)})")
+    for text, work in [q for q in old if q not in new][:3]:
+        print(f"    - [{work}] {text[:100]}")
+    for text, work in [q for q in new if q not in old][:3]:
+        print(f"    + [{work}] {text[:100]}")
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", help="страницы через запятую вместо сохранённых")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--fixtures", type=Path, default=FIXTURES_DIR, help="каталог с сохранёнными *.html"
+    )
+    parser.add_argument("--save-fixtures", type=Path, help="сохранить полученный HTML")
+    parser.add_argument(
+        "--generated",
+        type=int,
+        default=600,
+        help="цитат на сгенерированной странице (0 — без неё)",
+    )
+    args = parser.parse_args()
+
+    client = WikiquoteClient()
+    if args.titles:
+        titles = [t.strip() for t in args.titles.split(",") if t.strip()]
+        pages = asyncio.run(fetch_html(client, titles))
+    else:
+        pages = load_fixtures(args.fixtures)
+    if args.save_fixtures:
+        _save_fixtures(args.save_fixtures, pages)
+    if args.generated > 0:
+        pages[f"(сгенерированная, {args.generated} цитат)"] = generated_page(args.generated)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParsedQuoteCache(str(Path(tmp) / "quotes.sqlite3"), client.EXTRACTOR_VERSION)
+        total_regex = total_cold = total_cached = 0.0
+        mismatches = 0
+        for title, html in pages.items():
+            quotes = client._extract_quotes(html, page_title=title)
+            reference = LegacyQuoteExtractor.extract_quotes(html, page_title=title)
+            cache._store(title, title, 1, [(q.text, q.work_title) for q in quotes])
+
+            def cached() -> list[ExtractedQuote]:
+                entry = cache._lookup(title)
+                return [ExtractedQuote(text=t, work_title=w) for t, w in entry.quotes]
+
+            regex_ms = cpu_ms(
+                lambda: LegacyQuoteExtractor.extract_quotes(html, page_title=title),
+                args.rounds,
+                clear_text_caches,
+            )
+            cold_ms = cpu_ms(
+                lambda: client._extract_quotes(html, page_title=title),
+                args.rounds,
+                clear_text_caches,
+            )
+            cached_ms = cpu_ms(cached, args.rounds)
+            total_regex += regex_ms
+            total_cold += cold_ms
+            total_cached += cached_ms
+            print(
+                f"{title[:40]:<40} {len(html) // 1024:5d} КБ  {len(quotes):3d} цитат  "
+                f"regex {regex_ms:8.2f} мс  скан {cold_ms:8.2f} мс  "
+                f"кэш {cached_ms:6.3f} мс"
+            )
+            mismatches += _report_mismatch(title, reference, quotes)
+        if pages:
+            count = len(pages)
+            print(
+                f"{'среднее на страницу':<40} regex {total_regex / count:8.2f} мс  "
+                f"скан {total_cold / count:8.2f} мс  "
+                f"кэш {total_cached / count:6.3f} мс  "
+                f"(x{total_regex / max(total_cold, 1e-9):.1f})"
+            )
+            print(f"Совпало страниц: {count - mismatches} из {count}")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
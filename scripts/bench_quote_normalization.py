@@ -0,0 +1,637 @@
+"""
+Микро-бенчмарки нормализации и фильтров цитат на сохранённых страницах Wikiquote.
+
+    python scripts/bench_quote_normalization.py
+    python scripts/bench_quote_normalization.py --titles "Фаина Раневская,Марк Твен"
+
+Кандидаты — текстовые блоки разделов страниц (как их отдаёт QuoteHtmlScanner).
+Для каждого шага — микросекунды CPU на кандидата: «было» — прежние функции со
+строковыми re.sub/re.search и IGNORECASE (LegacyNormalizer и legacy_* ниже),
+«холодно» — текущие с пустыми кэшами, «тепло» — повторный проход по тем же
+текстам, как при перепроверке страницы или пула. Результаты прежних и текущих
+функций сверяются, при расхождении код выхода — 1. Страницы — те же, что у
+bench_quote_extraction.py: scripts/fixtures/wikiquote и сгенерированная
+полноразмерная страница (--generated), с --titles — через WikiquoteClient.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bench_quote_extraction import (  # noqa: E402
+    FIXTURES_DIR,
+    clear_text_caches,
+    cpu_ms,
+    fetch_html,
+    generated_page,
+    load_fixtures,
+)
+from transliterate import translit  # noqa: E402
+
+from core.utils import transliterate_and_replace_symbols  # noqa: E402
+from podcast_generator.quote_content_guard import quote_contains_forbidden_content  # noqa: E402
+from podcast_generator.quote_html import scan_quote_html  # noqa: E402
+from podcast_generator.topic_rules import normalize_topic_key  # noqa: E402
+from podcast_generator.wikiquote_client import WikiquoteClient  # noqa: E402
+
+
+_LEGACY_FORBIDDEN_QUOTE_RE = re.compile(
+    r"(?:"
+    r"путин\w*|"
+    r"украин\w*|"
+    r"\bвойн\w*|"
+    r"донбас\w*|донецк|луганск|"
+    r"крым\w*|севастопол|"
+    r"санкци\w*|"
+    r"сепаратист\w*|"
+    r"спецоперац\w*|"
+    r"мобилизац\w*|"
+    r"зеленск\w*|"
+    r"навальн\w*|"
+    r"лукашенко|"
+    r"меркел\w*|"
+    r"байден|трамп|"
+    r"\bнато\b|nato|"
+    r"кремл\w*|"
+    r"оккупац\w*|"
+    r"аннекси\w*|"
+    r"обстрел\w*|"
+    r"артиллери\w*|"
+    r"фронт\w*|"
+    r"геноцид|"
+    r"бахмут|мариупол\w*|херсон|запорож\w*|"
+    r"референдум\w*|"
+    r"госпереворот|государственн\w+\s+переворот|"
+    r"депутат\w*\s+госдум|госдум\w*|"
+    r"министр\w*\s+обороны|"
+    r"президент\w*\s+росси|"
+    r"премьер[\s-]?министр\s+росси"
+    r")",
+    re.IGNORECASE | re.UNICODE,
+)
+_LEGACY_WAR_AND_PEACE_RE = re.compile(r"войн[аы]\s+и\s+мир", re.IGNORECASE | re.UNICODE)
+
+
+def legacy_quote_contains_forbidden_content(text: str) -> bool:
+    if not text or not text.strip():
+        return False
+    lowered = text.lower()
+    if _LEGACY_WAR_AND_PEACE_RE.search(lowered):
+        return False
+    return bool(_LEGACY_FORBIDDEN_QUOTE_RE.search(text))
+
+
+def legacy_normalize_topic_key(topic: str) -> str:
+    text = topic.lower().strip()
+    text = re.sub(r"[^\w\sа-яё]", " ", text, flags=re.IGNORECASE)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def legacy_transliterate_and_replace_symbols(text):
+    symbol_map = {
+        "_": " ",
+    }
+
+    def replace_symbols(match):
+        ch = match.group(0)
+        return symbol_map.get(ch, ch)
+
+    text = re.sub(r'[_.,!?:;\-\(\)"\'/@#$%&*+=<>\[\]{}^`~|]', replace_symbols, text)
+    text = translit(text, "ru")
+    return text
+
+
+def _ignorecase(pattern: re.Pattern) -> re.Pattern:
+    return re.compile(pattern.pattern, pattern.flags | re.IGNORECASE)
+
+
+class LegacyNormalizer(WikiquoteClient):
+    """
+    Нормализация и фильтры кандидатов до компиляции шаблонов: выражения
+    собираются строкой на каждом вызове, словарные шаблоны — с IGNORECASE
+    по исходному тексту, без мемоизации. Остальное наследуется.
+    """
+
+    _BIBLIOGRAPHY_RE = _ignorecase(WikiquoteClient._BIBLIOGRAPHY_RE)
+    _SOURCE_LABEL_RE = _ignorecase(WikiquoteClient._SOURCE_LABEL_RE)
+    _DATE_IN_TEXT_RE = _ignorecase(WikiquoteClient._DATE_IN_TEXT_RE)
+    _ATTRIBUTION_CONTEXT_RE = _ignorecase(WikiquoteClient._ATTRIBUTION_CONTEXT_RE)
+    _ENCYCLOPEDIA_TAIL_RE = _ignorecase(WikiquoteClient._ENCYCLOPEDIA_TAIL_RE)
+    _BIOGRAPHY_ABOUT_RE = _ignorecase(WikiquoteClient._BIOGRAPHY_ABOUT_RE)
+    _WIKI_STUB_RE = _ignorecase(WikiquoteClient._WIKI_STUB_RE)
+
+    @classmethod
+    def _letter_count(cls, text: str) -> int:
+        return len(re.sub(r"[^a-zA-Zа-яёА-ЯЁ]", "", text))
+
+    @classmethod
+    def _clean_quote_text(cls, text: str) -> str:
+        text = cls._FOOTNOTE_MARKER_RE.sub("", text)
+        text = cls._WIKI_OMISSION_RE.sub(" ", text)
+        text = re.sub(r"\(там же\)", "", text, flags=re.IGNORECASE)
+        text = re.sub(r"[\u200b-\u200d\ufeff]", "", text)
+        text = re.sub(r"\s+", " ", text).strip(" .—-")
+        return text.strip()
+
+    @classmethod
+    def _trim_quote_length(cls, text: str, max_chars: int) -> str:
+        if len(text) <= max_chars:
+            return text
+        cut = text[:max_chars]
+        for sep in (". ", "! ", "? ", "… ", "; "):
+            idx = cut.rfind(sep)
+            if idx >= int(max_chars * 0.45):
+                return cut[: idx + 1].strip()
+        cut = cut.strip()
+        while len(cut) > 40:
+            if re.search(r"[.!?…]$", cut):
+                break
+            if re.search(r"\b\d{1,4}$", cut) or re.search(
+                r"\b(?:в|на|по|при|до|после|телефону|"
+                r"январ[ея]|феврал[ея]|март[ае]?|апрел[ея]|ма[йя]|"
+                r"июн[ея]|июл[ея]|август[ае]?|сентябр[ея]|"
+                r"октябр[ея]|ноябр[ея]|декабр[ея])\s+\w*$",
+                cut,
+                re.I,
+            ):
+                cut = re.sub(r"\s+\S+$", "", cut).strip()
+                continue
+            break
+        idx = cut.rfind(", ")
+        if idx >= int(max_chars * 0.5) and not re.search(r"[.!?…]$", cut):
+            cut = cut[:idx].strip()
+        if len(cut) < 40:
+            return ""
+        return cut.rstrip("—-,:; ") + "…"
+
+    @classmethod
+    def _strip_trailing_source_marks(cls, text: str) -> str:
+        text = cls._clean_quote_text(text)
+        text = re.sub(r"[»«]+\s*$", "", text).strip()
+        text = re.sub(r"^[«»]+\s*", "", text).strip()
+        while True:
+            text = re.sub(r"\s*—+\s*$", "", text).strip()
+            if " — " not in text:
+                break
+            body, tail = text.rsplit(" — ", 1)
+            body = body.strip()
+            tail = tail.strip().strip("«».")
+            if body and (
+                cls._looks_like_source_tail(tail)
+                or cls._CHAPTER_TAIL_RE.match(tail.lower())
+                or cls._looks_like_attribution_name(tail)
+            ):
+                text = body
+                continue
+            break
+        return cls._clean_quote_text(text)
+
+    @classmethod
+    def _finalize_quote_text(cls, text: str) -> str:
+        text = cls._clean_quote_text(text)
+        if not text:
+            return ""
+        text = re.sub(r"^…\s+", "", text)
+        text = re.sub(r"\s+…\s+", " ", text)
+        text = cls._strip_trailing_source_marks(text)
+        while cls._PAGE_REF_TAIL_RE.search(text):
+            text = cls._PAGE_REF_TAIL_RE.sub("", text).strip()
+        text = text.replace("«", "").replace("»", "").strip()
+        if cls._DATE_PHRASE_RE.match(text.strip()):
+            return ""
+        return cls._clean_quote_text(text)
+
+    @classmethod
+    def _looks_like_source_tail(cls, text: str) -> bool:
+        text = text.strip().strip("«»\"'.")
+        if not text:
+            return True
+
+        lowered = text.lower()
+        if cls._DATE_PHRASE_RE.match(lowered):
+            return True
+        if cls._ATTRIBUTION_CONTEXT_RE.match(lowered):
+            return True
+        if cls._BIBLIOGRAPHY_RE.search(text):
+            return True
+        if cls._DATE_IN_TEXT_RE.search(text) and len(text) < 80:
+            return True
+        if len(text) < 60 and lowered.startswith(("из ", "в ", "к ", "при ")):
+            return True
+        if re.fullmatch(r"«[^»]{1,80}»(?:\s*,\s*\d{4})?", text):
+            return True
+        if cls._looks_like_byline_attribution(text):
+            return True
+        if cls._CHAPTER_TAIL_RE.match(lowered):
+            return True
+        if cls._ENCYCLOPEDIA_TAIL_RE.search(lowered):
+            return True
+        if re.search(r"^(?:заявлени|комментари|реплик)", lowered):
+            return True
+        if len(text) > 50 and not re.search(r"[.!?…]", text):
+            if re.search(
+                r"традици|молитва|известн|употребл|литературн|православн",
+                lowered,
+            ):
+                return True
+        return False
+
+    @classmethod
+    def _looks_like_narrative_excerpt(cls, text: str) -> bool:
+        lowered = text.lower()
+        if lowered.count(" — ") >= 3:
+            return True
+        if re.search(r"\bговорил[а]?\s+\w+", lowered):
+            return True
+        if re.search(r"\bсказал[а]?\s+\w+", lowered) and lowered.count(" — ") >= 2:
+            return True
+        return False
+
+    @classmethod
+    def _normalize_plain_candidate(cls, text: str) -> str:
+        text = cls._clean_quote_text(text)
+        if not text:
+            return ""
+
+        text = re.sub(r"^—\s*", "", text).strip()
+
+        guillemets = re.findall(r"«([^»]+)»", text)
+        if guillemets and len(guillemets) == 1:
+            inner = guillemets[0].strip()
+            outer = re.sub(r"«[^»]+»", "", text).strip(" .—-")
+            if outer and cls._looks_like_source_tail(inner) and len(outer) >= 15:
+                text = outer
+            elif not outer and not cls._looks_like_source_tail(inner):
+                text = inner
+            elif outer and len(outer) >= len(inner):
+                text = outer
+            else:
+                text = max(guillemets, key=len).strip()
+
+        if " — " in text:
+            body, tail = text.rsplit(" — ", 1)
+            body = body.strip().strip("«»")
+            tail = tail.strip().strip("«».")
+            if body and tail:
+                if cls._looks_like_inline_attribution(tail) and len(body) >= 10:
+                    text = body
+                elif cls._looks_like_inline_attribution(body) and len(tail) >= 20:
+                    text = tail
+
+        return cls._finalize_quote_text(text)
+
+    @classmethod
+    def _looks_like_byline_attribution(cls, text: str) -> bool:
+        text = text.strip().strip("«»\"'")
+        if not text:
+            return True
+        if cls._BYLINE_ATTRIBUTION_RE.match(text):
+            return True
+        lowered = text.lower()
+        if re.search(
+            r"корреспондент|журналист|редактор|обозреватель|публицист",
+            lowered,
+        ):
+            if re.search(r"\d{4}", text) and len(text) < 120:
+                return True
+        return False
+
+    @classmethod
+    def _looks_like_bio_about_person(cls, text: str, page_title: str = "") -> bool:
+        if cls._BIOGRAPHY_ABOUT_RE.search(text):
+            return True
+
+        lowered = text.lower()
+        encyclopedic = (
+            "считается",
+            "является",
+            "родился",
+            "родилась",
+            "умер",
+            "умерла",
+            "известен",
+            "известна",
+            "классиком",
+            "выдающимся",
+            "творчество",
+            "оказало влияние",
+            "оказал влияние",
+            "на родине",
+        )
+        if not any(marker in lowered for marker in encyclopedic):
+            return False
+
+        if page_title:
+            name = page_title.strip().lower()
+            if name and lowered.startswith(name):
+                return True
+            parts = [part for part in name.split() if len(part) >= 4]
+            if parts and lowered.startswith(parts[0]):
+                return True
+
+        if len(text) > 80 and any(
+            pronoun in f" {lowered} "
+            for pronoun in (" он ", " она ", " его ", " её ", " ему ", " ей ")
+        ):
+            if " я " not in f" {lowered} " and " мы " not in f" {lowered} ":
+                return True
+
+        return False
+
+    @classmethod
+    def _looks_like_attribution_name(cls, text: str) -> bool:
+        text = text.strip()
+        if len(text) < 12 or len(text) > 90:
+            return False
+        if re.search(r"[«»\"!?.;:()]", text):
+            return False
+        if re.search(r"\d{3,4}", text):
+            return False
+
+        words = text.split()
+        if len(words) < 2 or len(words) > 7:
+            return False
+
+        lowered = f" {text.lower()} "
+        sentence_markers = (
+            " что ", " как ", " это ", " не ", " и ", " в ", " на ", " о ",
+            " я ", " мы ", " вы ", " он ", " она ", " быть ", " если ",
+            " когда ", " где ", " который ", " которая ", " потому ", " также ",
+        )
+        if any(marker in lowered for marker in sentence_markers):
+            return False
+
+        name_like = 0
+        for word in words:
+            if cls._NAME_TOKEN_RE.match(word):
+                if word[0].isupper() or word.lower().startswith(("аль-", "ибн-")):
+                    name_like += 1
+        return name_like >= len(words) - 1
+
+    @classmethod
+    def _looks_like_source_label(cls, text: str) -> bool:
+        text = text.strip().strip("«»\"'")
+        if not text:
+            return True
+
+        lowered = text.lower()
+        if cls._SOURCE_LABEL_RE.search(lowered):
+            return True
+        if cls._ATTRIBUTION_CONTEXT_RE.match(lowered.strip().lstrip("— ")):
+            return True
+
+        source_words = (
+            "речь",
+            "выступление",
+            "доклад",
+            "интервью",
+            "заявление",
+            "комментарий",
+            "письмо",
+            "статья",
+            "записка",
+            "предисловие",
+            "послание",
+            "обращение",
+            "вступительное слово",
+            "заключительное слово",
+            "фрагмент",
+            "отрывок",
+            "годовщина",
+            "съезд",
+            "конференц",
+            "собрание",
+            "заседание",
+        )
+        has_source_word = any(word in lowered for word in source_words)
+        has_date = bool(cls._DATE_IN_TEXT_RE.search(text))
+
+        if has_source_word and has_date and len(text) < 120:
+            return True
+        if has_source_word and len(text) < 55:
+            return True
+        if has_date and len(text) < 45 and not re.search(r"[!?…]", text):
+            return True
+
+        return False
+
+    @classmethod
+    def _has_quote_substance(cls, text: str) -> bool:
+        if cls._looks_like_source_label(text):
+            return False
+        if cls._looks_like_attribution_name(text):
+            return False
+        if cls._looks_like_source_tail(text):
+            return False
+        if cls._looks_like_byline_attribution(text):
+            return False
+
+        if cls._letter_count(text) < 20:
+            return False
+
+        stripped = re.sub(r"[«»\"'….\s\-—]+", "", text)
+        if len(stripped) < 12:
+            return False
+
+        lowered = text.lower().strip()
+        if lowered.startswith(("о ", "об ", "при ", "из ", "в ", "к ")) and len(text) < 80:
+            return False
+        if re.search(r"[!?]", text):
+            return True
+
+        words = [word for word in re.split(r"\s+", text.strip()) if word]
+        if len(words) >= 8:
+            return True
+
+        verb_markers = (
+            " что ", " как ", " это ", " не ", " я ", " мы ", " вы ",
+            " он ", " она ", " они ", " быть ", " если ", " когда ",
+            " где ", " который ", " которая ", " потому ", " также ",
+            " нужно ", " можно ", " должен ", " должна ", " будет ",
+            " было ", " были ", " есть ", " нет ", " всегда ", " никогда ",
+        )
+        padded = f" {lowered} "
+        if any(marker in padded for marker in verb_markers):
+            return True
+
+        return len(text) >= 45 and len(words) >= 5
+
+    @classmethod
+    def _is_skippable(cls, text: str, *, page_title: str = "") -> bool:
+        lowered = text.lower().strip()
+        if legacy_quote_contains_forbidden_content(text):
+            return True
+        if len(text) < 20:
+            return True
+        if lowered.startswith("↑") or "↑" in text[:12]:
+            return True
+        if lowered.startswith("см.") or lowered.startswith("см "):
+            return True
+        if cls._BIBLIOGRAPHY_RE.search(text):
+            return True
+        if cls._LEAD_DEFINITION_RE.match(text):
+            return True
+        if cls._looks_like_bio_about_person(text, page_title):
+            return True
+        if cls._WIKI_STUB_RE.search(text):
+            return True
+        if cls._BIO_DATE_RE.search(text) and len(text) > 180:
+            return True
+        if len(text) > 260 and any(
+            word in lowered
+            for word in (
+                "родился",
+                "родилась",
+                "умер",
+                "умерла",
+                "великий русский",
+                "британский государственный",
+                "премьер-министр",
+                "деятель",
+                "писатель",
+                "поэт",
+            )
+        ):
+            return True
+        if re.match(r"^[\w«»\s\-]+ — (?:старая|старый|город|фильм|книга)\b", lowered):
+            return True
+        if any(marker in lowered for marker in cls._SKIP_MARKERS):
+            return True
+        if cls._looks_like_attribution_name(text):
+            return True
+        if cls._looks_like_source_label(text):
+            return True
+        if cls._looks_like_source_tail(text):
+            return True
+        if cls._looks_like_byline_attribution(text):
+            return True
+        if cls._looks_like_narrative_excerpt(text):
+            return True
+        if cls._looks_like_prayer_quote(text):
+            return True
+        return False
+
+
+def _candidates(pages: dict[str, str]) -> list[tuple[str, str]]:
+    """(заголовок страницы, текст блока) по всем разделам."""
+    return [
+        (title, block.text)
+        for title, html in pages.items()
+        for block in scan_quote_html(html).blocks
+    ]
+
+
+def _steps(candidates: list[tuple[str, str]]):
+    """Шаг → (прежняя реализация, текущая); обе возвращают список результатов."""
+    old, new = LegacyNormalizer, WikiquoteClient
+    texts = [text for _title, text in candidates]
+    normalized = [new._normalize_plain_candidate(text) for text in texts]
+    quotes = [
+        (title, text)
+        for (title, _raw), text in zip(candidates, normalized)
+        if text
+    ]
+    plain = [text for _title, text in quotes]
+    return {
+        "normalize": (
+            lambda: [old._normalize_plain_candidate(t) for t in texts],
+            lambda: [new._normalize_plain_candidate(t) for t in texts],
+        ),
+        "is_skippable": (
+            lambda: [old._is_skippable(t, page_title=p) for p, t in quotes],
+            lambda: [new._is_skippable(t, page_title=p) for p, t in quotes],
+        ),
+        "forbidden": (
+            lambda: [legacy_quote_contains_forbidden_content(t) for t in plain],
+            lambda: [quote_contains_forbidden_content(t) for t in plain],
+        ),
+        "substance": (
+            lambda: [old._has_quote_substance(t) for t in plain],
+            lambda: [new._has_quote_substance(t) for t in plain],
+        ),
+        "trim_length": (
+            lambda: [old._trim_quote_length(t, 240) for t in plain],
+            lambda: [new._trim_quote_length(t, 240) for t in plain],
+        ),
+        "strip_source": (
+            lambda: [old._strip_trailing_source_marks(t) for t in plain],
+            lambda: [new._strip_trailing_source_marks(t) for t in plain],
+        ),
+        "letter_count": (
+            lambda: [old._letter_count(t) for t in plain],
+            lambda: [new._letter_count(t) for t in plain],
+        ),
+        "topic_key": (
+            lambda: [legacy_normalize_topic_key(t[:80]) for t in plain],
+            lambda: [normalize_topic_key(t[:80]) for t in plain],
+        ),
+        "transliterate": (
+            lambda: [legacy_transliterate_and_replace_symbols(t[:80]) for t in plain],
+            lambda: [transliterate_and_replace_symbols(t[:80]) for t in plain],
+        ),
+    }, len(texts), len(plain)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--titles", help="страницы через запятую вместо сохранённых")
+    parser.add_argument(
+        "--fixtures", type=Path, default=FIXTURES_DIR, help="каталог с сохранёнными *.html"
+    )
+    parser.add_argument(
+        "--generated",
+        type=int,
+        default=600,
+        help="цитат на сгенерированной странице (0 — без неё)",
+    )
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.titles:
+        titles = [t.strip() for t in args.titles.split(",") if t.strip()]
+        pages = asyncio.run(fetch_html(WikiquoteClient(), titles))
+    else:
+        pages = load_fixtures(args.fixtures)
+    if args.generated > 0:
+        pages[f"(сгенерированная, {args.generated} цитат)"] = generated_page(args.generated)
+    if not pages:
+        print("Нет страниц для замера")
+        return
+
+    steps, raw_count, quote_count = _steps(_candidates(pages))
+    print(f"Страниц: {len(pages)}, блоков: {raw_count}, после нормализации: {quote_count}")
+    mismatches = 0
+    total_old = total_cold = 0.0
+    for name, (old, new) in steps.items():
+        count = raw_count if name == "normalize" else quote_count
+        clear_text_caches()
+        expected, actual = old(), new()
+        if expected != actual:
+            mismatches += 1
+            diff = sum(1 for left, right in zip(expected, actual) if left != right)
+            print(f"{name:<16} расхождение: {diff} из {len(expected)}")
+        before = cpu_ms(old, args.rounds) * 1000 / max(count, 1)
+        cold = cpu_ms(new, args.rounds, clear_text_caches) * 1000 / max(count, 1)
+        new()
+        warm = cpu_ms(new, args.rounds) * 1000 / max(count, 1)
+        total_old += before * count
+        total_cold += cold * count
+        print(
+            f"{name:<16} было {before:8.2f} мкс  холодно {cold:8.2f} мкс  "
+            f"тепло {warm:8.2f} мкс  (x{before / max(cold, 1e-9):.1f})"
+        )
+    print(
+        f"{'все шаги':<16} было {total_old / 1000:8.2f} мс  "
+        f"холодно {total_cold / 1000:8.2f} мс  (x{total_old / max(total_cold, 1e-9):.1f})"
+    )
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Режимы движка Silero (TTS_ENGINE_MODE): скорость и похожесть звучания на float.
+
+    python scripts/bench_tts_engine.py --modes float,int8,frozen,int8_frozen
+
+Для каждого режима — RTF (время синтеза / длительность звука, меньше — быстрее)
+и сходство с float: косинус лог-спектрограмм, выровненных по времени, и
+отношение длительностей. Ниже ~0.9 по сходству на слух уже заметно.
+Кэш звука выключен; потоки torch — как в рабочем режиме (TTS_TORCH_THREADS).
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config import Config  # noqa: E402
+
+_SENTENCES = [
+    "Следующая тема: Фаина Раневская.",
+    "Она говорила, что талант — это как прыщ: может вскочить на любой физиономии.",
+    "Актриса не терпела фальши ни на сцене, ни в жизни.",
+    "Одиночество — это состояние, о котором некому рассказать.",
+]
+
+
+def _log_spectrogram(audio: np.ndarray, n_fft: int = 1024, hop: int = 256) -> np.ndarray:
+    if audio.size < n_fft:
+        audio = np.pad(audio, (0, n_fft - audio.size))
+    count = 1 + (audio.size - n_fft) // hop
+    frames = np.lib.stride_tricks.as_strided(
+        audio,
+        shape=(count, n_fft),
+        strides=(audio.strides[0] * hop, audio.strides[0]),
+    )
+    return np.log1p(np.abs(np.fft.rfft(frames * np.hanning(n_fft), axis=1)))
+
+
+def _similarity(reference: np.ndarray, candidate: np.ndarray) -> float:
+    ref = _log_spectrogram(reference)
+    cand = _log_spectrogram(candidate)
+    frames = min(len(ref), len(cand))
+    ref = ref[np.linspace(0, len(ref) - 1, frames).astype(int)].ravel()
+    cand = cand[np.linspace(0, len(cand) - 1, frames).astype(int)].ravel()
+    ref = ref - ref.mean()
+    cand = cand - cand.mean()
+    denominator = np.linalg.norm(ref) * np.linalg.norm(cand)
+    return float(ref @ cand / denominator) if denominator else 0.0
+
+
+def _run_mode(mode: str, rounds: int) -> tuple[str, float, list[np.ndarray]]:
+    from speech.speech_synthesizer import SpeechSynthesizer
+
+    SpeechSynthesizer._instance = None
+    Config.TTS_ENGINE_MODE = mode
+    synthesizer = SpeechSynthesizer()
+    synthesizer._synthesize_audio(_SENTENCES[0])
+    elapsed = 0.0
+    samples = 0
+    outputs: list[np.ndarray] = []
+    for _ in range(rounds):
+        outputs = []
+        for text in _SENTENCES:
+            started = time.perf_counter()
+            audio = synthesizer._synthesize_audio(text)
+            elapsed += time.perf_counter() - started
+            samples += audio.size
+            outputs.append(audio)
+    return synthesizer.engine_mode, elapsed * synthesizer.sample_rate / samples, outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modes", default="float,int8,frozen,int8_frozen")
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args()
+
+    Config.TTS_AUDIO_CACHE_MEMORY_MB = 0
+    Config.TTS_AUDIO_CACHE_DISK_MB = 0
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    if "float" in modes:
+        modes.remove("float")
+    _actual, float_rtf, reference = _run_mode("float", args.rounds)
+    print(f"{'float':<12} RTF {float_rtf:6.3f}  сходство 1.000  длительность 1.000")
+    for mode in modes:
+        actual, rtf, outputs = _run_mode(mode, args.rounds)
+        if actual != mode:
+            print(f"{mode:<12} недоступен (включился {actual})")
+            continue
+        similarity = np.mean([_similarity(r, o) for r, o in zip(reference, outputs)])
+        duration = sum(o.size for o in outputs) / sum(r.size for r in reference)
+        print(
+            f"{mode:<12} RTF {rtf:6.3f}  сходство {similarity:5.3f}  "
+            f"длительность {duration:5.3f}  ускорение x{float_rtf / rtf:4.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
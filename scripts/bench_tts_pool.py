@@ -0,0 +1,72 @@
+"""
+Масштабирование синтеза: потоки над одной моделью против пула процессов.
+
+    python scripts/bench_tts_pool.py --workers 1,2,4 --sentences 16
+
+Для каждого N — N параллельных запросов: сначала N потоков над одной моделью
+(TTS_WORKER_BACKEND=thread), затем пул из N процессов с shared memory.
+Печатает символы в секунду настенного времени; на многоядерной машине
+пул должен расти почти линейно, потоки — упираться в GIL и общую модель.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config import Config  # noqa: E402
+
+_SENTENCES = [
+    "Она говорила, что талант — это как прыщ: может вскочить на любой физиономии.",
+    "Актриса не терпела фальши ни на сцене, ни в жизни.",
+    "Одиночество — это состояние, о котором некому рассказать.",
+    "Продолжим разбор цитат.",
+]
+
+
+def _throughput(synthesize, texts: list[str], parallel: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=parallel) as executor:
+        list(executor.map(synthesize, texts))
+    return sum(len(t) for t in texts) / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--sentences", type=int, default=16)
+    args = parser.parse_args()
+
+    Config.TTS_AUDIO_CACHE_MEMORY_MB = 0
+    Config.TTS_AUDIO_CACHE_DISK_MB = 0
+    from speech.speech_synthesizer import SpeechSynthesizer
+    from speech.tts_process_pool import TtsProcessPool
+
+    texts = [_SENTENCES[i % len(_SENTENCES)] for i in range(args.sentences)]
+    counts = [int(n) for n in args.workers.split(",") if n.strip()]
+
+    Config.TTS_WORKER_BACKEND = "thread"
+    synthesizer = SpeechSynthesizer()
+    synthesizer._synthesize_audio(texts[0])
+    for n in counts:
+        rate = _throughput(synthesizer._synthesize_audio, texts, n)
+        print(f"потоки   x{n}: {rate:8.1f} симв/с")
+
+    for n in counts:
+        pool = TtsProcessPool(n)
+        pool.start()
+        try:
+            rate = _throughput(
+                lambda text: pool.synthesize([text], synthesizer.speaker), texts, n
+            )
+        finally:
+            pool.shutdown()
+        print(f"процессы x{n}: {rate:8.1f} симв/с")
+
+
+if __name__ == "__main__":
+    main()
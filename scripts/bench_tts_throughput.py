@@ -0,0 +1,72 @@
+"""
+Пропускная способность синтеза Silero по предложениям.
+
+    python scripts/bench_tts_throughput.py --rounds 3
+
+Отдельные вызовы _synthesize_audio против _synthesize_chunks (те же вызовы
+в общем torch.inference_mode). Пакетного входа у apply_tts Silero v3 нет —
+это сравнение накладных расходов на вызов, не batch inference. Кэш звука
+выключен, предложения все разные, чтобы мерить модель. Печатает символы в
+секунду процессорного времени (process_time — все потоки torch) и
+настенного. Первый проход — прогрев, в результат не входит.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config import Config  # noqa: E402
+
+_SENTENCES = [
+    "Следующая тема: Фаина Раневская.",
+    "Она говорила, что талант — это как прыщ: может вскочить на любой физиономии.",
+    "Звучит грубо, но в этом вся она.",
+    "Актриса не терпела фальши ни на сцене, ни в жизни.",
+    "Продолжим разбор цитат.",
+    "Вот ещё одна, про одиночество и про то, как с ним уживаться.",
+    "Одиночество — это состояние, о котором некому рассказать.",
+    "На этом с Раневской всё, переходим к следующему автору.",
+]
+
+
+def _measure(label: str, texts: list[str], run, rounds: int) -> None:
+    chars = sum(len(t) for t in texts) * rounds
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for _ in range(rounds):
+        run(texts)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    print(
+        f"{label:<16} {chars / cpu:8.1f} симв/с CPU  "
+        f"{chars / wall:8.1f} симв/с  {wall * 1000 / rounds:8.1f} мс/проход"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    Config.TTS_AUDIO_CACHE_MEMORY_MB = 0
+    Config.TTS_AUDIO_CACHE_DISK_MB = 0
+    from speech.speech_synthesizer import SpeechSynthesizer
+
+    synthesizer = SpeechSynthesizer()
+    synthesizer._synthesize_chunks(_SENTENCES[:2])
+
+    _measure(
+        "по одному",
+        _SENTENCES,
+        lambda texts: [synthesizer._synthesize_audio(t) for t in texts],
+        args.rounds,
+    )
+    _measure("inference_mode", _SENTENCES, synthesizer._synthesize_chunks, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
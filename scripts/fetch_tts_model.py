@@ -0,0 +1,43 @@
+"""
+Скачивает снимок модели Silero (TTS_MODEL_URL) в TTS_MODEL_PATH и печатает sha256.
+
+    python scripts/fetch_tts_model.py
+
+Полученную сумму впишите в .env как TTS_MODEL_SHA256 — streamer будет грузить
+модель из файла без сети и проверять, что снимок не подменён и не битый.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import urllib.request
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.config import Config  # noqa: E402
+from speech.model_snapshot import file_sha256  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default=Config.TTS_MODEL_URL)
+    parser.add_argument("--path", default=Config.TTS_MODEL_PATH)
+    args = parser.parse_args()
+
+    target = Path(args.path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    part_path = target.with_name(f"{target.name}.part")
+    print(f"Скачивание {args.url} → {target}")
+    with urllib.request.urlopen(args.url, timeout=60) as response, open(
+        part_path, "wb"
+    ) as f:
+        while block := response.read(1024 * 1024):
+            f.write(block)
+    os.replace(part_path, target)
+    print(f"TTS_MODEL_SHA256={file_sha256(str(target))}")
+
+
+if __name__ == "__main__":
+    main()
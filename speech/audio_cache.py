@@ -0,0 +1,196 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+
+from core.disk_guard import DiskGuard
+from core.logger import logger
+from core.metrics import metrics
+
+
+def audio_cache_key(model_id: str, speaker: str, sample_rate: int, text: str) -> str:
+    """Адрес звука: модель, голос, частота и текст с нормализованными пробелами."""
+    normalized = " ".join(text.split())
+    raw = f"{model_id}\x00{speaker}\x00{sample_rate}\x00{normalized}"
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _to_int16(audio: np.ndarray) -> np.ndarray:
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def _to_float32(audio: np.ndarray) -> np.ndarray:
+    return audio.astype(np.float32) / 32767.0
+
+
+class AudioCache:
+    """
+    Кэш синтезированного звука: память (LRU) → диск (LRU по mtime) → синтез.
+
+    Повторяющиеся фразы — переход к теме, «Следующая тема: …», цитаты после
+    перезапуска — не гоняются через модель заново. Хранится int16 (вдвое
+    меньше float32); оба уровня ограничены по байтам, 0 — уровень выключен.
+    Запись на диск идёт в writer (если задан), не в потоке синтеза.
+    """
+
+    _SUFFIX = ".npy"
+
+    def __init__(
+        self,
+        directory: str,
+        memory_bytes: int,
+        disk_bytes: int,
+        writer: Executor | None = None,
+    ) -> None:
+        self._dir = Path(directory)
+        self._writer = writer
+        self._memory_limit = max(0, memory_bytes)
+        self._disk_limit = max(0, disk_bytes)
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()
+        self._disk_bytes = 0
+        # Ключи, запись которых уже заказана: второй put того же текста
+        # (упреждающий и эфирный синтез) файл не пишет.
+        self._writing: set[str] = set()
+        if self._disk_limit:
+            self._load_disk_index()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._memory_limit or self._disk_limit)
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}{self._SUFFIX}"
+
+    def _load_disk_index(self) -> None:
+        if not self._dir.is_dir():
+            return
+        entries = []
+        for path in self._dir.iterdir():
+            if path.suffix != self._SUFFIX:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for _mtime, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+        logger.info(
+            "Кэш TTS на диске: %s фраз, %.1f MB",
+            len(self._disk),
+            self._disk_bytes / (1024 * 1024),
+        )
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            samples = self._memory.get(key)
+            if samples is not None:
+                self._memory.move_to_end(key)
+                metrics.tts_audio_cache_total.inc("memory")
+                return _to_float32(samples)
+            on_disk = key in self._disk
+        if on_disk:
+            samples = self._read_disk(key)
+            if samples is not None:
+                with self._lock:
+                    self._remember(key, samples)
+                metrics.tts_audio_cache_total.inc("disk")
+                return _to_float32(samples)
+        metrics.tts_audio_cache_total.inc("miss")
+        return None
+
+    def put(self, key: str, audio: np.ndarray) -> None:
+        if not self.enabled or audio.size == 0:
+            return
+        samples = _to_int16(audio)
+        low_disk = DiskGuard.low_disk_mode()
+        with self._lock:
+            self._remember(key, samples)
+            write_disk = (
+                self._disk_limit > 0
+                and not low_disk
+                and key not in self._disk
+                and key not in self._writing
+            )
+            if write_disk:
+                self._writing.add(key)
+        if not write_disk:
+            return
+        if self._writer is None:
+            self._write_disk(key, samples)
+            return
+        try:
+            self._writer.submit(self._write_disk, key, samples)
+        except RuntimeError:
+            # Executor уже остановлен (завершение процесса) — запись не нужна.
+            with self._lock:
+                self._writing.discard(key)
+
+    def _remember(self, key: str, samples: np.ndarray) -> None:
+        if samples.nbytes > self._memory_limit:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= previous.nbytes
+        self._memory[key] = samples
+        self._memory_bytes += samples.nbytes
+        while self._memory_bytes > self._memory_limit:
+            _key, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+
+    def _read_disk(self, key: str) -> np.ndarray | None:
+        path = self._path(key)
+        try:
+            samples = np.load(path, allow_pickle=False)
+            os.utime(path)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Кэш TTS: не удалось прочитать {path.name}: {e}")
+            with self._lock:
+                self._disk_bytes -= self._disk.pop(key, 0)
+            return None
+        with self._lock:
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        return samples
+
+    def _write_disk(self, key: str, samples: np.ndarray) -> None:
+        path = self._path(key)
+        part_path = path.with_name(f"{path.name}.part")
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            with open(part_path, "wb") as f:
+                np.save(f, samples, allow_pickle=False)
+            os.replace(part_path, path)
+            size = path.stat().st_size
+        except OSError as e:
+            logger.warning(f"Кэш TTS: не удалось записать {path.name}: {e}")
+            with suppress(OSError):
+                part_path.unlink()
+            with self._lock:
+                self._writing.discard(key)
+            return
+        with self._lock:
+            self._writing.discard(key)
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = size
+            self._disk_bytes += size
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self._disk_limit and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
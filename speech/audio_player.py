@@ -7,6 +7,10 @@ import wave
 import numpy as np
 import sounddevice as sd
 
+from core.dir_watcher import DirectoryWatcher
+from core.metrics import metrics
+from speech.audio_post import fade_edges_in_place
+
 logger = logging.getLogger(__name__)
 
 FADE_MS = 35.0
@@ -17,22 +21,18 @@ def apply_edge_fade(
     sample_rate: int,
     fade_ms: float = FADE_MS,
 ) -> np.ndarray:
-    """Сглаживает начало/конец сигнала, чтобы убрать щелчки на стыках."""
+    """
+    Сглаживает начало/конец сигнала, чтобы убрать щелчки на стыках. Нужно
+    только для сырых файлов: звук синтезатора уже сглажен AudioPostProcess.
+    """
     if audio.size == 0:
         return audio
-
-    samples = int(sample_rate * fade_ms / 1000.0)
-    if samples <= 0:
+    if min(int(sample_rate * fade_ms / 1000.0), audio.size // 2) <= 0:
         return audio
 
-    n = min(samples, audio.size // 2)
-    if n <= 0:
-        return audio
-
-    out = np.asarray(audio, dtype=np.float32).copy()
-    ramp = np.linspace(0.0, 1.0, n, dtype=np.float32)
-    out[:n] *= ramp
-    out[-n:] *= ramp[::-1]
+    # Копия: клип может принадлежать кэшу звука.
+    out = np.array(audio, dtype=np.float32)
+    fade_edges_in_place(out, sample_rate, fade_ms)
     return out
 
 
@@ -42,20 +42,34 @@ class _PersistentPlayer:
     def __init__(self) -> None:
         self._lock = threading.Lock()
         self._stop_requested = False
+        self._stop_generation = 0
+
+    @property
+    def stop_generation(self) -> int:
+        return self._stop_generation
+
+    @property
+    def position(self) -> int:
+        return 0
+
+    @property
+    def underruns(self) -> int:
+        return 0
 
     def stop(self) -> None:
         """Прерывает текущий клип."""
         self._stop_requested = True
+        self._stop_generation += 1
         sd.stop()
 
-    def play(self, audio: np.ndarray, sample_rate: int) -> None:
-        faded = apply_edge_fade(np.asarray(audio, dtype=np.float32), sample_rate)
-        if faded.size == 0:
+    def play(self, audio: np.ndarray, sample_rate: int, faded: bool = False) -> None:
+        samples = _prepare(audio, sample_rate, faded)
+        if samples.size == 0:
             return
 
         self._stop_requested = False
         with self._lock:
-            sd.play(faded, sample_rate, blocking=False)
+            sd.play(samples, sample_rate, blocking=False)
             stream = sd.get_stream()
             while stream is not None and stream.active:
                 if self._stop_requested:
@@ -64,11 +78,317 @@ class _PersistentPlayer:
                 time.sleep(0.02)
 
 
-_player = _PersistentPlayer()
+class _RingBuffer:
+    """
+    Кольцо сэмплов с одним писателем и одним читателем.
+
+    Позиции — монотонные счётчики, которые меняет только их владелец
+    (запись — play, чтение — callback); присваивание int атомарно под GIL,
+    поэтому блокировок между потоком плеера и аудиопотоком нет.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self._data = np.zeros(capacity, dtype=np.float32)
+        self.capacity = capacity
 
+    def _spans(self, pos: int, count: int) -> tuple[int, int]:
+        start = pos % self.capacity
+        return start, min(count, self.capacity - start)
 
-def play_audio(audio: np.ndarray, sample_rate: int) -> None:
-    _player.play(audio, sample_rate)
+    def put(self, pos: int, samples: np.ndarray) -> None:
+        start, first = self._spans(pos, samples.size)
+        self._data[start : start + first] = samples[:first]
+        self._data[: samples.size - first] = samples[first:]
+
+    def mix(self, pos: int, samples: np.ndarray) -> None:
+        start, first = self._spans(pos, samples.size)
+        self._data[start : start + first] += samples[:first]
+        self._data[: samples.size - first] += samples[first:]
+
+    def take(self, pos: int, out: np.ndarray) -> None:
+        start, first = self._spans(pos, out.size)
+        out[:first] = self._data[start : start + first]
+        out[first:] = self._data[: out.size - first]
+
+
+class _StreamStalled(Exception):
+    """Устройство перестало забирать звук из кольца."""
+
+
+class _StreamPlayer:
+    """
+    Один долгоживущий OutputStream, который питается из кольцевого буфера.
+
+    Устройство не переоткрывается на каждый клип: клипы встают в кольцо
+    встык (с перекрёстным затуханием AUDIO_CROSSFADE_MS), play() возвращается,
+    когда до конца клипа остаётся AUDIO_QUEUE_LEAD_MS, — следующий клип
+    успевает встать без паузы. stop() помечает данные устаревшими, и уже
+    следующий блок callback'а уводит их в тишину за STOP_FADE_MS.
+    Если устройство перестало вызывать callback (отключено, ошибка хоста),
+    ожидание обрывается и плеер переходит на sd.play.
+    """
+
+    STOP_FADE_MS = 5.0
+    _BUFFER_SECONDS = 4.0
+    # Запас сверх длительности ещё не сыгранного звука до признания зависания.
+    _STALL_SECONDS = 1.0
+
+    def __init__(self, crossfade_ms: float, lead_ms: float) -> None:
+        self._lock = threading.Lock()
+        self._consumed = threading.Event()
+        self._crossfade_ms = max(0.0, crossfade_ms)
+        self._lead_ms = max(0.0, lead_ms)
+        self._stream: sd.OutputStream | None = None
+        self._fallback: _PersistentPlayer | None = None
+        self._ring: _RingBuffer | None = None
+        self._sample_rate = 0
+        self._stop_fade = np.zeros(0, dtype=np.float32)
+        # Пишет только play():
+        self._write_pos = 0
+        self._data_generation = 0
+        self._feeding = False
+        # Пишет только callback:
+        self._read_pos = 0
+        self._faded_generation = 0
+        self._position = 0
+        self._underruns = 0
+        # Пишет только stop():
+        self._stop_generation = 0
+
+    @property
+    def stop_generation(self) -> int:
+        return self._stop_generation
+
+    @property
+    def position(self) -> int:
+        """Сколько сэмплов отдано устройству с открытия потока."""
+        return self._position
+
+    @property
+    def underruns(self) -> int:
+        """Блоки, в которых клип не успел в буфер или устройство сообщило underflow."""
+        return self._underruns
+
+    def _callback(self, outdata, frames, time_info, status) -> None:
+        out = outdata[:, 0]
+        if status.output_underflow:
+            self._underruns += 1
+        read = self._read_pos
+        write = self._write_pos
+        generation = self._stop_generation
+        if self._data_generation != generation:
+            # Прерывание: дочитываем несколько миллисекунд с затуханием — без щелчка.
+            count = 0
+            if self._faded_generation != generation:
+                self._faded_generation = generation
+                count = min(write - read, frames, self._stop_fade.size)
+                self._ring.take(read, out[:count])
+                out[:count] *= self._stop_fade[:count]
+            out[count:] = 0.0
+            self._read_pos = write
+            self._position += frames
+            self._consumed.set()
+            return
+        count = min(write - read, frames)
+        self._ring.take(read, out[:count])
+        if count < frames:
+            out[count:] = 0.0
+            if self._feeding:
+                self._underruns += 1
+        self._read_pos = read + count
+        self._position += frames
+        self._consumed.set()
+
+    def _open(self, sample_rate: int) -> None:
+        if self._stream is not None:
+            if self._stream.active:
+                try:
+                    self._wait_until(lambda: self._read_pos >= self._write_pos)
+                except _StreamStalled:
+                    pass  # доигрывать некому — закрываем как есть
+            self._stream.close()
+            self._stream = None
+        capacity = 1 << max(12, int(sample_rate * self._BUFFER_SECONDS).bit_length())
+        self._ring = _RingBuffer(capacity)
+        self._read_pos = self._write_pos = 0
+        fade = max(1, int(sample_rate * self.STOP_FADE_MS / 1000.0))
+        self._stop_fade = np.linspace(1.0, 0.0, fade, dtype=np.float32)
+        self._sample_rate = sample_rate
+        stream = sd.OutputStream(
+            samplerate=sample_rate,
+            channels=1,
+            dtype="float32",
+            latency="low",
+            callback=self._callback,
+        )
+        stream.start()
+        self._stream = stream
+        logger.info(
+            f"Аудиопоток открыт: {sample_rate} Гц, задержка {stream.latency * 1000:.0f} мс"
+        )
+
+    def _ensure_stream(self, sample_rate: int) -> None:
+        if (
+            self._stream is None
+            or not self._stream.active
+            or self._sample_rate != sample_rate
+        ):
+            self._open(sample_rate)
+
+    def _wait_until(self, ready, generation: int | None = None) -> bool:
+        """
+        Ждёт, пока callback продвинет чтение; False — если пришёл stop().
+        Поток неактивен или не дочитал кольцо за его длительность плюс
+        _STALL_SECONDS — _StreamStalled.
+        """
+        pending = (self._write_pos - self._read_pos) / self._sample_rate
+        deadline = time.monotonic() + pending + self._STALL_SECONDS
+        while not ready():
+            if generation is not None and generation != self._stop_generation:
+                return False
+            if not self._stream.active:
+                raise _StreamStalled("поток неактивен")
+            if time.monotonic() > deadline:
+                raise _StreamStalled("устройство не забирает звук")
+            self._consumed.wait(0.05)
+            self._consumed.clear()
+        return True
+
+    def _fall_back(self, reason) -> None:
+        logger.warning(f"Аудиопоток недоступен ({reason}) — переключение на sd.play")
+        stream, self._stream = self._stream, None
+        if stream is not None:
+            try:
+                stream.abort()
+                stream.close()
+            except Exception:
+                pass
+        self._fallback = _PersistentPlayer()
+
+    def _write(self, samples: np.ndarray, generation: int) -> bool:
+        ring = self._ring
+        offset = 0
+        while offset < samples.size:
+            free = ring.capacity - (self._write_pos - self._read_pos)
+            if free <= 0:
+                if not self._wait_until(
+                    lambda: self._write_pos - self._read_pos < ring.capacity,
+                    generation,
+                ):
+                    return False
+                continue
+            count = min(free, samples.size - offset)
+            ring.put(self._write_pos, samples[offset : offset + count])
+            self._write_pos += count
+            offset += count
+            if generation != self._stop_generation:
+                return False
+        return True
+
+    def _crossfade(self, samples: np.ndarray) -> int:
+        """Накладывает начало клипа на ещё не сыгранный хвост предыдущего."""
+        overlap = int(self._sample_rate * self._crossfade_ms / 1000.0)
+        # Запас в блок устройства: callback не должен читать смешиваемый участок.
+        margin = int(self._sample_rate * self._stream.latency) + self._stop_fade.size
+        pending = self._write_pos - self._read_pos - margin
+        overlap = min(overlap, pending, samples.size)
+        if overlap <= 0:
+            return 0
+        self._ring.mix(self._write_pos - overlap, samples[:overlap])
+        return overlap
+
+    def play(self, audio: np.ndarray, sample_rate: int, faded: bool = False) -> None:
+        if self._fallback is not None:
+            self._fallback.play(audio, sample_rate, faded)
+            return
+        audio = _prepare(audio, sample_rate, faded)
+        if audio.size == 0:
+            return
+
+        generation = self._stop_generation
+        with self._lock:
+            if generation != self._stop_generation:
+                return
+            try:
+                self._ensure_stream(sample_rate)
+            except Exception as e:
+                self._fall_back(e)
+                self._fallback.play(audio, sample_rate, True)
+                return
+            clip_start = self._write_pos
+            try:
+                if self._data_generation != generation:
+                    # После stop() callback должен сбросить старые данные до новой записи.
+                    self._wait_until(lambda: self._read_pos >= self._write_pos)
+                    self._data_generation = generation
+                    clip_start = self._write_pos
+                self._feeding = True
+                try:
+                    overlap = self._crossfade(audio)
+                    clip_start -= overlap
+                    if not self._write(audio[overlap:], generation):
+                        return
+                finally:
+                    self._feeding = False
+                lead = int(sample_rate * self._lead_ms / 1000.0)
+                end = self._write_pos
+                self._wait_until(lambda: end - self._read_pos <= lead, generation)
+            except _StreamStalled as e:
+                # Доигрываем то, что устройство не успело забрать; остаток
+                # начинается посреди сигнала — его сглаживает sd.play-плеер.
+                played = min(max(0, self._read_pos - clip_start), audio.size)
+                self._fall_back(e)
+                self._fallback.play(audio[played:], sample_rate)
+
+    def stop(self) -> None:
+        """Прерывает текущий и все поставленные в кольцо клипы."""
+        self._stop_generation += 1
+        self._consumed.set()
+        if self._fallback is not None:
+            self._fallback.stop()
+
+
+def _host_api_name() -> str:
+    device = sd.query_devices(kind="output")
+    return sd.query_hostapis(device["hostapi"])["name"]
+
+
+def _create_player():
+    """
+    AUDIO_OUTPUT_MODE=stream (по умолчанию) — постоянный поток с кольцевым
+    буфером; play — прежний sd.play на каждый клип. На WDM-KS callback-поток
+    не работает, там всегда sd.play.
+    """
+    mode = os.getenv("AUDIO_OUTPUT_MODE", "stream").lower()
+    if mode == "stream":
+        try:
+            host_api = _host_api_name()
+        except Exception as e:
+            logger.warning(f"Аудиоустройство не опрошено ({e}) — используется sd.play")
+            return _PersistentPlayer()
+        if "WDM-KS" in host_api:
+            logger.info("WDM-KS: постоянный аудиопоток недоступен — используется sd.play")
+            return _PersistentPlayer()
+        return _StreamPlayer(
+            crossfade_ms=float(os.getenv("AUDIO_CROSSFADE_MS", 0)),
+            lead_ms=float(os.getenv("AUDIO_QUEUE_LEAD_MS", 60)),
+        )
+    if mode != "play":
+        logger.warning(f"Неизвестный AUDIO_OUTPUT_MODE={mode} — используется sd.play")
+    return _PersistentPlayer()
+
+
+_player = _create_player()
+
+
+def _prepare(audio: np.ndarray, sample_rate: int, faded: bool) -> np.ndarray:
+    audio = np.asarray(audio, dtype=np.float32)
+    return audio if faded else apply_edge_fade(audio, sample_rate)
+
+
+def play_audio(audio: np.ndarray, sample_rate: int, *, faded: bool = False) -> None:
+    """faded=True — звук уже сглажен (AudioPostProcess): без копии и второго затухания."""
+    _player.play(audio, sample_rate, faded)
 
 
 def stop_audio() -> None:
@@ -76,43 +396,80 @@ def stop_audio() -> None:
     _player.stop()
 
 
-def get_next_wav(directory: str) -> str | None:
-    """Возвращает путь к самому старому готовому WAV (по имени файла)."""
-    if not os.path.isdir(directory):
-        return None
+def playback_token() -> int:
+    """Метка для playback_stopped_since: был ли stop_audio после неё."""
+    return _player.stop_generation
+
+
+def playback_stopped_since(token: int) -> bool:
+    return _player.stop_generation != token
+
+
+def playback_position() -> int:
+    """Сэмплов отдано устройству (для sd.play-режима всегда 0)."""
+    return _player.position
+
+
+def playback_underruns() -> int:
+    """Сколько раз звук не успел к устройству (для sd.play-режима всегда 0)."""
+    return _player.underruns
+
 
-    wav_files = sorted(
-        f for f in os.listdir(directory) if f.endswith(".wav") and not f.endswith(".part")
-    )
-    if not wav_files:
+metrics.register_source("audio_output_samples_total", playback_position)
+metrics.register_source("audio_underruns_total", playback_underruns)
+
+
+# Как Config.TTS_OUTPUT_SUFFIXES: плеер запускается без полного .env.
+AUDIO_FILE_SUFFIXES = (".wav", ".ogg", ".flac")
+
+
+def get_next_audio_file(directory: str) -> str | None:
+    """Возвращает путь к самому старому готовому файлу (по имени файла)."""
+    name = DirectoryWatcher.shared(directory, AUDIO_FILE_SUFFIXES).oldest()
+    if name is None:
         return None
-    return os.path.join(directory, wav_files[0])
+    return os.path.join(directory, name)
 
 
-def play_wav(file_path: str) -> None:
-    with wave.open(file_path, "rb") as wav_file:
-        sample_rate = wav_file.getframerate()
-        frames = wav_file.readframes(wav_file.getnframes())
-        audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32767.0
+def read_audio_file(file_path: str) -> tuple[np.ndarray, int]:
+    """(сэмплы float32, частота): WAV — через wave, Opus/FLAC — через soundfile."""
+    if file_path.endswith(".wav"):
+        with wave.open(file_path, "rb") as wav_file:
+            sample_rate = wav_file.getframerate()
+            frames = wav_file.readframes(wav_file.getnframes())
+        return np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32767.0, sample_rate
 
+    import soundfile
+
+    audio, sample_rate = soundfile.read(file_path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio, sample_rate
+
+
+def play_audio_file(file_path: str) -> None:
+    audio, sample_rate = read_audio_file(file_path)
     play_audio(audio, sample_rate)
 
 
 def run_playback_loop(directory: str, poll_interval: float = 0.05) -> None:
-    """Последовательно воспроизводит WAV из каталога и удаляет после проигрывания."""
+    """Последовательно воспроизводит файлы из каталога и удаляет после проигрывания."""
     os.makedirs(directory, exist_ok=True)
-    logger.info(f"Ожидание WAV в {os.path.abspath(directory)}")
+    logger.info(f"Ожидание аудиофайлов в {os.path.abspath(directory)}")
+    watcher = DirectoryWatcher.shared(directory, AUDIO_FILE_SUFFIXES, poll_interval)
 
     while True:
-        file_path = get_next_wav(directory)
-        if file_path is None:
-            time.sleep(poll_interval)
+        name = watcher.oldest()
+        if name is None:
+            watcher.wait(timeout=1.0)
             continue
 
+        file_path = os.path.join(directory, name)
         try:
             logger.info(f"Воспроизведение: {file_path}")
-            play_wav(file_path)
+            play_audio_file(file_path)
             os.remove(file_path)
+            watcher.discard(name)
             logger.info(f"Удалён: {file_path}")
         except Exception as e:
             logger.error(f"Ошибка воспроизведения {file_path}: {e}")
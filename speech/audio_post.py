@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+NORMALIZE_MODES = ("off", "rms", "lufs")
+_PEAK_CEILING = 10 ** (-1.0 / 20)  # -1 dBFS: запас от клиппинга после усиления
+_EPS = 1e-12
+
+
+@lru_cache(maxsize=8)
+def _ramp(samples: int) -> np.ndarray:
+    ramp = np.linspace(0.0, 1.0, samples, dtype=np.float32)
+    ramp.setflags(write=False)
+    return ramp
+
+
+def fade_edges_in_place(audio: np.ndarray, sample_rate: int, fade_ms: float) -> None:
+    """Линейное нарастание/затухание на краях — прямо в audio, без копии."""
+    n = min(int(sample_rate * fade_ms / 1000.0), audio.size // 2)
+    if n <= 0:
+        return
+    ramp = _ramp(n)
+    audio[:n] *= ramp
+    audio[-n:] *= ramp[::-1]
+
+
+def frame_energy(audio: np.ndarray, frame: int) -> np.ndarray:
+    """Средний квадрат по кадрам длины frame (последний дополняется нулями)."""
+    count = -(-audio.size // frame)
+    padded = np.zeros(count * frame, dtype=np.float32)
+    padded[: audio.size] = audio
+    frames = padded.reshape(count, frame)
+    return np.einsum("ij,ij->i", frames, frames) / frame
+
+
+def _db(power: float) -> float:
+    return 10.0 * np.log10(max(power, _EPS))
+
+
+def _gated_loudness(audio: np.ndarray, sample_rate: int) -> float:
+    """
+    Громкость по схеме BS.1770 без K-фильтра: блоки 400 мс с шагом 100 мс,
+    абсолютный порог -70 dB и относительный -10 dB. Для речи одного голоса
+    расхождение с настоящим LUFS почти постоянно и уходит в целевой уровень.
+    """
+    block = int(sample_rate * 0.4)
+    hop = int(sample_rate * 0.1)
+    if audio.size < block:
+        return _db(float(np.mean(np.square(audio))))
+    energy = np.concatenate(([0.0], np.cumsum(np.square(audio, dtype=np.float64))))
+    starts = np.arange(0, audio.size - block + 1, hop)
+    power = (energy[starts + block] - energy[starts]) / block
+    gated = power[power > 10 ** (-70 / 10)]
+    if gated.size == 0:
+        return _db(0.0)
+    gated = gated[gated > gated.mean() * 10 ** (-10 / 10)]
+    return _db(float(gated.mean()))
+
+
+@dataclass(frozen=True)
+class AudioPostProcess:
+    """
+    Обработка синтезированной фразы перед кэшем и воспроизведением.
+
+    Тишина по краям срезается по энергии кадров (порог — относительно самого
+    громкого кадра, с запасом keep_ms), громкость приводится к target_db по
+    RMS речевых кадров или по приближению LUFS, края затухают на месте.
+    Все шаги — векторные операции NumPy над одним массивом.
+    """
+
+    trim: bool = True
+    trim_threshold_db: float = -40.0
+    keep_ms: float = 40.0
+    frame_ms: float = 10.0
+    normalize: str = "rms"
+    target_db: float = -20.0
+    max_gain_db: float = 12.0
+    fade_ms: float = 35.0
+
+    @property
+    def signature(self) -> str:
+        """Часть ключа кэша звука: другие настройки — другой звук."""
+        trim = f"trim{self.trim_threshold_db:g}/{self.keep_ms:g}" if self.trim else "notrim"
+        norm = f"{self.normalize}{self.target_db:g}/{self.max_gain_db:g}"
+        return f"{trim}:{norm}:fade{self.fade_ms:g}"
+
+    def _trim_bounds(self, audio: np.ndarray, sample_rate: int) -> tuple[int, int]:
+        frame = max(1, int(sample_rate * self.frame_ms / 1000.0))
+        energy = frame_energy(audio, frame)
+        peak = float(energy.max())
+        if peak <= _EPS:
+            return 0, audio.size
+        voiced = np.flatnonzero(energy > peak * 10 ** (self.trim_threshold_db / 10))
+        keep = int(sample_rate * self.keep_ms / 1000.0)
+        start = max(0, int(voiced[0]) * frame - keep)
+        end = min(audio.size, (int(voiced[-1]) + 1) * frame + keep)
+        return start, end
+
+    def _gain(self, audio: np.ndarray, sample_rate: int) -> float:
+        if self.normalize == "lufs":
+            level = _gated_loudness(audio, sample_rate)
+        else:
+            frame = max(1, int(sample_rate * self.frame_ms / 1000.0))
+            energy = frame_energy(audio, frame)
+            active = energy[energy > energy.max() * 10 ** (self.trim_threshold_db / 10)]
+            level = _db(float(active.mean()) if active.size else 0.0)
+        gain_db = min(self.target_db - level, self.max_gain_db)
+        gain = 10 ** (gain_db / 20)
+        peak = float(np.max(np.abs(audio)))
+        if peak * gain > _PEAK_CEILING:
+            gain = _PEAK_CEILING / max(peak, _EPS)
+        return gain
+
+    def apply(self, audio: np.ndarray, sample_rate: int) -> tuple[np.ndarray, int]:
+        """
+        Возвращает (обработанный звук, срезано сэмплов). Массив модели
+        изменяется на месте: обрезка — срез, усиление и затухание — *=.
+        """
+        audio = np.asarray(audio, dtype=np.float32)
+        if not audio.flags.writeable:
+            audio = audio.copy()
+        if audio.size == 0:
+            return audio, 0
+        original = audio.size
+        if self.trim:
+            start, end = self._trim_bounds(audio, sample_rate)
+            audio = audio[start:end]
+        if self.normalize in ("rms", "lufs"):
+            gain = self._gain(audio, sample_rate)
+            if abs(gain - 1.0) > 1e-3:
+                audio *= np.float32(gain)
+        fade_edges_in_place(audio, sample_rate, self.fade_ms)
+        return audio, original - audio.size
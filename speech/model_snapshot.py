@@ -0,0 +1,39 @@
+import hashlib
+import os
+
+from core.logger import logger
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_model_snapshot(path: str, sha256: str = ""):
+    """
+    Модель Silero из закреплённого локального файла (torch.package, тот же
+    .pt, что скачивает hubconf) — без сети и без torch.hub.
+
+    (модель, sha256 файла) или None — файла нет или контрольная сумма не
+    совпала (тогда грузим из hub).
+    """
+    if not path or not os.path.isfile(path):
+        return None
+    actual = file_sha256(path)
+    if sha256 and actual != sha256.strip().lower():
+        logger.error(
+            f"Снимок модели {path}: sha256 {actual} не совпадает с TTS_MODEL_SHA256 — пропускаем"
+        )
+        return None
+    if not sha256:
+        logger.warning(f"TTS_MODEL_SHA256 не задан; sha256 снимка {path}: {actual}")
+
+    from torch import package
+
+    importer = package.PackageImporter(path)
+    model = importer.load_pickle("tts_models", "model")
+    logger.info(f"Модель Silero загружена из локального снимка {path}")
+    return model, actual
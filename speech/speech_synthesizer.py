@@ -1,19 +1,44 @@
 import asyncio
+import functools
 import math
 import os
+import queue
+import threading
+import time
 import wave
-from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext, suppress
 
 import numpy as np
-import torch
 
 from core.config import Config
 from core.disk_guard import DiskGuard
 from core.logger import logger
 from core.metrics import metrics
+from core.startup_profile import startup_profile
 
 from core.text_split import split_sentences
-from speech.audio_player import apply_edge_fade, play_audio, stop_audio
+from speech.audio_cache import AudioCache, audio_cache_key
+from speech.audio_post import NORMALIZE_MODES, AudioPostProcess
+from speech.model_snapshot import load_model_snapshot
+from speech.audio_player import (
+    FADE_MS,
+    play_audio,
+    playback_stopped_since,
+    playback_token,
+    stop_audio,
+)
+from speech.tts_engine import apply_engine_mode, configure_torch_threads
+from speech.tts_process_pool import TtsProcessPool
+
+_PIPELINE_END = object()
+
+
+class _LookaheadCancelled(Exception):
+    """Упреждающий синтез отменён, пока ждал модель."""
+
+_MODEL_ID = "v3_1_ru"
 
 
 def split_text_for_tts(
@@ -127,6 +152,19 @@ class SpeechSynthesizer:
 
     _instance = None
     _executor = ThreadPoolExecutor(max_workers=Config.TTS_MAX_CONCURRENCY)
+    # Упреждающий синтез идёт параллельно воспроизведению — отдельный поток,
+    # но синтезу текущей реплики или ответа чату уступает (_foreground_jobs).
+    _lookahead_executor = ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="tts-lookahead"
+    )
+    _foreground_done = threading.Condition()
+    _foreground_jobs = 0
+    # apply_tts Silero — по одному потоку за раз (под тем же _foreground_done).
+    _model_busy = False
+    # Один поток кодирования: файлы готовы строго в порядке номеров. Туда же
+    # уходит запись кэша звука на диск — мимо потока синтеза.
+    _encoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-encode")
+    last_sound_started: float | None = None
 
     def __new__(cls, *args, **kwargs):
         if cls._instance is None:
@@ -161,48 +199,17 @@ class SpeechSynthesizer:
             self.speaker = speaker
             self.sample_rate = sample_rate
             self._file_sequence = 0
-
-            logger.info(f"Используется устройство: {self.device}")
-            logger.info(f"Загрузка модели Silero TTS для языка {language}...")
-
-            os.environ.setdefault("TQDM_DISABLE", "1")
-
-            try:
-                self.model, self.example_text = torch.hub.load(
-                    repo_or_dir="snakers4/silero-models",
-                    model="silero_tts",
-                    language=self.language,
-                    speaker="v3_1_ru",
-                    force_reload=False,
-                    trust_repo=True,
-                    verbose=False,
-                    progress=False,
-                )
-            except Exception as e:
-                logger.warning(
-                    f"Не удалось загрузить модель из онлайн-репозитория: {e}"
-                )
-                local_path = os.path.join(
-                    os.path.dirname(os.path.dirname(__file__)), "models", "silero_tts"
-                )
-                if os.path.exists(local_path):
-                    logger.info(
-                        f"Пробуем загрузить модель из локального каталога: {local_path}"
-                    )
-                    self.model, self.example_text = torch.hub.load(
-                        repo_or_dir=local_path,
-                        model="silero_tts",
-                        language=self.language,
-                        speaker="v3_1_ru",
-                        source="local",
-                        verbose=False,
-                        progress=False,
-                    )
-                else:
-                    raise Exception(f"Локальная копия модели не найдена в {local_path}")
-
-            self.model.to(self.device)
-            self.available_speakers = self.model.speakers
+            self._output_suffix = self._resolve_output_suffix()
+            self.post_process = self._build_post_process()
+
+            self._pool: TtsProcessPool | None = None
+            if Config.TTS_WORKER_BACKEND == "process":
+                self.model = None
+                self._pool = TtsProcessPool(Config.TTS_PROCESS_WORKERS)
+                self.engine_mode, self.available_speakers = self._pool.start()
+            else:
+                self._load_model()
+                self.available_speakers = self.model.speakers
             logger.info(f"Доступные голоса: {self.available_speakers}")
 
             if self.speaker not in self.available_speakers:
@@ -215,11 +222,103 @@ class SpeechSynthesizer:
             logger.info(
                 f"Модель Silero TTS успешно загружена, используется голос: {self.speaker}"
             )
+            self.audio_cache = AudioCache(
+                Config.TTS_AUDIO_CACHE_DIR,
+                Config.TTS_AUDIO_CACHE_MEMORY_MB * 1024 * 1024,
+                Config.TTS_AUDIO_CACHE_DISK_MB * 1024 * 1024,
+                writer=self._encoder,
+            )
             self._initialized = True
         except Exception as e:
             logger.error(f"Ошибка при инициализации Silero TTS: {e}")
             raise
 
+    @staticmethod
+    def _build_post_process() -> AudioPostProcess:
+        normalize = Config.TTS_NORMALIZE
+        if normalize not in NORMALIZE_MODES:
+            logger.warning(f"Неизвестный TTS_NORMALIZE={normalize} — нормализация выключена")
+            normalize = "off"
+        return AudioPostProcess(
+            trim=Config.TTS_TRIM_SILENCE,
+            trim_threshold_db=Config.TTS_TRIM_THRESHOLD_DB,
+            keep_ms=Config.TTS_TRIM_KEEP_MS,
+            normalize=normalize,
+            target_db=Config.TTS_LOUDNESS_TARGET_DB,
+            max_gain_db=Config.TTS_MAX_GAIN_DB,
+            fade_ms=FADE_MS,
+        )
+
+    def _load_model(self) -> None:
+        logger.info(f"Используется устройство: {self.device}")
+        logger.info(f"Загрузка модели Silero TTS для языка {self.language}...")
+
+        os.environ.setdefault("TQDM_DISABLE", "1")
+        # torch импортируется здесь, а не при импорте модуля: процесс успевает
+        # подключиться к Redis, пока грузится модель.
+        with startup_profile.phase("import torch"):
+            import torch
+        configure_torch_threads()
+
+        with startup_profile.phase("загрузка модели"):
+            snapshot = load_model_snapshot(
+                Config.TTS_MODEL_PATH, Config.TTS_MODEL_SHA256
+            )
+            if snapshot is not None:
+                self.model, weights = snapshot
+            else:
+                self.model, weights = self._load_model_from_hub(), "hub"
+
+        self.model.to(self.device)
+        with startup_profile.phase("режим движка"):
+            self.engine_mode = apply_engine_mode(self.model, _MODEL_ID, weights=weights)
+
+    def _load_model_from_hub(self):
+        import torch
+
+        try:
+            model, _example_text = torch.hub.load(
+                repo_or_dir="snakers4/silero-models",
+                model="silero_tts",
+                language=self.language,
+                speaker=_MODEL_ID,
+                force_reload=False,
+                trust_repo=True,
+                verbose=False,
+                progress=False,
+            )
+            return model
+        except Exception as e:
+            logger.warning(
+                f"Не удалось загрузить модель из онлайн-репозитория: {e}"
+            )
+        local_path = os.path.join(
+            os.path.dirname(os.path.dirname(__file__)), "models", "silero_tts"
+        )
+        if not os.path.exists(local_path):
+            raise Exception(f"Локальная копия модели не найдена в {local_path}")
+        logger.info(
+            f"Пробуем загрузить модель из локального каталога: {local_path}"
+        )
+        model, _example_text = torch.hub.load(
+            repo_or_dir=local_path,
+            model="silero_tts",
+            language=self.language,
+            speaker=_MODEL_ID,
+            source="local",
+            verbose=False,
+            progress=False,
+        )
+        return model
+
+    def warm_up(self) -> None:
+        """Первый apply_tts медленный (JIT) — прогоняем его до эфира, мимо кэша."""
+        if self.model is None:
+            # Пул процессов прогревает модели в воркерах.
+            return
+        with startup_profile.phase("прогрев синтеза"):
+            self._apply_model("Проверка связи.")
+
     def _truncate_text(self, text: str) -> str:
         max_length = Config.TTS_MAX_TEXT_LENGTH
         if max_length <= 0:
@@ -232,16 +331,91 @@ class SpeechSynthesizer:
             return text[:max_length]
         return text
 
-    def _synthesize_audio(self, text: str) -> np.ndarray:
+    def _synthesize_audio(
+        self, text: str, cancelled: threading.Event | None = None
+    ) -> np.ndarray:
         text = self._truncate_text(text)
-        audio = self.model.apply_tts(
-            text=text, speaker=self.speaker, sample_rate=self.sample_rate
-        )
+        cache_key = None
+        if self.audio_cache.enabled:
+            cache_key = audio_cache_key(
+                f"{_MODEL_ID}:{self.engine_mode}:{self.post_process.signature}",
+                self.speaker,
+                self.sample_rate,
+                text,
+            )
+            cached = self.audio_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        started = time.perf_counter()
+        if self._pool is not None:
+            audio = self._pool.synthesize(
+                [text], self.speaker, timeout=Config.TTS_TIMEOUT_SECONDS
+            )[0]
+        else:
+            audio = self._apply_model(text, cancelled)
+        elapsed = time.perf_counter() - started
+        metrics.tts_chunk_seconds.observe(elapsed)
+        if audio.size:
+            metrics.tts_real_time_factor.observe(
+                elapsed * self.sample_rate / audio.size
+            )
+        if cache_key is not None:
+            self.audio_cache.put(cache_key, audio)
+        return audio
+
+    @contextmanager
+    def _model_turn(self, cancelled: threading.Event | None):
+        """
+        Очередь к модели. Синтез для эфира (cancelled is None) ждёт только
+        освобождения модели; упреждающий — ещё и конца синтеза для эфира,
+        так что при встрече первым идёт эфир. Отмена — _LookaheadCancelled.
+        """
+        cls = type(self)
+        with cls._foreground_done:
+            while cls._model_busy or (cancelled is not None and cls._foreground_jobs):
+                if cancelled is not None and cancelled.is_set():
+                    raise _LookaheadCancelled()
+                cls._foreground_done.wait()
+            cls._model_busy = True
+        try:
+            yield
+        finally:
+            with cls._foreground_done:
+                cls._model_busy = False
+                cls._foreground_done.notify_all()
+
+    def _apply_model(
+        self, text: str, cancelled: threading.Event | None = None
+    ) -> np.ndarray:
+        with self._model_turn(cancelled):
+            audio = self.model.apply_tts(
+                text=text, speaker=self.speaker, sample_rate=self.sample_rate
+            )
         if self.device == "cuda":
             samples = audio.cpu().numpy()
         else:
             samples = audio.numpy()
-        return apply_edge_fade(samples, self.sample_rate)
+        # В потоке синтеза (или в процессе-воркере), до кэша и очереди звука.
+        samples, trimmed = self.post_process.apply(samples, self.sample_rate)
+        metrics.observe_tts_post(
+            samples.size / self.sample_rate, trimmed / self.sample_rate
+        )
+        return samples
+
+    def _synthesize_chunks(self, texts: list[str]) -> list[np.ndarray]:
+        """
+        Фрагменты реплики по очереди, по массиву на фрагмент, в порядке texts.
+        apply_tts Silero v3 принимает один текст, так что это не пакетный
+        inference — только общий torch.inference_mode на все вызовы.
+        """
+        if self.model is not None:
+            import torch
+
+            context = torch.inference_mode()
+        else:
+            context = nullcontext()
+        with context:
+            return [self._synthesize_audio(text) for text in texts]
 
     def _concat_audio(self, parts: list[np.ndarray]) -> np.ndarray:
         if not parts:
@@ -259,9 +433,34 @@ class SpeechSynthesizer:
                 segments.append(pause)
         return np.concatenate(segments)
 
+    @staticmethod
+    def _resolve_output_suffix() -> str:
+        suffix = Config.tts_output_suffix()
+        if suffix == ".wav":
+            return suffix
+        try:
+            import soundfile
+        except (ImportError, OSError) as e:
+            logger.warning(
+                f"TTS_OUTPUT_FORMAT={Config.TTS_OUTPUT_FORMAT} недоступен ({e}) — пишем WAV"
+            )
+            return ".wav"
+        # libsndfile бывает собран без Opus: без проверки падал бы каждый файл.
+        if suffix == ".ogg":
+            supported = "OPUS" in soundfile.available_subtypes("OGG")
+        else:
+            supported = "FLAC" in soundfile.available_formats()
+        if not supported:
+            logger.warning(
+                f"TTS_OUTPUT_FORMAT={Config.TTS_OUTPUT_FORMAT} не поддерживается "
+                f"libsndfile {soundfile.__libsndfile_version__} — пишем WAV"
+            )
+            return ".wav"
+        return suffix
+
     def _next_output_path(self) -> str:
         self._file_sequence += 1
-        filename = f"{self._file_sequence:08d}.wav"
+        filename = f"{self._file_sequence:08d}{self._output_suffix}"
         return os.path.join(Config.TTS_OUTPUT_DIR, filename)
 
     def _write_wav_atomic(self, file_path: str, audio_array: np.ndarray) -> None:
@@ -270,12 +469,58 @@ class SpeechSynthesizer:
         os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
         part_path = f"{file_path}.part"
         audio_int16 = (np.clip(audio_array, -1.0, 1.0) * 32767).astype(np.int16)
-        with wave.open(part_path, "w") as wav_file:
-            wav_file.setnchannels(1)
-            wav_file.setsampwidth(2)
-            wav_file.setframerate(self.sample_rate)
-            wav_file.writeframes(audio_int16.tobytes())
-        os.replace(part_path, file_path)
+        try:
+            with wave.open(part_path, "w") as wav_file:
+                wav_file.setnchannels(1)
+                wav_file.setsampwidth(2)
+                wav_file.setframerate(self.sample_rate)
+                wav_file.writeframes(audio_int16.tobytes())
+            os.replace(part_path, file_path)
+        except BaseException:
+            with suppress(OSError):
+                os.remove(part_path)
+            raise
+
+    def _write_encoded_atomic(self, file_path: str, audio_array: np.ndarray) -> None:
+        """Opus (OGG) или FLAC через .part → rename, как WAV; идёт в потоке _encoder."""
+        import soundfile
+
+        if DiskGuard.low_disk_mode():
+            raise OSError("Недостаточно места на диске для TTS-файла")
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        part_path = f"{file_path}.part"
+        if file_path.endswith(".ogg"):
+            container, subtype = "OGG", "OPUS"
+        else:
+            container, subtype = "FLAC", "PCM_16"
+        try:
+            soundfile.write(
+                part_path,
+                np.clip(audio_array, -1.0, 1.0),
+                self.sample_rate,
+                format=container,
+                subtype=subtype,
+                compression_level=Config.TTS_OUTPUT_COMPRESSION,
+            )
+            os.replace(part_path, file_path)
+        except BaseException:
+            # .part не входит в TTS_OUTPUT_SUFFIXES — DiskGuard его не уберёт.
+            with suppress(OSError):
+                os.remove(part_path)
+            raise
+
+    @staticmethod
+    def _encode_finished(file_path: str, future: Future) -> None:
+        """Реплика засчитывается, только когда файл действительно записан."""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            metrics.tts_replicas_total += 1
+            logger.info(f"Аудио сохранено: {file_path}")
+        else:
+            metrics.tts_errors_total += 1
+            logger.error(f"Ошибка при кодировании {file_path}: {error}")
 
     def _log_synthesis(self, text: str, chunks: list[str]) -> None:
         if len(chunks) == 1:
@@ -285,16 +530,28 @@ class SpeechSynthesizer:
             logger.info("Синтезируем часть %s/%s: %s", index, len(chunks), chunk)
 
     def synthesize_to_file(self, text: str) -> str | None:
-        """Синтезирует текст и сохраняет WAV. Возвращает путь к файлу."""
+        """
+        Синтезирует текст и сохраняет файл. Возвращает путь к файлу; Opus/FLAC
+        кодируются в фоне, файл появится под этим именем по готовности, а
+        успех или ошибка кодирования учитываются в метриках по его завершении.
+        """
         try:
             chunks = split_text_for_tts(text)
             if not chunks:
                 return None
             self._log_synthesis(text, chunks)
             audio_array = self._concat_audio(
-                [self._synthesize_audio(chunk) for chunk in chunks]
+                self._synthesize_chunks(chunks)
             )
             file_path = self._next_output_path()
+            if self._output_suffix != ".wav":
+                future = self._encoder.submit(
+                    self._write_encoded_atomic, file_path, audio_array
+                )
+                future.add_done_callback(
+                    functools.partial(self._encode_finished, file_path)
+                )
+                return file_path
             self._write_wav_atomic(file_path, audio_array)
             metrics.tts_replicas_total += 1
             logger.info(f"Аудио сохранено: {file_path}")
@@ -304,17 +561,178 @@ class SpeechSynthesizer:
             logger.error(f"Ошибка при синтезе в файл: {e}")
             return None
 
-    def synthesize_and_play(self, text: str) -> bool:
-        """Синтезирует и воспроизводит на колонках (локальный режим)."""
+    def _mark_sound_started(self, started: float) -> None:
+        self.last_sound_started = time.perf_counter()
+        metrics.tts_first_sound_seconds.observe(self.last_sound_started - started)
+
+    def _begin_foreground(self) -> Callable[[], None]:
+        """
+        Отмечает синтез, которого ждут в эфире; упреждающий синтез до вызова
+        возвращённой функции (повторный вызов безопасен) новые фрагменты не
+        начинает.
+        """
+        cls = type(self)
+        with cls._foreground_done:
+            cls._foreground_jobs += 1
+        released = False
+
+        def release() -> None:
+            nonlocal released
+            with cls._foreground_done:
+                if released:
+                    return
+                released = True
+                cls._foreground_jobs -= 1
+                cls._foreground_done.notify_all()
+
+        return release
+
+    def _wait_foreground(self, cancelled: threading.Event) -> bool:
+        """Ждёт конца синтеза для эфира; False — упреждающий синтез отменён."""
+        cls = type(self)
+        with cls._foreground_done:
+            while cls._foreground_jobs and not cancelled.is_set():
+                cls._foreground_done.wait()
+        return not cancelled.is_set()
+
+    def _cancel_lookahead(self, cancelled: threading.Event) -> None:
+        cls = type(self)
+        with cls._foreground_done:
+            cancelled.set()
+            cls._foreground_done.notify_all()
+
+    def synthesize_clip(
+        self, text: str, cancelled: threading.Event | None = None
+    ) -> np.ndarray | None:
+        """
+        Синтез без воспроизведения — для упреждающей подготовки реплики.
+        Перед каждым фрагментом уступает синтезу для эфира и проверяет
+        cancelled: отброшенная реплика перестаёт занимать процессор.
+        """
+        cancelled = cancelled or threading.Event()
+        try:
+            chunks = split_text_for_tts(text)
+            if not chunks:
+                return None
+            parts: list[np.ndarray] = []
+            for chunk in chunks:
+                if not self._wait_foreground(cancelled):
+                    return None
+                parts.append(self._synthesize_audio(chunk, cancelled))
+            return self._concat_audio(parts)
+        except _LookaheadCancelled:
+            return None
+        except Exception as e:
+            metrics.tts_errors_total += 1
+            logger.error(f"Ошибка упреждающего синтеза: {e}")
+            return None
+
+    def play_clip(self, audio: np.ndarray) -> bool:
+        """Воспроизводит заранее синтезированную реплику."""
+        try:
+            self._mark_sound_started(time.perf_counter())
+            play_audio(audio, self.sample_rate, faded=True)
+            metrics.tts_replicas_total += 1
+            return True
+        except Exception as e:
+            metrics.tts_errors_total += 1
+            logger.error(f"Ошибка при воспроизведении: {e}")
+            return False
+
+    def _play_pipelined(
+        self, chunks: list[str], started: float, release: Callable[[], None]
+    ) -> None:
+        """
+        Первый фрагмент звучит сразу после синтеза; следующие синтезируются
+        в фоновом потоке в ограниченный буфер, пока играет текущий.
+        stop_audio() останавливает и воспроизведение, и синтез; выход
+        воспроизведения по любой причине (ошибка, исключение из синтеза)
+        останавливает синтез через abandoned.
+        """
+        token = playback_token()
+        abandoned = threading.Event()
+        buffer: queue.Queue = queue.Queue(
+            maxsize=max(1, Config.TTS_PIPELINE_BUFFER_CHUNKS)
+        )
+        pause = np.zeros(
+            int(self.sample_rate * Config.TTS_CHUNK_PAUSE_SECONDS),
+            dtype=np.float32,
+        )
+
+        def stopped() -> bool:
+            return abandoned.is_set() or playback_stopped_since(token)
+
+        def put(item) -> bool:
+            while not stopped():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce() -> None:
+            try:
+                for index, chunk in enumerate(chunks):
+                    if stopped():
+                        return
+                    audio = self._synthesize_audio(chunk)
+                    if index < len(chunks) - 1 and pause.size:
+                        # Пауза между частями — в хвосте клипа, как при склейке.
+                        audio = np.concatenate([audio, pause])
+                    if not put(audio):
+                        return
+            except Exception as exc:
+                put(exc)
+            finally:
+                release()
+                put(_PIPELINE_END)
+
+        producer = threading.Thread(target=produce, name="tts-pipeline", daemon=True)
+        producer.start()
+        first = True
+        try:
+            while not playback_stopped_since(token):
+                try:
+                    item = buffer.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                if item is _PIPELINE_END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                if first:
+                    self._mark_sound_started(started)
+                    first = False
+                play_audio(item, self.sample_rate, faded=True)
+            if not playback_stopped_since(token):
+                producer.join()
+        finally:
+            abandoned.set()
+
+    def synthesize_and_play(
+        self, text: str, release: Callable[[], None] | None = None
+    ) -> bool:
+        """
+        Синтезирует и воспроизводит на колонках (локальный режим). Упреждающий
+        синтез ждёт до release() — конца синтеза, на время воспроизведения.
+        """
+        release = release or self._begin_foreground()
         try:
+            started = time.perf_counter()
             chunks = split_text_for_tts(text)
             if not chunks:
                 return False
             self._log_synthesis(text, chunks)
-            audio_array = self._concat_audio(
-                [self._synthesize_audio(chunk) for chunk in chunks]
-            )
-            play_audio(audio_array, self.sample_rate)
+            if len(chunks) > 1 and Config.TTS_PIPELINE_BUFFER_CHUNKS > 0:
+                self._play_pipelined(chunks, started, release)
+            else:
+                audio_array = self._concat_audio(
+                    self._synthesize_chunks(chunks)
+                )
+                release()
+                self._mark_sound_started(started)
+                play_audio(audio_array, self.sample_rate, faded=True)
             metrics.tts_replicas_total += 1
             logger.info("Воспроизведение завершено")
             return True
@@ -322,6 +740,8 @@ class SpeechSynthesizer:
             metrics.tts_errors_total += 1
             logger.error(f"Ошибка при синтезе или воспроизведении: {e}")
             return False
+        finally:
+            release()
 
     def stop_playback(self) -> None:
         """Прерывает текущее воспроизведение (приоритет чата)."""
@@ -339,8 +759,42 @@ class SpeechSynthesizer:
         )
 
     async def synthesize_and_play_async(self, text: str) -> bool:
+        loop = asyncio.get_event_loop()
+        # Отмечаем до отправки в executor: упреждающий синтез, заказанный
+        # перед этой репликой, не должен успеть занять процессор первым.
+        release = self._begin_foreground()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    self._executor, self.synthesize_and_play, text, release
+                ),
+                timeout=self._synthesis_timeout(text),
+            )
+        except asyncio.TimeoutError:
+            # Поток executor не отменяется — останавливаем его воспроизведение
+            # и фоновый синтез, иначе реплика доиграет поверх следующей.
+            self.stop_playback()
+            raise
+
+    async def synthesize_clip_async(self, text: str) -> np.ndarray | None:
+        loop = asyncio.get_event_loop()
+        cancelled = threading.Event()
+        try:
+            return await asyncio.wait_for(
+                loop.run_in_executor(
+                    self._lookahead_executor, self.synthesize_clip, text, cancelled
+                ),
+                timeout=self._synthesis_timeout(text),
+            )
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            # Ожидание брошено (вытеснение чатом, смена темы) — поток синтеза
+            # остановится перед следующим фрагментом.
+            self._cancel_lookahead(cancelled)
+            raise
+
+    async def play_clip_async(self, audio: np.ndarray) -> bool:
         loop = asyncio.get_event_loop()
         return await asyncio.wait_for(
-            loop.run_in_executor(self._executor, self.synthesize_and_play, text),
-            timeout=self._synthesis_timeout(text),
+            loop.run_in_executor(self._executor, self.play_clip, audio),
+            timeout=Config.TTS_TIMEOUT_SECONDS + audio.size / self.sample_rate,
         )
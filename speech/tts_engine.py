@@ -0,0 +1,163 @@
+import math
+import os
+from pathlib import Path
+
+from core.config import Config
+from core.logger import logger
+
+ENGINE_MODES = ("float", "int8", "frozen", "int8_frozen")
+
+
+def container_cpu_limit() -> float | None:
+    """Квота CPU контейнера (cgroup v2 cpu.max или v1 cfs_quota); None — без лимита."""
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()[:2]
+        if quota != "max":
+            return int(quota) / int(period)
+        return None
+    except (OSError, ValueError):
+        pass
+    try:
+        base = Path("/sys/fs/cgroup/cpu")
+        quota = int((base / "cpu.cfs_quota_us").read_text())
+        period = int((base / "cpu.cfs_period_us").read_text())
+        if quota > 0 and period > 0:
+            return quota / period
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _available_cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def torch_thread_budget() -> int:
+    """TTS_TORCH_THREADS или число CPU, урезанное квотой контейнера."""
+    if Config.TTS_TORCH_THREADS > 0:
+        return Config.TTS_TORCH_THREADS
+    threads = _available_cpus()
+    limit = container_cpu_limit()
+    if limit is not None:
+        threads = min(threads, max(1, math.floor(limit)))
+    return threads
+
+
+def configure_torch_threads() -> tuple[int, int]:
+    """
+    Потоки torch под квоту контейнера: при cpus: 1.00 по умолчанию torch
+    берёт все ядра хоста и дерётся за один CPU. Возвращает (intra, inter).
+    """
+    import torch
+
+    intra = torch_thread_budget()
+    inter = max(1, Config.TTS_TORCH_INTEROP_THREADS)
+    torch.set_num_threads(intra)
+    try:
+        torch.set_num_interop_threads(inter)
+    except RuntimeError:
+        # Допустимо только до первой параллельной работы torch в процессе.
+        inter = torch.get_num_interop_threads()
+    logger.info("Потоки torch: intra-op %s, inter-op %s", intra, inter)
+    return intra, inter
+
+
+def _cache_path(model_id: str, mode: str, weights: str) -> Path:
+    import torch
+
+    # weights — sha256 снимка: подменённый TTS_MODEL_PATH под тем же model_id
+    # не подхватит модуль, оптимизированный из прежних весов.
+    name = f"{model_id}-{weights[:16]}-{mode}-torch{torch.__version__.split('+')[0]}.pt"
+    return Path(Config.TTS_ENGINE_CACHE_DIR) / name
+
+
+def _quantize(module):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(
+        module, {torch.nn.Linear, torch.nn.LSTM}, dtype=torch.qint8
+    )
+
+
+def _freeze(module):
+    import torch
+
+    if not isinstance(module, torch.jit.ScriptModule):
+        module = torch.jit.script(module)
+    frozen = torch.jit.freeze(module.eval())
+    return torch.jit.optimize_for_inference(frozen)
+
+
+def _build(module, mode: str):
+    if mode in ("int8", "int8_frozen"):
+        module = _quantize(module)
+    if mode in ("frozen", "int8_frozen"):
+        module = _freeze(module)
+    return module
+
+
+def _probe(model) -> None:
+    """Пробный синтез: оптимизированный модуль должен отработать apply_tts целиком."""
+    model.apply_tts(
+        text="Проверка связи.",
+        speaker=model.speakers[0],
+        sample_rate=Config.TTS_SAMPLE_RATE,
+    )
+
+
+def apply_engine_mode(
+    model, model_id: str, mode: str | None = None, *, weights: str = "hub"
+) -> str:
+    """
+    Подменяет внутренний модуль Silero (model.model) оптимизированным.
+
+    Результат TorchScript сохраняется в TTS_ENGINE_CACHE_DIR (имя включает
+    weights — sha256 снимка модели или "hub") и при следующем запуске
+    грузится без повторной оптимизации. Если режим к модулю не
+    применим — остаётся float; возвращает фактически включённый режим.
+    """
+    mode = (mode or Config.TTS_ENGINE_MODE).lower()
+    if mode not in ENGINE_MODES:
+        logger.warning(f"Неизвестный TTS_ENGINE_MODE={mode} — используется float")
+        return "float"
+    if mode == "float":
+        return mode
+    import torch
+
+    inner = getattr(model, "model", None)
+    if not isinstance(inner, torch.nn.Module):
+        logger.warning(f"Режим {mode} не поддерживается моделью — используется float")
+        return "float"
+
+    path = _cache_path(model_id, mode, weights)
+    if path.exists():
+        try:
+            model.model = torch.jit.load(str(path), map_location="cpu")
+            _probe(model)
+            logger.info(f"TTS-движок {mode} загружен из {path}")
+            return mode
+        except Exception as e:
+            model.model = inner
+            logger.warning(f"Кэш TTS-движка {path} не читается: {e}")
+
+    try:
+        optimized = _build(inner.eval(), mode)
+        model.model = optimized
+        _probe(model)
+    except Exception as e:
+        model.model = inner
+        logger.warning(f"Не удалось подготовить TTS-движок {mode}: {e} — используется float")
+        return "float"
+    if isinstance(optimized, torch.jit.ScriptModule):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            part_path = path.with_name(f"{path.name}.part")
+            torch.jit.save(optimized, str(part_path))
+            os.replace(part_path, path)
+            logger.info(f"TTS-движок {mode} сохранён в {path}")
+        except Exception as e:
+            logger.warning(f"Не удалось сохранить TTS-движок {mode}: {e}")
+    return mode
@@ -0,0 +1,176 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from core.config import Config
+from core.logger import logger
+from core.metrics import metrics
+from speech.tts_engine import torch_thread_budget
+
+_worker_synthesizer = None
+
+
+def _init_worker(torch_threads: int) -> None:
+    """Процесс-воркер: своя модель, свои потоки torch, без кэша звука."""
+    global _worker_synthesizer
+    Config.TTS_WORKER_BACKEND = "thread"
+    Config.TTS_AUDIO_CACHE_MEMORY_MB = 0
+    Config.TTS_AUDIO_CACHE_DISK_MB = 0
+    Config.TTS_TORCH_THREADS = torch_threads
+    Config.TTS_TORCH_INTEROP_THREADS = 1
+    from speech.speech_synthesizer import SpeechSynthesizer
+
+    _worker_synthesizer = SpeechSynthesizer()
+    _worker_synthesizer.warm_up()
+
+
+def _worker_info() -> tuple[str, list[str]]:
+    return _worker_synthesizer.engine_mode, list(_worker_synthesizer.available_speakers)
+
+
+def _release(handles: list[tuple[str, int]]) -> None:
+    for name, _size in handles:
+        try:
+            shm = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        shm.close()
+        shm.unlink()
+
+
+def _worker_synthesize(
+    texts: list[str], speaker: str
+) -> tuple[list[tuple[str, int]], float, float]:
+    """
+    Синтез в воркере; звук — в shared memory, обратно уходят только имена
+    и секунды речи/срезанной тишины для метрик родителя.
+    """
+    synthesizer = _worker_synthesizer
+    if speaker in synthesizer.available_speakers:
+        synthesizer.speaker = speaker
+    speech_before = metrics.tts_speech_seconds_total
+    trimmed_before = metrics.tts_trimmed_seconds_total
+    handles: list[tuple[str, int]] = []
+    try:
+        for audio in synthesizer._synthesize_chunks(texts):
+            audio = np.ascontiguousarray(audio, dtype=np.float32)
+            shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+            np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+            handles.append((shm.name, audio.size))
+            shm.close()
+    except BaseException:
+        _release(handles)
+        raise
+    return (
+        handles,
+        metrics.tts_speech_seconds_total - speech_before,
+        metrics.tts_trimmed_seconds_total - trimmed_before,
+    )
+
+
+def _take(handles: list[tuple[str, int]]) -> list[np.ndarray]:
+    result = []
+    for name, size in handles:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            result.append(
+                np.ndarray((size,), dtype=np.float32, buffer=shm.buf).copy()
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+    return result
+
+
+def _discard_result(future) -> None:
+    """Ответ, который уже никто не ждёт: освобождаем его shared memory."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    _release(future.result()[0])
+
+
+class TtsProcessPool:
+    """
+    Пул процессов Silero: у каждого воркера своя модель, GIL не общий.
+
+    Звук возвращается через multiprocessing.shared_memory — по сети процессов
+    идут только имена сегментов, а не pickle массивов. Упавший воркер ломает
+    ProcessPoolExecutor — пул пересоздаётся и запрос повторяется один раз.
+    Вызовы блокирующие: рассчитаны на потоки _executor синтезатора.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self._workers = max(1, workers)
+        self._torch_threads = max(1, torch_thread_budget() // self._workers)
+        self._lock = threading.Lock()
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: fork процесса с уже поднятым torch небезопасен.
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self._torch_threads,),
+        )
+
+    def _current(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._new_pool()
+            return self._pool
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is not broken:
+                return
+            self._pool = None
+        logger.warning("TTS-воркер завершился аварийно — пул процессов перезапущен")
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> tuple[str, list[str]]:
+        """Поднимает воркеры и ждёт загрузки моделей: (режим движка, голоса)."""
+        pool = self._current()
+        futures = [pool.submit(_worker_info) for _ in range(self._workers)]
+        infos = [future.result() for future in futures]
+        logger.info(
+            "Пул TTS-процессов: %s воркеров по %s потоков torch",
+            self._workers,
+            self._torch_threads,
+        )
+        return infos[0]
+
+    def synthesize(
+        self, texts: list[str], speaker: str, timeout: float | None = None
+    ) -> list[np.ndarray]:
+        for _attempt in range(2):
+            pool = self._current()
+            try:
+                future = pool.submit(_worker_synthesize, texts, speaker)
+            except BrokenProcessPool:
+                self._restart(pool)
+                continue
+            try:
+                handles, speech, trimmed = future.result(timeout=timeout)
+            except BrokenProcessPool:
+                self._restart(pool)
+                continue
+            except FutureTimeoutError:
+                # Ещё в очереди — снимаем; уже считается — ответ выбросим по готовности.
+                if not future.cancel():
+                    future.add_done_callback(_discard_result)
+                raise TimeoutError("TTS-воркер не ответил вовремя")
+            metrics.observe_tts_post(speech, trimmed)
+            return _take(handles)
+        raise RuntimeError("Пул TTS-процессов не удалось восстановить")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
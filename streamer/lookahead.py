@@ -0,0 +1,83 @@
+import asyncio
+from collections import OrderedDict
+
+import numpy as np
+
+from core.logger import logger
+from speech.speech_synthesizer import SpeechSynthesizer
+
+
+class SpeechLookahead:
+    """
+    Упреждающий синтез следующих реплик монолога, пока звучит текущая.
+    Синтезу текущей реплики и ответа чату он уступает: новый фрагмент
+    начинается, только когда тот закончен (см. SpeechSynthesizer).
+
+    Очередь Redis не трогаем — только смотрим на её голову (peek), поэтому
+    захват и ack реплик не меняются. Готовый звук лежит под ключом
+    (текст, ревизия темы): реплика, которая в итоге не пришла, просто
+    вытесняется, а смена автора или вытеснение чатом сбрасывают буфер.
+    """
+
+    def __init__(self, synthesizer: SpeechSynthesizer, depth: int) -> None:
+        self._synthesizer = synthesizer
+        self._depth = max(0, depth)
+        self._buffers: OrderedDict[tuple[str, int], asyncio.Task] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._depth > 0
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    def schedule(self, upcoming: list[tuple[str, int]]) -> None:
+        """Ставит в синтез ближайшие реплики; лишние буферы вытесняются."""
+        wanted = list(dict.fromkeys(upcoming))[: self._depth]
+        for key in [key for key in self._buffers if key not in wanted]:
+            self._drop(key)
+        for key in wanted:
+            if key not in self._buffers:
+                self._buffers[key] = asyncio.create_task(
+                    self._synthesizer.synthesize_clip_async(key[0])
+                )
+
+    async def take(self, text: str, revision: int) -> np.ndarray | None:
+        """Готовый звук реплики; если синтез ещё идёт — дожидаемся его."""
+        task = self._buffers.pop((text, revision), None)
+        if task is None:
+            return None
+        try:
+            return await task
+        except asyncio.CancelledError:
+            if task.cancelled():
+                return None
+            raise
+        except Exception as exc:
+            logger.warning("Упреждающий синтез не удался: %s", exc)
+            return None
+
+    def discard_older_than(self, revision: int) -> int:
+        """Смена автора: звук реплик прежней темы больше не нужен."""
+        stale = [key for key in self._buffers if key[1] < revision]
+        for key in stale:
+            self._drop(key)
+        return len(stale)
+
+    def clear(self) -> int:
+        dropped = len(self._buffers)
+        for key in list(self._buffers):
+            self._drop(key)
+        return dropped
+
+    def _drop(self, key: tuple[str, int]) -> None:
+        task = self._buffers.pop(key, None)
+        if task is None:
+            return
+        if not task.done():
+            # Отмена ожидания останавливает и поток синтеза — перед следующим
+            # фрагментом (synthesize_clip_async); текущий фрагмент отбросится.
+            task.cancel()
+        elif not task.cancelled():
+            task.exception()
@@ -6,11 +6,15 @@ from core.worker_epoch import retire_stale_worker
 from core.config import Config
 from core.disk_guard import DiskGuard
 from core.logger import logger
-from core.chat_queue import has_actionable_chat_messages
+from core.chat_queue import snapshot_has_actionable_chat
+from core.metrics import metrics
+from redis_client.control_snapshot import ControlSnapshot, ControlSnapshotReader
 from redis_client.redis_manager import RedisManager
+from redis_client.revision_watcher import RevisionWatcher
 from redis_client.topic_control_store import TopicControlStore
 from redis_client.visual_overlay_store import VisualOverlayStore
 from speech.speech_synthesizer import SpeechSynthesizer
+from streamer.lookahead import SpeechLookahead
 
 
 class Streamer:
@@ -22,19 +26,30 @@ class Streamer:
         self.redis_manager = redis_manager
         self.visual_overlay_store = VisualOverlayStore(redis_manager.redis_client)
         self.topic_store = TopicControlStore(redis_manager.redis_client)
+        self.snapshot_reader = ControlSnapshotReader(redis_manager)
+        self.revision_watcher = RevisionWatcher(redis_manager.redis_client)
         self.speech_synthesizer = SpeechSynthesizer()
         self._topic_intro_prefix = "Следующая тема: "
         self._file_output = Config.TTS_OUTPUT_MODE == "file"
         self._tts_lock = asyncio.Semaphore(Config.TTS_MAX_CONCURRENCY)
         self._cleanup_interval = max(60, Config.TTS_TEMP_MAX_AGE_MINUTES * 30)
         self._reacted_stale_since: float | None = None
+        self._playing_podcast_rev: int | None = None
+        # Файловый режим и так развязан с плеером — упреждение только для колонок.
+        self.lookahead = SpeechLookahead(
+            self.speech_synthesizer,
+            0 if self._file_output else Config.TTS_LOOKAHEAD_SENTENCES,
+        )
+        self._gap_from: float | None = None
 
-    async def _recover_stale_reacted_queue(self) -> None:
-        length = await self.redis_manager.get_reacted_to_chat_messages_queue_length()
-        if length <= 0:
+    async def _recover_stale_reacted_queue(self, snapshot: ControlSnapshot) -> None:
+        if self.redis_manager.uses_tts_streams:
+            # Streams: неподтверждённые реплики переживают падение, эвристика не нужна.
+            return
+        if snapshot.reacted_queue_length <= 0:
             self._reacted_stale_since = None
             return
-        if await self.redis_manager.is_tts_busy():
+        if snapshot.tts_busy:
             self._reacted_stale_since = None
             return
 
@@ -56,12 +71,21 @@ class Streamer:
             dropped,
         )
 
-    async def _synthesize(self, text: str) -> None:
+    @staticmethod
+    def _observe_dwell(kind: str, enqueued_at: float | None) -> None:
+        if enqueued_at is not None:
+            metrics.tts_queue_dwell_seconds.observe(
+                max(0.0, time.time() - enqueued_at), kind
+            )
+
+    async def _synthesize(self, text: str, audio=None) -> None:
         """Озвучивает одну реплику (обычно одно предложение из очереди)."""
         async with self._tts_lock:
             await self.redis_manager.set_tts_busy(True)
             try:
-                if self._file_output:
+                if audio is not None:
+                    await self.speech_synthesizer.play_clip_async(audio)
+                elif self._file_output:
                     await self.speech_synthesizer.synthesize_to_file_async(text)
                 else:
                     await self.speech_synthesizer.synthesize_and_play_async(text)
@@ -77,15 +101,16 @@ class Streamer:
                 app_state.monologues_enabled = False
             await asyncio.sleep(self._cleanup_interval)
 
-    async def _chat_has_priority(self) -> bool:
+    @staticmethod
+    def _chat_has_priority(snapshot: ControlSnapshot) -> bool:
         return (
-            await has_actionable_chat_messages(self.redis_manager)
-            or await self.redis_manager.get_reacted_to_chat_messages_queue_length() > 0
+            snapshot_has_actionable_chat(snapshot)
+            or snapshot.reacted_queue_length > 0
         )
 
-    async def _on_chat_playback_finished(self) -> None:
+    async def _on_chat_playback_finished(self, snapshot: ControlSnapshot) -> None:
         """Чат озвучен — убираем оверлей комментария, опционально возвращаемся к теме."""
-        if await self.redis_manager.is_chat_processing():
+        if snapshot.chat_processing:
             return
 
         await self.visual_overlay_store.clear_chat_overlay()
@@ -93,105 +118,214 @@ class Streamer:
         transition = Config.CHAT_RETURN_TRANSITION
         if not transition:
             return
-        if await has_actionable_chat_messages(self.redis_manager):
+        if self._chat_has_priority(snapshot):
             return
-        if await self.redis_manager.get_reacted_to_chat_messages_queue_length() > 0:
-            return
-        rev = await self.topic_store.get_topic_revision()
         await self.redis_manager.add_podcast_message(
-            transition, priority=True, topic_revision=rev
+            transition, priority=True, topic_revision=snapshot.topic_revision
         )
         logger.info("Возврат к теме: %s", transition)
 
-    async def run(self):
-        cleanup_task = asyncio.create_task(self._cleanup_loop())
+    def _preempt_lookahead(self) -> None:
+        """Чат перебивает монолог — заготовленный звук следующих реплик не нужен."""
+        self._gap_from = None
+        dropped = self.lookahead.clear()
+        if dropped:
+            logger.info("Упреждающий синтез сброшен ради чата: %s реплик", dropped)
+
+    async def _prefetch_upcoming(self) -> bool:
+        """Заказывает синтез следующих реплик; True — очередь монолога не пуста."""
+        raw = await self.redis_manager.peek_podcast_messages(
+            max(1, self.lookahead.depth)
+        )
+        if self.lookahead.enabled:
+            current_rev = self.revision_watcher.current
+            upcoming = []
+            for payload in raw:
+                text, rev, _enqueued_at = self.redis_manager.decode_podcast_entry(payload)
+                if rev >= current_rev:
+                    upcoming.append((text, rev))
+            self.lookahead.schedule(upcoming)
+        return bool(raw)
+
+    def _observe_gap(self) -> None:
+        started = self.speech_synthesizer.last_sound_started
+        if self._gap_from is not None and started is not None and started > self._gap_from:
+            metrics.tts_sentence_gap_seconds.observe(started - self._gap_from)
+
+    async def _play_reacted_message(self, msg_data) -> None:
+        self._preempt_lookahead()
+        text, enqueued_at = self.redis_manager.decode_reacted_message(msg_data)
+        logger.info(f"Реакция на чат: {text}")
+        is_citation = " пишет в чате: " in text
         try:
-            while not app_state.shutting_down:
-                app_state.touch_heartbeat()
-                if await retire_stale_worker(self.redis_manager, "streamer"):
-                    break
-                await self._recover_stale_reacted_queue()
-                processed = False
-
-                while (
-                    not app_state.shutting_down
-                    and await self.redis_manager.get_reacted_to_chat_messages_queue_length()
-                    > 0
-                ):
-                    processed = True
+            if is_citation and Config.CHAT_TTS_PRE_PAUSE_SECONDS > 0:
+                await asyncio.sleep(Config.CHAT_TTS_PRE_PAUSE_SECONDS)
+            self._observe_dwell("reacted", enqueued_at)
+            await self._synthesize(text)
+            self._reacted_stale_since = None
+            await self.redis_manager.ack_tts_message("reacted")
+            snapshot = await self.snapshot_reader.read()
+            if snapshot.reacted_queue_length == 0:
+                await self._on_chat_playback_finished(snapshot)
+                if not is_citation and Config.CHAT_TTS_POST_PAUSE_SECONDS > 0:
+                    await asyncio.sleep(Config.CHAT_TTS_POST_PAUSE_SECONDS)
+        except asyncio.TimeoutError:
+            await self.redis_manager.ack_tts_message("reacted")
+            logger.error("TTS timeout — реплика пропущена")
+
+    async def _play_podcast_message(self, msg_data, current_rev: int) -> None:
+        text, msg_rev, enqueued_at = self.redis_manager.decode_podcast_entry(msg_data)
+        current_rev = max(current_rev, self.revision_watcher.current)
+        if msg_rev < current_rev:
+            logger.info(
+                "Пропуск устаревшей реплики (rev %s < %s): %s",
+                msg_rev,
+                current_rev,
+                text[:80],
+            )
+            await self.redis_manager.ack_tts_message("podcast")
+            return
+        await self.visual_overlay_store.clear_chat_overlay()
+        logger.info(f"Монолог: {text}")
+        if text.startswith(self._topic_intro_prefix):
+            on_air_topic = text[len(self._topic_intro_prefix) :].strip()
+            if on_air_topic:
+                await self.topic_store.set_current_topic(on_air_topic, notify=False)
+        self._playing_podcast_rev = msg_rev
+        self._observe_dwell("podcast", enqueued_at)
+        audio = None
+        if self.lookahead.enabled:
+            audio = await self.lookahead.take(text, msg_rev)
+            metrics.tts_lookahead_total.inc("hit" if audio is not None else "miss")
+        has_next = False
+        try:
+            has_next = await self._prefetch_upcoming()
+            await self._synthesize(text, audio)
+            self._observe_gap()
+        except asyncio.TimeoutError:
+            logger.error("TTS timeout — монолог пропущен")
+        finally:
+            self._playing_podcast_rev = None
+        # Тишину меряем, только если следующая реплика уже ждала в очереди.
+        self._gap_from = time.perf_counter() if has_next else None
+        await self.redis_manager.ack_tts_message("podcast")
+
+    async def _interrupt_on_revision_change(self) -> None:
+        """Смена автора (!set_topic) обрывает уже звучащую реплику монолога."""
+        while not app_state.shutting_down:
+            revision = await self.revision_watcher.wait_newer(
+                self.revision_watcher.current
+            )
+            dropped = self.lookahead.discard_older_than(revision)
+            if dropped:
+                logger.info("Упреждающий синтез прежней темы отброшен: %s", dropped)
+            playing = self._playing_podcast_rev
+            if playing is not None and playing < revision:
+                logger.info("Реплика прервана — автор сменился (rev %s)", revision)
+                self.speech_synthesizer.stop_playback()
+
+    async def _run_polling(self) -> None:
+        """Прежний режим: опрос длин очередей с паузами STREAMER_POLL_INTERVAL."""
+        while not app_state.shutting_down:
+            app_state.touch_heartbeat()
+            loop_started = time.perf_counter()
+            snapshot = await self.snapshot_reader.read()
+            metrics.observe_control_loop(time.perf_counter() - loop_started)
+            if await retire_stale_worker(
+                self.redis_manager, "streamer", current_epoch=snapshot.stream_epoch
+            ):
+                break
+            await self._recover_stale_reacted_queue(snapshot)
+            processed = False
+
+            if snapshot.reacted_queue_length > 0:
+                while not app_state.shutting_down:
                     msg_data = await self.redis_manager.get_reacted_to_chat_message()
                     if not msg_data:
-                        continue
-                    text = (
-                        msg_data.decode("utf-8")
-                        if isinstance(msg_data, bytes)
-                        else msg_data
-                    )
-                    logger.info(f"Реакция на чат: {text}")
-                    is_citation = " пишет в чате: " in text
-                    try:
-                        if is_citation and Config.CHAT_TTS_PRE_PAUSE_SECONDS > 0:
-                            await asyncio.sleep(Config.CHAT_TTS_PRE_PAUSE_SECONDS)
-                        await self._synthesize(text)
-                        self._reacted_stale_since = None
-                        remaining = (
-                            await self.redis_manager.get_reacted_to_chat_messages_queue_length()
-                        )
-                        if remaining == 0:
-                            await self._on_chat_playback_finished()
-                            if (
-                                not is_citation
-                                and Config.CHAT_TTS_POST_PAUSE_SECONDS > 0
-                            ):
-                                await asyncio.sleep(
-                                    Config.CHAT_TTS_POST_PAUSE_SECONDS
-                                )
-                    except asyncio.TimeoutError:
-                        logger.error("TTS timeout — реплика пропущена")
-
-                if (
-                    not app_state.shutting_down
-                    and app_state.monologues_enabled
-                    and await self.redis_manager.get_podcast_messages_queue_length() > 0
-                ):
-                    if await self._chat_has_priority():
-                        processed = True
-                        await asyncio.sleep(Config.CHAT_POLL_INTERVAL_SECONDS)
-                        continue
+                        break
                     processed = True
-                    msg_data = await self.redis_manager.get_podcast_message()
-                    if msg_data:
-                        text, msg_rev = self.redis_manager.decode_podcast_message(
-                            msg_data
-                        )
-                        current_rev = await self.topic_store.get_topic_revision()
-                        if msg_rev < current_rev:
-                            logger.info(
-                                "Пропуск устаревшей реплики (rev %s < %s): %s",
-                                msg_rev,
-                                current_rev,
-                                text[:80],
-                            )
-                            continue
-                        await self.visual_overlay_store.clear_chat_overlay()
-                        logger.info(f"Монолог: {text}")
-                        if text.startswith(self._topic_intro_prefix):
-                            on_air_topic = text[len(self._topic_intro_prefix) :].strip()
-                            if on_air_topic:
-                                await self.topic_store.set_current_topic(
-                                    on_air_topic, notify=False
-                                )
-                        try:
-                            await self._synthesize(text)
-                        except asyncio.TimeoutError:
-                            logger.error("TTS timeout — монолог пропущен")
-
-                if not processed:
-                    await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+                    await self._play_reacted_message(msg_data)
+                if processed:
+                    snapshot = await self.snapshot_reader.read()
+
+            if (
+                not app_state.shutting_down
+                and app_state.monologues_enabled
+                and snapshot.podcast_queue_length > 0
+            ):
+                if self._chat_has_priority(snapshot):
+                    processed = True
+                    self._preempt_lookahead()
+                    await asyncio.sleep(Config.CHAT_POLL_INTERVAL_SECONDS)
+                    continue
+                processed = True
+                msg_data = await self.redis_manager.get_podcast_message()
+                if msg_data:
+                    await self._play_podcast_message(
+                        msg_data, snapshot.topic_revision
+                    )
+
+            if not processed:
+                await asyncio.sleep(Config.STREAMER_POLL_INTERVAL)
+
+    async def _run_blocking(self) -> None:
+        """
+        BLPOP по очередям озвучки: в простое нет ни опроса, ни sleep.
+        Пока чат ждёт ответа, блокируемся только на очереди ответов чата.
+        """
+        chat_pending = False
+        while not app_state.shutting_down:
+            app_state.touch_heartbeat()
+            if await retire_stale_worker(self.redis_manager, "streamer"):
+                break
+
+            include_podcast = app_state.monologues_enabled and not chat_pending
+            timeout = (
+                Config.CHAT_POLL_INTERVAL_SECONDS
+                if chat_pending
+                else Config.STREAMER_BLOCK_TIMEOUT_SECONDS
+            )
+            popped = await self.redis_manager.pop_tts_message_blocking(
+                include_podcast=include_podcast,
+                timeout=timeout,
+            )
+            if popped is None:
+                if chat_pending:
+                    snapshot = await self.snapshot_reader.read()
+                    chat_pending = self._chat_has_priority(snapshot)
+                continue
+
+            kind, msg_data = popped
+            if kind == "reacted":
+                await self._play_reacted_message(msg_data)
+                continue
+
+            snapshot = await self.snapshot_reader.read()
+            if self._chat_has_priority(snapshot):
+                # Чат ещё не ответил — возвращаем реплику в голову очереди.
+                await self.redis_manager.requeue_tts_message("podcast", msg_data)
+                self._preempt_lookahead()
+                chat_pending = True
+                continue
+            chat_pending = False
+            await self._play_podcast_message(msg_data, snapshot.topic_revision)
+
+    async def run(self):
+        cleanup_task = asyncio.create_task(self._cleanup_loop())
+        await self.revision_watcher.start()
+        interrupt_task = asyncio.create_task(self._interrupt_on_revision_change())
+        try:
+            if Config.STREAMER_CONSUME_MODE == "poll":
+                await self._run_polling()
+            else:
+                await self._run_blocking()
         finally:
-            cleanup_task.cancel()
-            try:
-                await cleanup_task
-            except asyncio.CancelledError:
-                pass
+            for task in (cleanup_task, interrupt_task):
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self.lookahead.clear()
+            await self.revision_watcher.stop()
             DiskGuard.cleanup_tts_directory()
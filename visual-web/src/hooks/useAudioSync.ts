@@ -37,27 +37,24 @@ function rmsEnvelope(samples: Float32Array, sampleRate: number, fps: number): Fl
   return out;
 }
 
-async function decodeMonoSamples(url: string): Promise<{ samples: Float32Array; sampleRate: number }> {
-  const res = await fetch(url);
-  const buf = await res.arrayBuffer();
-  const ctx = new AudioContext();
-  try {
-    const audio = await ctx.decodeAudioData(buf.slice(0));
-    const ch = audio.numberOfChannels > 1 ? 1 : 0;
-    const data = audio.getChannelData(ch);
-    if (audio.numberOfChannels > 1) {
-      const mixed = new Float32Array(audio.length);
-      for (let c = 0; c < audio.numberOfChannels; c++) {
-        const channel = audio.getChannelData(c);
-        for (let i = 0; i < audio.length; i++) mixed[i] += channel[i];
-      }
-      for (let i = 0; i < mixed.length; i++) mixed[i] /= audio.numberOfChannels;
-      return { samples: mixed, sampleRate: audio.sampleRate };
+function monoSamples(audio: AudioBuffer): Float32Array {
+  if (audio.numberOfChannels > 1) {
+    const mixed = new Float32Array(audio.length);
+    for (let c = 0; c < audio.numberOfChannels; c++) {
+      const channel = audio.getChannelData(c);
+      for (let i = 0; i < audio.length; i++) mixed[i] += channel[i];
     }
-    return { samples: new Float32Array(data), sampleRate: audio.sampleRate };
-  } finally {
-    await ctx.close();
+    for (let i = 0; i < mixed.length; i++) mixed[i] /= audio.numberOfChannels;
+    return mixed;
   }
+  return audio.getChannelData(0);
+}
+
+/** Один запрос и одно декодирование (WAV / OGG Opus / FLAC) — и для огибающей, и для звука. */
+async function fetchAudioBuffer(url: string, ctx: BaseAudioContext): Promise<AudioBuffer> {
+  const res = await fetch(url);
+  if (!res.ok) throw new Error(`HTTP ${res.status}`);
+  return ctx.decodeAudioData(await res.arrayBuffer());
 }
 
 export interface AudioSyncResult {
@@ -122,27 +119,30 @@ export function useAudioSync(
       if (wavActiveRef.current) return;
       const url = `/api/wav/${encodeURIComponent(filename)}`;
       try {
-        const { samples, sampleRate } = await decodeMonoSamples(url);
-        wavEnvelopeRef.current = rmsEnvelope(samples, sampleRate, targetFps);
-        wavDurationRef.current = (samples.length / sampleRate) * 1000;
+        if (playAudio && !audioCtxRef.current) {
+          audioCtxRef.current = new AudioContext();
+          analyserRef.current = audioCtxRef.current.createAnalyser();
+          analyserRef.current.fftSize = 256;
+          analyserRef.current.connect(audioCtxRef.current.destination);
+        }
+        const decodeCtx = playAudio ? audioCtxRef.current! : new AudioContext();
+        let audioBuffer: AudioBuffer;
+        try {
+          audioBuffer = await fetchAudioBuffer(url, decodeCtx);
+        } finally {
+          if (!playAudio) await decodeCtx.close();
+        }
+        wavEnvelopeRef.current = rmsEnvelope(monoSamples(audioBuffer), audioBuffer.sampleRate, targetFps);
+        wavDurationRef.current = audioBuffer.duration * 1000;
         wavStartRef.current = performance.now();
         wavActiveRef.current = true;
         playedRef.current.add(filename);
 
         if (playAudio) {
-          if (!audioCtxRef.current) {
-            audioCtxRef.current = new AudioContext();
-            analyserRef.current = audioCtxRef.current.createAnalyser();
-            analyserRef.current.fftSize = 256;
-            analyserRef.current.connect(audioCtxRef.current.destination);
-          }
-          const ctx = audioCtxRef.current;
+          const ctx = audioCtxRef.current!;
           if (ctx.state === "suspended") await ctx.resume();
 
           sourceRef.current?.stop();
-          const res = await fetch(url);
-          const buf = await res.arrayBuffer();
-          const audioBuffer = await ctx.decodeAudioData(buf.slice(0));
           const source = ctx.createBufferSource();
           source.buffer = audioBuffer;
           source.connect(analyserRef.current!);
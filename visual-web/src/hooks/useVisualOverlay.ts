@@ -14,45 +14,81 @@ export interface VisualOverlayData {
 
 const EMPTY: VisualOverlayData = { topic: "", imageUrl: "", quote: "", chat: null };
 
+function parseOverlay(raw: Partial<VisualOverlayData>): VisualOverlayData {
+  const topic = typeof raw.topic === "string" ? raw.topic.trim() : "";
+  const imageUrl = typeof raw.imageUrl === "string" ? raw.imageUrl.trim() : "";
+  const quote = typeof raw.quote === "string" ? raw.quote.trim() : "";
+  let chat: ChatOverlay | null = null;
+  if (
+    raw.chat &&
+    typeof raw.chat === "object" &&
+    typeof raw.chat.author === "string" &&
+    typeof raw.chat.content === "string"
+  ) {
+    const author = raw.chat.author.trim();
+    const content = raw.chat.content.trim();
+    if (author || content) {
+      chat = { author, content };
+    }
+  }
+  return { topic, imageUrl, quote, chat };
+}
+
+/**
+ * Оверлей по SSE (/api/overlay/stream); если EventSource недоступен или
+ * соединение рвётся — опрос /api/overlay раз в pollMs, пока поток не вернётся.
+ */
 export function useVisualOverlay(pollMs = 800): VisualOverlayData {
   const [data, setData] = useState<VisualOverlayData>(EMPTY);
 
   useEffect(() => {
     let cancelled = false;
+    let pollId: number | undefined;
+    let source: EventSource | null = null;
 
     const poll = async () => {
       try {
         const res = await fetch("/api/overlay");
         if (!res.ok || cancelled) return;
-        const raw = (await res.json()) as Partial<VisualOverlayData>;
-        const topic = typeof raw.topic === "string" ? raw.topic.trim() : "";
-        const imageUrl =
-          typeof raw.imageUrl === "string" ? raw.imageUrl.trim() : "";
-        const quote = typeof raw.quote === "string" ? raw.quote.trim() : "";
-        let chat: ChatOverlay | null = null;
-        if (
-          raw.chat &&
-          typeof raw.chat === "object" &&
-          typeof raw.chat.author === "string" &&
-          typeof raw.chat.content === "string"
-        ) {
-          const author = raw.chat.author.trim();
-          const content = raw.chat.content.trim();
-          if (author || content) {
-            chat = { author, content };
-          }
-        }
-        setData({ topic, imageUrl, quote, chat });
+        setData(parseOverlay((await res.json()) as Partial<VisualOverlayData>));
       } catch {
         /* ignore */
       }
     };
 
-    poll();
-    const id = window.setInterval(poll, pollMs);
+    const startPolling = () => {
+      if (pollId !== undefined) return;
+      poll();
+      pollId = window.setInterval(poll, pollMs);
+    };
+
+    const stopPolling = () => {
+      if (pollId === undefined) return;
+      clearInterval(pollId);
+      pollId = undefined;
+    };
+
+    if (typeof EventSource === "undefined") {
+      startPolling();
+    } else {
+      source = new EventSource("/api/overlay/stream");
+      source.onopen = stopPolling;
+      source.onmessage = (event) => {
+        if (cancelled) return;
+        try {
+          setData(parseOverlay(JSON.parse(event.data) as Partial<VisualOverlayData>));
+        } catch {
+          /* ignore */
+        }
+      };
+      // EventSource переподключается сам; пока его нет — опрашиваем.
+      source.onerror = startPolling;
+    }
+
     return () => {
       cancelled = true;
-      clearInterval(id);
+      source?.close();
+      stopPolling();
     };
   }, [pollMs]);
 
@@ -0,0 +1,139 @@
+"""Состояние оверлея визуала: pub/sub Redis → память → SSE-клиенты."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+from core.config import Config
+from redis_client.control_snapshot import ControlSnapshotReader
+from redis_client.redis_manager import RedisManager
+from redis_client.visual_overlay_store import VisualOverlayStore, overlay_events_channel
+
+logger = logging.getLogger(__name__)
+
+EMPTY_OVERLAY = {"topic": "", "imageUrl": "", "quote": "", "chat": None}
+
+
+class OverlayHub:
+    """
+    Держит последнее состояние оверлея и рассылает его подписчикам.
+
+    Redis читается только по событию из OVERLAY_EVENTS_CHANNEL (с дребезгом)
+    и раз в VISUAL_OVERLAY_REFRESH_SECONDS — страховка на случай потерянного
+    сообщения. Очередь ответов чата и chat_processing публикуют событие
+    "chat" при каждом изменении (RedisManager), так что показ чата не ждёт
+    этой страховки.
+    """
+
+    _DEBOUNCE_SECONDS = 0.05
+
+    def __init__(self, redis_manager: RedisManager) -> None:
+        self._redis_manager = redis_manager
+        self._snapshot_reader = ControlSnapshotReader(redis_manager)
+        self._state: dict = dict(EMPTY_OVERLAY)
+        self._subscribers: set[asyncio.Queue] = set()
+        self._changed = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def state(self) -> dict:
+        return self._state
+
+    async def start(self) -> None:
+        if self._redis_manager.redis_client is None:
+            return
+        await self._refresh()
+        self._tasks = [
+            asyncio.create_task(self._listen_loop()),
+            asyncio.create_task(self._refresh_loop()),
+        ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def _read_state(self) -> dict:
+        snapshot = await self._snapshot_reader.read()
+        overlay_store = VisualOverlayStore(self._redis_manager.redis_client)
+        image_url, quote, chat = await overlay_store.get_overlay_fields()
+        topic = snapshot.current_topic
+        if not quote:
+            topic = ""
+            image_url = None
+        chat_active = snapshot.reacted_queue_length > 0 or snapshot.chat_processing
+        return {
+            "topic": topic,
+            "imageUrl": image_url or "",
+            "quote": quote or "",
+            "chat": chat if chat_active else None,
+        }
+
+    async def _refresh(self) -> None:
+        try:
+            state = await self._read_state()
+        except Exception:
+            logger.exception("Ошибка чтения overlay из Redis")
+            return
+        if state == self._state:
+            return
+        self._state = state
+        for queue in self._subscribers:
+            # Клиенту нужно только последнее состояние — старое вытесняем.
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(state)
+
+    async def _listen_loop(self) -> None:
+        while True:
+            pubsub = self._redis_manager.redis_client.pubsub(
+                ignore_subscribe_messages=True
+            )
+            try:
+                await pubsub.subscribe(overlay_events_channel())
+                # Пока подписки не было, события могли потеряться.
+                self._changed.set()
+                while True:
+                    message = await pubsub.get_message(timeout=None)
+                    if message is not None:
+                        self._changed.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Подписка на события overlay прервана: %s", exc)
+                await asyncio.sleep(1.0)
+            finally:
+                await pubsub.aclose()
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._changed.wait(),
+                    timeout=Config.VISUAL_OVERLAY_REFRESH_SECONDS,
+                )
+                # Пачка изменений (цитата + картинка + тема) — одно чтение.
+                await asyncio.sleep(self._DEBOUNCE_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._changed.clear()
+            await self._refresh()
+
+
+def encode_sse(state: dict) -> bytes:
+    return f"data: {json.dumps(state, ensure_ascii=False)}\n\n".encode("utf-8")
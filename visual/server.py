@@ -1,66 +1,75 @@
-"""HTTP-сервер визуала: статика React + API для WAV и конфигурации."""
+"""HTTP-сервер визуала: статика React + API для аудиофайлов TTS и конфигурации."""
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from pathlib import Path
 
 from aiohttp import web
 
 from core.config import Config
+from core.dir_watcher import DirectoryWatcher
 from redis_client.redis_manager import RedisManager
-from redis_client.topic_control_store import TopicControlStore
-from redis_client.visual_overlay_store import VisualOverlayStore
+from visual.overlay_hub import EMPTY_OVERLAY, OverlayHub, encode_sse
 
 logger = logging.getLogger(__name__)
 
 PROJECT_DIR = Path(__file__).resolve().parent.parent
 DIST_DIR = PROJECT_DIR / "visual-web" / "dist"
+_SSE_HEARTBEAT_SECONDS = 15.0
 
 
-def _is_complete_wav(path: Path) -> bool:
-    if path.suffix.lower() != ".wav":
-        return False
-    return not path.with_suffix(".wav.part").exists()
-
-
-def _list_wav_files(watch_dir: Path) -> list[str]:
-    if not watch_dir.is_dir():
-        return []
-    files = [p.name for p in watch_dir.glob("*.wav") if _is_complete_wav(p)]
-    return sorted(files)
+def _audio_index() -> DirectoryWatcher:
+    """Индекс WAV / OGG (Opus) / FLAC из TTS_OUTPUT_DIR; маршрут /api/wav — прежний."""
+    return DirectoryWatcher.shared(Config.TTS_OUTPUT_DIR, Config.TTS_OUTPUT_SUFFIXES)
 
 
 async def handle_health(_request: web.Request) -> web.Response:
     return web.json_response({"status": "ok"})
 
 
+def _overlay_hub(request: web.Request) -> OverlayHub | None:
+    return request.app.get("overlay_hub")
+
+
 async def handle_overlay(request: web.Request) -> web.Response:
-    redis_manager: RedisManager | None = request.app.get("redis_manager")
-    if redis_manager is None or redis_manager.redis_client is None:
-        return web.json_response({"topic": "", "imageUrl": "", "quote": "", "chat": None})
+    hub = _overlay_hub(request)
+    return web.json_response(hub.state if hub is not None else EMPTY_OVERLAY)
+
+
+async def handle_overlay_stream(request: web.Request) -> web.StreamResponse:
+    """SSE: текущее состояние сразу, дальше — каждое изменение."""
+    hub = _overlay_hub(request)
+    response = web.StreamResponse(
+        headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
+    )
+    await response.prepare(request)
+    if hub is None:
+        await response.write(encode_sse(EMPTY_OVERLAY))
+        return response
 
-    topic_store = TopicControlStore(redis_manager.redis_client)
-    overlay_store = VisualOverlayStore(redis_manager.redis_client)
+    queue = hub.subscribe()
     try:
-        topic = await topic_store.get_current_topic()
-        image_url = await overlay_store.get_page_image() or ""
-        quote = await overlay_store.get_page_quote() or ""
-        if not quote:
-            topic = ""
-            image_url = ""
-        chat_active = (
-            await redis_manager.get_reacted_to_chat_messages_queue_length() > 0
-            or await redis_manager.is_chat_processing()
-        )
-        chat = await overlay_store.get_chat_overlay() if chat_active else None
-        if not chat_active:
-            await overlay_store.clear_chat_overlay()
-    except Exception:
-        logger.exception("Ошибка чтения overlay из Redis")
-        return web.json_response({"topic": "", "imageUrl": "", "quote": "", "chat": None})
-
-    return web.json_response({"topic": topic, "imageUrl": image_url, "quote": quote, "chat": chat})
+        await response.write(encode_sse(hub.state))
+        while True:
+            try:
+                state = await asyncio.wait_for(
+                    queue.get(), timeout=_SSE_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                await response.write(b": ping\n\n")
+                continue
+            await response.write(encode_sse(state))
+    except ConnectionResetError:
+        pass
+    finally:
+        hub.unsubscribe(queue)
+    return response
 
 
 async def handle_config(_request: web.Request) -> web.Response:
@@ -76,8 +85,7 @@ async def handle_config(_request: web.Request) -> web.Response:
 
 
 async def handle_wav_list(request: web.Request) -> web.Response:
-    watch_dir = Path(Config.TTS_OUTPUT_DIR)
-    return web.json_response(_list_wav_files(watch_dir))
+    return web.json_response(_audio_index().files())
 
 
 async def handle_wav_file(request: web.Request) -> web.Response:
@@ -85,8 +93,10 @@ async def handle_wav_file(request: web.Request) -> web.Response:
     if not filename or "/" in filename or "\\" in filename or ".." in filename:
         raise web.HTTPBadRequest(text="Invalid filename")
 
+    if filename not in _audio_index():
+        raise web.HTTPNotFound()
     path = Path(Config.TTS_OUTPUT_DIR) / filename
-    if not path.is_file() or not _is_complete_wav(path):
+    if not path.is_file():
         raise web.HTTPNotFound()
 
     return web.FileResponse(path)
@@ -106,6 +116,7 @@ def create_app() -> web.Application:
     app.router.add_get("/api/health", handle_health)
     app.router.add_get("/api/config", handle_config)
     app.router.add_get("/api/overlay", handle_overlay)
+    app.router.add_get("/api/overlay/stream", handle_overlay_stream)
     app.router.add_get("/api/wav/list", handle_wav_list)
     app.router.add_get("/api/wav/{filename}", handle_wav_file)
     app.router.add_get("/", handle_index)
@@ -133,8 +144,12 @@ async def serve_visual(host: str, port: int) -> None:
     except Exception:
         logger.warning("Redis недоступен — оверлей темы/чата не будет обновляться")
 
+    overlay_hub = OverlayHub(redis_manager)
+    await overlay_hub.start()
+
     app = create_app()
     app["redis_manager"] = redis_manager
+    app["overlay_hub"] = overlay_hub
     runner = web.AppRunner(app)
     await runner.setup()
     site = web.TCPSite(runner, host, port)
@@ -144,11 +159,10 @@ async def serve_visual(host: str, port: int) -> None:
         Config.VISUAL_URL,
     )
 
-    import asyncio
-
     stop = asyncio.Event()
     try:
         await stop.wait()
     finally:
+        await overlay_hub.stop()
         await redis_manager.disconnect()
         await runner.cleanup()